@@ -5,8 +5,13 @@ import secrets
 
 from flask import Flask, render_template, request, session, redirect
 
-from database import init_db
+from bootstrap import COUPLES_ENABLED, DINARO_ENABLED, init_databases, init_db_on_import
+from assets import init_assets
+from database import init_read_routing
+from templating import init_templates
+from profiling import init_profiling
 from core.profile import DEFAULT_CURRENCY, get_effective_hourly_rate
+from core.httpcache import is_static_page
 
 # ----------------------------
 # App setup
@@ -14,6 +19,14 @@ from core.profile import DEFAULT_CURRENCY, get_effective_hourly_rate
 app = Flask(__name__)
 # In production, set FLASK_SECRET_KEY in env so sessions persist across restarts.
 app.secret_key = os.environ.get("FLASK_SECRET_KEY", os.urandom(32))
+# Opt-in cProfile of sampled / X-Profile requests (see profiling.py). First, so
+# the other request hooks' time is part of each profile.
+init_profiling(app)
+# Hashed /static URLs + precompressed, immutable asset serving (see assets.py).
+# Registered before the session hooks below so asset hits never touch the session.
+init_assets(app)
+# Read-your-writes for DATABASE_READ_URL replicas (see database.py).
+init_read_routing(app)
 
 # ----------------------------
 # Blueprints
@@ -24,22 +37,35 @@ from core.routes import core_bp
 app.register_blueprint(core_bp)
 
 # Dinaro - family / classroom economy
-from dinaro import dinaro_bp
-app.register_blueprint(dinaro_bp, url_prefix="/dinaro")
+if DINARO_ENABLED:
+    from dinaro import dinaro_bp
+    app.register_blueprint(dinaro_bp, url_prefix="/dinaro")
 
 # Couples - making invisible work visible
-from couples import couples_bp
-app.register_blueprint(couples_bp, url_prefix="/couples")
+if COUPLES_ENABLED:
+    from couples import couples_bp
+    app.register_blueprint(couples_bp, url_prefix="/couples")
+
+# Lets shared templates (nav, landing) drop links to modules that are turned off.
+app.jinja_env.globals.update(dinaro_enabled=DINARO_ENABLED, couples_enabled=COUPLES_ENABLED)
+
+# Shared Jinja bytecode cache (+ optional TEMPLATE_WARMUP); see templating.py.
+init_templates(app)
+
+# Create/migrate tables. Under gunicorn this runs once in the master instead
+# (gunicorn.conf.py on_starting), and the config turns INIT_DB_ON_IMPORT off.
+if init_db_on_import():
+    try:
+        init_databases()
+    except Exception as e:
+        print("Database init error:", e)
 
-# Initialize DB on startup
-try:
-    init_db()
-    from dinaro.db import init_dinaro_db
-    init_dinaro_db()
-    from dinaro.routes import _dinaro_ensure_family_codes
-    _dinaro_ensure_family_codes()
-except Exception as e:
-    print("Database init error:", e)
+
+@app.cli.command("init-db")
+def init_db_command():
+    """Create/migrate all tables (release step for INIT_DB_ON_IMPORT=0 deploys)."""
+    init_databases()
+    print("Database initialised.")
 
 
 # ----------------------------
@@ -65,12 +91,16 @@ def redirect_www():
 
 @app.before_request
 def ensure_view():
+    if is_static_page():
+        return
     if "view" not in session:
         session["view"] = "personality"
 
 
 @app.before_request
 def ensure_identity():
+    if is_static_page():
+        return
     if "user_key" not in session:
         session["user_key"] = secrets.token_urlsafe(16)
 
@@ -83,9 +113,21 @@ def inject_globals():
         "is_parent": session.get("piggy_parent", False),
         "guide": session.get("guide", "lorelai"),
         "plausible_domain": os.environ.get("PLAUSIBLE_DOMAIN", ""),
-        "has_wage": get_effective_hourly_rate() is not None,
+        # Static pages stay DB-free (and identical for every visitor with the
+        # same cookie prefs), so they always show the "set your wage" CTA.
+        "has_wage": not is_static_page() and get_effective_hourly_rate() is not None,
     }
 
 
+# Render the default-wage /trillionaire pages up front so the first visitor from
+# each region gets a cache hit (campaign traffic lands there in bursts). Runs
+# last so the context processor above is already registered.
+try:
+    from core.routes import _trillionaire_prerender
+    _trillionaire_prerender(app)
+except Exception as e:
+    print("Trillionaire prerender error:", e)
+
+
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,200 @@
+"""Fingerprinted, precompressed static assets.
+
+Build step (run once per deploy, see scripts/build_assets.py): every asset in a
+static folder is copied to `<static>/dist/<name>.<hash>.<ext>`, text assets also
+get `.gz` (and `.br` when the Brotli package is installed) siblings, and the
+mapping is written to `<static>/dist/manifest.json`.
+
+At runtime `init_assets(app)` wires the app up so that:
+  - url_for("static", ...) / url_for("dinaro.static", ...) resolve to the
+    hashed file when the folder has a manifest (unbuilt trees fall back to the
+    plain filename, so local dev needs no build);
+  - /dist/ files are served with the best precompressed variant the client
+    accepts, with a one-year `immutable` Cache-Control, and without touching
+    the session;
+  - the service worker is served from /sw.js (root scope, so it controls
+    every page) with its precache list and cache name generated from the
+    manifests;
+  - templates get an `icon(name, style=...)` global that references a symbol
+    in the local Lucide sprite (static/icons.svg, see scripts/build_icons.py).
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+
+from flask import Flask, Response, current_app, request, send_from_directory, url_for
+from markupsafe import Markup, escape
+
+try:
+    import brotli
+except ImportError:  # optional: .gz variants alone are fine
+    brotli = None
+
+DIST_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Must keep a stable URL: the service worker's scope/update check is tied to its
+# path, and browsers re-fetch the PWA manifest by the URL they first saw.
+UNHASHED = {"sw.js", "manifest.json"}
+COMPRESSIBLE = {".css", ".js", ".svg", ".json", ".txt"}
+# What the service worker precaches: the app shell, not the OG share images.
+PRECACHE_EXTENSIONS = {".css", ".js", ".svg"}
+SERVICE_WORKER = "sw.js"
+ICON_SPRITE = "icons.svg"
+# Same presentation attributes lucide.createIcons() used to stamp on each <svg>,
+# so existing CSS (.icon-chip svg { width: … }, inline styles) still wins.
+_ICON_ATTRS = (
+    'xmlns="http://www.w3.org/2000/svg" width="24" height="24" fill="none" '
+    'stroke="currentColor" stroke-width="2" stroke-linecap="round" '
+    'stroke-linejoin="round" aria-hidden="true"'
+)
+
+_manifests: dict[str, dict[str, str]] = {}
+
+
+# ----------------------------
+# Build
+# ----------------------------
+def build_static_folder(folder: str) -> dict[str, str]:
+    """Fingerprint + precompress every asset in `folder`; return the manifest."""
+    dist = os.path.join(folder, DIST_DIR)
+    shutil.rmtree(dist, ignore_errors=True)
+    os.makedirs(dist)
+
+    manifest = {}
+    for root, dirs, files in os.walk(folder):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != dist]
+        for name in sorted(files):
+            rel = os.path.relpath(os.path.join(root, name), folder).replace(os.sep, "/")
+            if name in UNHASHED or name.startswith("."):
+                continue
+            with open(os.path.join(root, name), "rb") as f:
+                data = f.read()
+            stem, ext = os.path.splitext(rel)
+            hashed = f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+            out = os.path.join(dist, hashed)
+            os.makedirs(os.path.dirname(out), exist_ok=True)
+            with open(out, "wb") as f:
+                f.write(data)
+            if ext in COMPRESSIBLE:
+                with open(out + ".gz", "wb") as f:
+                    f.write(gzip.compress(data, compresslevel=9, mtime=0))
+                if brotli is not None:
+                    with open(out + ".br", "wb") as f:
+                        f.write(brotli.compress(data, quality=11))
+            manifest[rel] = f"{DIST_DIR}/{hashed}"
+
+    with open(os.path.join(dist, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def static_folders(app: Flask) -> dict[str, str]:
+    """Map each static endpoint ("static", "dinaro.static", …) to its folder."""
+    folders = {}
+    if app.has_static_folder:
+        folders["static"] = app.static_folder
+    for name, bp in app.blueprints.items():
+        if bp.has_static_folder:
+            folders[f"{name}.static"] = bp.static_folder
+    return folders
+
+
+# ----------------------------
+# Runtime
+# ----------------------------
+def load_manifest(folder: str) -> dict[str, str]:
+    """The folder's manifest ({} when unbuilt), read once per process."""
+    if folder not in _manifests:
+        try:
+            with open(os.path.join(folder, DIST_DIR, MANIFEST_NAME)) as f:
+                _manifests[folder] = json.load(f)
+        except (OSError, ValueError):
+            _manifests[folder] = {}
+    return _manifests[folder]
+
+
+def precache_manifest() -> dict:
+    """{version, urls} for the service worker: every hashed shell asset across
+    the app's static folders. `version` changes whenever any manifest does."""
+    folders = static_folders(current_app)
+    manifests = {endpoint: load_manifest(folder) for endpoint, folder in folders.items()}
+    urls = [
+        url_for(endpoint, filename=name)
+        for endpoint, manifest in sorted(manifests.items())
+        for name in sorted(manifest)
+        if os.path.splitext(name)[1] in PRECACHE_EXTENSIONS
+    ]
+    blob = json.dumps(manifests, sort_keys=True).encode()
+    version = hashlib.sha256(blob).hexdigest()[:10] if urls else "dev"
+    return {"version": version, "urls": urls}
+
+
+def icon(name: str, style: str | None = None) -> Markup:
+    """Inline <svg> that <use>s `name` from the Lucide sprite."""
+    href = url_for("static", filename=ICON_SPRITE)
+    style_attr = f' style="{escape(style)}"' if style else ""
+    return Markup(
+        f'<svg class="lucide lucide-{escape(name)}" {_ICON_ATTRS}{style_attr}>'
+        f'<use href="{href}#{escape(name)}"/></svg>'
+    )
+
+
+def _is_dist(filename: str) -> bool:
+    return filename.startswith(DIST_DIR + "/") and not filename.endswith((".gz", ".br"))
+
+
+def init_assets(app: Flask) -> None:
+    """Register the manifest-aware url_for hook and the /dist/ file server.
+    Call right after creating the app, before any other before_request hook,
+    so asset requests short-circuit the session hooks."""
+
+    app.add_template_global(icon)
+
+    @app.url_defaults
+    def _fingerprint_static(endpoint, values):
+        folder = static_folders(app).get(endpoint)
+        filename = values.get("filename")
+        if folder and filename:
+            values["filename"] = load_manifest(folder).get(filename, filename)
+
+    @app.before_request
+    def _serve_dist_asset():
+        folder = static_folders(app).get(request.endpoint or "")
+        filename = (request.view_args or {}).get("filename", "")
+        if not folder or not _is_dist(filename):
+            return None
+
+        path = os.path.join(folder, filename)
+        mimetype = mimetypes.guess_type(filename)[0]
+        encoding = None
+        for enc, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if enc in request.accept_encodings and os.path.isfile(path + suffix):
+                encoding, filename = enc, filename + suffix
+                break
+
+        resp = send_from_directory(folder, filename, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+        if encoding:
+            resp.headers["Content-Encoding"] = encoding
+        resp.vary.add("Accept-Encoding")
+        resp.cache_control.public = True
+        resp.cache_control.immutable = True
+        return resp
+
+    def service_worker():
+        with open(os.path.join(app.static_folder, SERVICE_WORKER), encoding="utf-8") as f:
+            source = f.read()
+        preamble = f"self.__PRECACHE = {json.dumps(precache_manifest())};\n"
+        resp = Response(preamble + source, mimetype="text/javascript")
+        # Browsers byte-compare on every update check; always revalidate.
+        resp.cache_control.no_cache = True
+        return resp
+
+    service_worker.static_page = True  # no session writes (core.httpcache)
+    app.add_url_rule("/" + SERVICE_WORKER, "service_worker", service_worker)
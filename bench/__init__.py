@@ -0,0 +1,22 @@
+"""End-to-end load benchmarks for TimeCost, Dinaro and Couples.
+
+    python -m bench run [--scale small|medium|large] [--driver testclient|gunicorn]
+                        [--database-url URL] [--out results.json]
+    python -m bench throughput [--workers 4] [--clients 16] [--write-ratio 0.3]
+                               [--sqlite-tuning on|off] [--seconds 15]
+    python -m bench compare bench/baseline.json results.json [--tolerance 0.25] [--floor-ms 1.0]
+
+`run` builds a fresh database at the requested scale (datagen), drives the
+scripted scenarios through Flask's test client or a local gunicorn (drivers,
+scenarios) and writes p50/p95/p99 per route as JSON. `compare` checks a result
+against the committed baseline and exits non-zero on regressions.
+`throughput` hammers a multi-worker gunicorn with concurrent dashboard reads
+and chore-log writes and reports requests per second.
+
+bench/baseline.json was recorded with the defaults (small scale, SQLite, test
+client) on a developer laptop. Absolute timings only compare on the same
+machine: regenerate the baseline on the CI runner before gating on it.
+
+SQLite runs use a throwaway file. For Postgres pass --database-url pointing at
+a dedicated database whose name contains "bench": its tables are emptied first.
+"""
@@ -0,0 +1,94 @@
+"""CLI entry point: python -m bench {run,throughput,compare} (see bench/__init__.py)."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from bench.datagen import SCALES  # noqa: E402
+from bench.runner import compare, load, run, scale_from_args  # noqa: E402
+from bench.scenarios import SCENARIOS  # noqa: E402
+from bench.throughput import throughput  # noqa: E402
+
+
+def _emit(result: dict, out: str | None) -> None:
+    text = json.dumps(result, indent=2)
+    if out:
+        with open(out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(prog="python -m bench")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    r = sub.add_parser("run", help="generate data, run scenarios, write JSON")
+    r.add_argument("--scale", choices=sorted(SCALES), default="small")
+    for key in SCALES["small"]:
+        r.add_argument(f"--{key.replace('_', '-')}", type=int, dest=key, help="override the scale preset")
+    r.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                   help="repeatable; default: all")
+    r.add_argument("--iterations", type=int, default=30)
+    r.add_argument("--driver", choices=["testclient", "gunicorn"], default="testclient")
+    r.add_argument("--workers", type=int, default=2, help="gunicorn driver only")
+    r.add_argument("--database-url", help="default: a throwaway SQLite file")
+    r.add_argument("--out", help="write JSON here (default: stdout)")
+
+    t = sub.add_parser("throughput", help="concurrent reads/writes against a multi-worker gunicorn")
+    t.add_argument("--scale", choices=sorted(SCALES), default="small")
+    t.add_argument("--workers", type=int, default=4)
+    t.add_argument("--clients", type=int, default=16, help="concurrent client threads")
+    t.add_argument("--seconds", type=float, default=15)
+    t.add_argument("--write-ratio", type=float, default=0.3)
+    t.add_argument("--sqlite-tuning", choices=["on", "off"], default="on")
+    t.add_argument("--database-url", help="default: a throwaway SQLite file")
+    t.add_argument("--out", help="write JSON here (default: stdout)")
+
+    c = sub.add_parser("compare", help="fail if a result regressed against a baseline")
+    c.add_argument("baseline")
+    c.add_argument("result")
+    c.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    c.add_argument("--floor-ms", type=float, default=1.0, help="ignore absolute changes below this")
+    c.add_argument("--metric", default="p95_ms", choices=["p50_ms", "p95_ms", "p99_ms", "mean_ms"])
+
+    args = ap.parse_args()
+
+    if args.cmd == "run":
+        scale = scale_from_args(args.scale, {k: getattr(args, k) for k in SCALES["small"]})
+        result = run(scale=scale, scenarios=args.scenario or list(SCENARIOS),
+                     iterations=args.iterations, driver=args.driver,
+                     database_url=args.database_url, workers=args.workers)
+        _emit(result, args.out)
+        for label, stats in result["routes"].items():
+            print(f"{label:45s} p50 {stats['p50_ms']:8.2f}  p95 {stats['p95_ms']:8.2f}  "
+                  f"p99 {stats['p99_ms']:8.2f} ms  (n={stats['n']})", file=sys.stderr)
+        return
+
+    if args.cmd == "throughput":
+        result = throughput(scale=dict(SCALES[args.scale]), workers=args.workers, clients=args.clients,
+                            seconds=args.seconds, write_ratio=args.write_ratio,
+                            sqlite_tuning=args.sqlite_tuning == "on", database_url=args.database_url)
+        _emit(result, args.out)
+        print(f"{result['requests_per_s']} req/s, errors: {result['errors'] or 'none'}", file=sys.stderr)
+        for label, stats in result["routes"].items():
+            print(f"{label:45s} {result['per_route_per_s'][label]:8.1f}/s  p50 {stats['p50_ms']:8.2f}  "
+                  f"p95 {stats['p95_ms']:8.2f} ms", file=sys.stderr)
+        return
+
+    regressions = compare(load(args.baseline), load(args.result),
+                          tolerance=args.tolerance, metric=args.metric,
+                          floor_ms=args.floor_ms)
+    for line in regressions:
+        print(line)
+    if regressions:
+        sys.exit(1)
+    print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
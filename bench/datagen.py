@@ -0,0 +1,222 @@
+"""Synthetic data at configurable scale.
+
+Everything is inserted with plain SQL through the app's own engine, so the same
+generator fills SQLite and Postgres. Every login shares BENCH_PIN; the returned
+Dataset carries the codes and ids the scenarios need to log in and act.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+
+from core.auth import make_pin
+from core.expenses import refresh_summary
+
+BENCH_PIN = "1234"
+
+SCALES = {
+    # families, children/family, ledger rows/child, couples, years of couple
+    # logs, profiles, expenses/profile
+    "small": dict(families=5, children=4, ledger=50, couples=2, couple_years=1, profiles=2, expenses=100),
+    "medium": dict(families=25, children=8, ledger=200, couples=10, couple_years=2, profiles=10, expenses=300),
+    "large": dict(families=100, children=30, ledger=500, couples=25, couple_years=5, profiles=25, expenses=800),
+}
+
+CHORES = ["Dishes", "Laundry", "Homework", "Tidy room", "Walk the dog", "Recycling"]
+EXPENSE_CATEGORIES = ["Housing", "Food", "Transport", "Fun", "Bills", "Nest Egg"]
+COUPLE_TASKS = [("Cooking", "Food"), ("Cleaning", "Home"), ("School run", "Kids"),
+                ("Admin", "Admin"), ("Shopping", "Food"), ("Laundry", "Home")]
+
+# Tables the generator writes, children before parents - for the Postgres reset.
+TABLES = [
+    "dinaro_ledger", "dinaro_chore_logs", "dinaro_requests", "dinaro_goals",
+    "dinaro_chores", "dinaro_spendables", "dinaro_children", "dinaro_parents",
+    "dinaro_families", "couples_logs", "couples_tasks", "couples_partners",
+    "couples_partnerships", "expenses", "expense_summaries", "personal_profiles",
+]
+
+
+@dataclass
+class Dataset:
+    scale: dict
+    # (family_code, parent_id, [child_ids])
+    families: list[tuple[str, int, list[int]]] = field(default_factory=list)
+    # family_code -> pending chore log ids, consumed by the approval scenario
+    pending_logs: dict[str, list[int]] = field(default_factory=dict)
+    # family_code -> open purchase request ids (one per child)
+    open_requests: dict[str, list[int]] = field(default_factory=dict)
+    # family_code -> an active chore id (for child log-chore posts)
+    chores: dict[str, int] = field(default_factory=dict)
+    # (partnership_code, partner_id)
+    couples: list[tuple[str, int]] = field(default_factory=list)
+    profiles: list[str] = field(default_factory=list)
+
+
+def _insert_returning_id(conn, sql: str, params: dict) -> int:
+    return int(conn.execute(text(sql + " RETURNING id"), params).scalar())
+
+
+def reset(engine) -> None:
+    """Empty the generator's tables (Postgres bench databases are reused)."""
+    with engine.begin() as conn:
+        for table in TABLES:
+            conn.execute(text(f"DELETE FROM {table}"))
+
+
+def generate(engine, *, families: int, children: int, ledger: int, couples: int,
+             couple_years: int, profiles: int, expenses: int, seed: int = 42,
+             prefix: str = "B") -> Dataset:
+    """Insert one dataset. `prefix` namespaces codes and profile names, so
+    several datasets can share a database (the query-budget tests do)."""
+    rng = random.Random(seed)
+    ds = Dataset(scale=dict(families=families, children=children, ledger=ledger, couples=couples,
+                            couple_years=couple_years, profiles=profiles, expenses=expenses))
+    pin_hash, pin_salt = make_pin(BENCH_PIN)
+    now = datetime.utcnow()
+    today = date.today()
+
+    with engine.begin() as conn:
+        for f in range(families):
+            code = f"{prefix}F{f:04d}"
+            fid = _insert_returning_id(
+                conn,
+                "INSERT INTO dinaro_families (name, rate_per_hour, family_code, is_classroom) "
+                "VALUES (:n, :r, :c, :cls)",
+                {"n": f"Bench family {f}", "r": 4.0, "c": code, "cls": int(children > 10)},
+            )
+            parent_id = _insert_returning_id(
+                conn,
+                "INSERT INTO dinaro_parents (family_id, name, pin_hash, pin_salt) VALUES (:f, :n, :h, :s)",
+                {"f": fid, "n": f"Parent {f}", "h": pin_hash, "s": pin_salt},
+            )
+            chore_ids = [
+                _insert_returning_id(
+                    conn,
+                    "INSERT INTO dinaro_chores (family_id, title, default_hours) VALUES (:f, :t, :h)",
+                    {"f": fid, "t": title, "h": 0.5},
+                )
+                for title in CHORES
+            ]
+            conn.execute(
+                text("INSERT INTO dinaro_spendables (family_id, title, cost_dinaro) VALUES (:f, :t, :c)"),
+                [{"f": fid, "t": f"Treat {i}", "c": 5.0 * (i + 1)} for i in range(4)],
+            )
+
+            child_ids = []
+            pending = []
+            open_requests = []
+            for c in range(children):
+                cid = _insert_returning_id(
+                    conn,
+                    "INSERT INTO dinaro_children (family_id, name, pin_hash, pin_salt, balance, view_mode) "
+                    "VALUES (:f, :n, :h, :s, :b, :v)",
+                    {"f": fid, "n": f"Kid {f}-{c}", "h": pin_hash, "s": pin_salt,
+                     "b": 0.0, "v": rng.choice(["visual", "teen"])},
+                )
+                child_ids.append(cid)
+
+                logs = []
+                for i in range(ledger):
+                    day = today - timedelta(days=rng.randrange(365))
+                    logs.append({
+                        "c": cid, "ch": rng.choice(chore_ids), "d": day.isoformat(),
+                        "h": 0.5, "a": 0.5, "st": "approved",
+                        "at": (now - timedelta(days=(today - day).days)).isoformat(timespec="seconds"),
+                    })
+                if logs:
+                    conn.execute(
+                        text("INSERT INTO dinaro_chore_logs (child_id, chore_id, work_date, requested_hours, "
+                             "approved_hours, status, created_at) VALUES (:c, :ch, :d, :h, :a, :st, :at)"),
+                        logs,
+                    )
+                    conn.execute(
+                        text("INSERT INTO dinaro_ledger (child_id, delta, reason, created_at) "
+                             "VALUES (:c, :delta, 'Chore approved', :at)"),
+                        [{"c": cid, "delta": 2.0, "at": log["at"]} for log in logs],
+                    )
+                    conn.execute(text("UPDATE dinaro_children SET balance = :b WHERE id = :id"),
+                                 {"b": 2.0 * len(logs), "id": cid})
+
+                for i in range(3):
+                    pending.append(_insert_returning_id(
+                        conn,
+                        "INSERT INTO dinaro_chore_logs (child_id, chore_id, work_date, requested_hours, "
+                        "status, created_at) VALUES (:c, :ch, :d, 0.5, 'pending', :at)",
+                        {"c": cid, "ch": chore_ids[i], "d": today.isoformat(),
+                         "at": now.isoformat(timespec="seconds")},
+                    ))
+                conn.execute(
+                    text("INSERT INTO dinaro_goals (child_id, title, target_dinaro) VALUES (:c, 'Bike', 150)"),
+                    {"c": cid},
+                )
+                open_requests.append(_insert_returning_id(
+                    conn,
+                    "INSERT INTO dinaro_requests (child_id, item_name, item_cost_dinaro, offer_dinaro, "
+                    "created_at) VALUES (:c, 'Game', 40, 30, :at)",
+                    {"c": cid, "at": now.isoformat(timespec="seconds")},
+                ))
+
+            ds.families.append((code, parent_id, child_ids))
+            ds.pending_logs[code] = pending
+            ds.open_requests[code] = open_requests
+            ds.chores[code] = chore_ids[0]
+
+        for p in range(couples):
+            code = f"{prefix}C{p:04d}"
+            pid = _insert_returning_id(
+                conn,
+                "INSERT INTO couples_partnerships (name, partnership_code, created_at) VALUES (:n, :c, :at)",
+                {"n": f"Bench couple {p}", "c": code, "at": now.isoformat(timespec="seconds")},
+            )
+            partner_ids = [
+                _insert_returning_id(
+                    conn,
+                    "INSERT INTO couples_partners (partnership_id, name, pin_hash, pin_salt, created_at) "
+                    "VALUES (:p, :n, :h, :s, :at)",
+                    {"p": pid, "n": name, "h": pin_hash, "s": pin_salt, "at": now.isoformat(timespec="seconds")},
+                )
+                for name in ("Alex", "Sam")
+            ]
+            task_ids = [
+                (_insert_returning_id(
+                    conn,
+                    "INSERT INTO couples_tasks (partnership_id, title, category, created_at) "
+                    "VALUES (:p, :t, :c, :at)",
+                    {"p": pid, "t": title, "c": cat, "at": now.isoformat(timespec="seconds")},
+                ), cat)
+                for title, cat in COUPLE_TASKS
+            ]
+            logs = []
+            for d in range(365 * couple_years):
+                day = (today - timedelta(days=d)).isoformat()
+                for _ in range(rng.randint(1, 4)):
+                    task_id, cat = rng.choice(task_ids)
+                    logs.append({"p": pid, "pa": rng.choice(partner_ids), "t": task_id, "c": cat,
+                                 "m": rng.choice([15, 30, 45, 60, 90]), "d": day, "at": day + "T12:00:00"})
+            if logs:
+                conn.execute(
+                    text("INSERT INTO couples_logs (partnership_id, partner_id, task_id, category, minutes, "
+                         "work_date, created_at) VALUES (:p, :pa, :t, :c, :m, :d, :at)"),
+                    logs,
+                )
+            ds.couples.append((code, partner_ids[0]))
+
+        for u in range(profiles):
+            name = f"{prefix.lower()}-profile-{u}"
+            conn.execute(
+                text("INSERT INTO personal_profiles (profile_name, pin_hash, pin_salt, hourly_rate, "
+                     "created_at, updated_at) VALUES (:n, :h, :s, :r, :at, :at)"),
+                {"n": name, "h": pin_hash, "s": pin_salt, "r": 18.5, "at": now.isoformat(timespec="seconds")},
+            )
+            conn.execute(
+                text("INSERT INTO expenses (name, amount, category, owner_key) VALUES (:n, :a, :c, :o)"),
+                [{"n": f"Expense {i}", "a": round(rng.uniform(2, 400), 2),
+                  "c": rng.choice(EXPENSE_CATEGORIES), "o": name} for i in range(expenses)],
+            )
+            refresh_summary(conn, name)
+            ds.profiles.append(name)
+
+    return ds
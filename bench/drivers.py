@@ -0,0 +1,96 @@
+"""How requests reach the app: in-process test client, or HTTP to gunicorn.
+
+Each virtual user gets its own driver (its own cookie jar). Redirects are never
+followed, so a timing always covers exactly one request/response. Over HTTP the
+driver also notes the time to first byte (status line and headers received) of
+its last request, in `ttfb_ms`; the test client has no such moment.
+"""
+from __future__ import annotations
+
+import http.cookiejar
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+
+class TestClientDriver:
+    ttfb_ms = None
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method: str, path: str, data: dict | None = None, headers: dict | None = None) -> int:
+        resp = self.client.open(path, method=method, data=data, headers=headers)
+        resp.get_data()  # make sure streamed bodies are fully produced
+        return resp.status_code
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpDriver:
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect,
+        )
+        self.ttfb_ms: float | None = None
+
+    def request(self, method: str, path: str, data: dict | None = None, headers: dict | None = None) -> int:
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=body, headers=headers or {}, method=method)
+        start = time.perf_counter()
+        try:
+            with self.opener.open(req, timeout=60) as resp:
+                self.ttfb_ms = (time.perf_counter() - start) * 1000.0
+                resp.read()
+                return resp.status
+        except urllib.error.HTTPError as e:  # 3xx (not followed) and 4xx/5xx
+            self.ttfb_ms = (time.perf_counter() - start) * 1000.0
+            e.read()
+            return e.code
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class GunicornServer:
+    """A local `gunicorn app:app` using the repo's gunicorn.conf.py."""
+
+    def __init__(self, env: dict, workers: int = 2):
+        self.port = _free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "app:app",
+             "--bind", f"127.0.0.1:{self.port}", "--workers", str(workers)],
+            cwd=ROOT, env={**os.environ, **env},
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    def __enter__(self):
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError("gunicorn exited during startup")
+            try:
+                urllib.request.urlopen(self.base_url + "/robots.txt", timeout=2).read()
+                return self
+            except OSError:
+                time.sleep(0.2)
+        raise RuntimeError("gunicorn did not come up within 60s")
+
+    def __exit__(self, *exc):
+        self.proc.terminate()
+        self.proc.wait(timeout=30)
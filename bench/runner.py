@@ -0,0 +1,143 @@
+"""Run scenarios, aggregate per-route latency, compare against a baseline."""
+from __future__ import annotations
+
+import json
+import math
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+from bench.datagen import SCALES, generate, reset
+from bench.drivers import GunicornServer, HttpDriver, TestClientDriver
+from bench.scenarios import SCENARIOS
+
+
+def percentile(sorted_ms: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_ms:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_ms)))
+    return sorted_ms[rank - 1]
+
+
+def summarise(samples: dict[str, list[float]]) -> dict:
+    out = {}
+    for label, ms in sorted(samples.items()):
+        ms = sorted(ms)
+        out[label] = {
+            "n": len(ms),
+            "p50_ms": round(percentile(ms, 50), 2),
+            "p95_ms": round(percentile(ms, 95), 2),
+            "p99_ms": round(percentile(ms, 99), 2),
+            "mean_ms": round(sum(ms) / len(ms), 2),
+        }
+    return out
+
+
+def _prepare_database(database_url: str | None) -> str:
+    """Point the app at the bench database (before `app` is imported)."""
+    if not database_url:
+        path = os.path.join(tempfile.mkdtemp(prefix="timecost-bench-"), "bench.db")
+        database_url = f"sqlite:///{path}"
+    elif database_url.startswith(("postgres://", "postgresql://")):
+        name = urlparse(database_url).path.lstrip("/")
+        if "bench" not in name:
+            raise SystemExit(f"refusing to wipe database {name!r}: its name must contain 'bench'")
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.pop("DINARO_DATABASE_URL", None)
+    return database_url
+
+
+def run(*, scale: dict, scenarios: list[str], iterations: int, driver: str = "testclient",
+        database_url: str | None = None, workers: int = 2) -> dict:
+    database_url = _prepare_database(database_url)
+
+    from bootstrap import init_databases
+    from database import engine
+
+    init_databases()
+    if engine.dialect.name != "sqlite":
+        reset(engine)
+    t0 = time.perf_counter()
+    ds = generate(engine, **scale)
+    gen_s = time.perf_counter() - t0
+
+    samples: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+
+    def timed(d, label, method, path, data=None):
+        start = time.perf_counter()
+        status = d.request(method, path, data)
+        samples.setdefault(label, []).append((time.perf_counter() - start) * 1000.0)
+        if d.ttfb_ms is not None:
+            samples.setdefault(f"TTFB {label}", []).append(d.ttfb_ms)
+        # A redirected GET means the scenario's login didn't stick: count it too.
+        if status >= 400 or (method == "GET" and status >= 300):
+            errors[label] = errors.get(label, 0) + 1
+
+    def execute(new_driver):
+        for name in scenarios:
+            SCENARIOS[name](new_driver, ds, timed, iterations)
+
+    if driver == "testclient":
+        from app import app
+
+        execute(lambda: TestClientDriver(app))
+    elif driver == "gunicorn":
+        # One signing key for all workers, or a session cookie set by one worker
+        # is rejected by the next (app.py falls back to a per-process random key).
+        env = {"DATABASE_URL": database_url, "FLASK_SECRET_KEY": "bench-only-secret"}
+        with GunicornServer(env, workers=workers) as server:
+            execute(lambda: HttpDriver(server.base_url))
+    else:
+        raise SystemExit(f"unknown driver {driver!r}")
+
+    return {
+        "meta": {
+            "driver": driver,
+            "dialect": engine.dialect.name,
+            "scale": scale,
+            "scenarios": scenarios,
+            "iterations": iterations,
+            "datagen_s": round(gen_s, 2),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "errors": errors,
+        "routes": summarise(samples),
+    }
+
+
+def compare(baseline: dict, result: dict, *, tolerance: float = 0.25, metric: str = "p95_ms",
+            floor_ms: float = 1.0) -> list[str]:
+    """Routes whose `metric` got more than `tolerance` slower than the baseline.
+
+    Differences under `floor_ms` are ignored: sub-millisecond routes are all noise.
+    """
+    regressions = []
+    for label, base in baseline.get("routes", {}).items():
+        cur = result.get("routes", {}).get(label)
+        if cur is None:
+            regressions.append(f"{label}: missing from result")
+            continue
+        before, after = base[metric], cur[metric]
+        if after - before > floor_ms and after > before * (1 + tolerance):
+            regressions.append(f"{label}: {metric} {before:.2f} -> {after:.2f} ms (+{(after / before - 1) * 100:.0f}%)")
+    for label, count in result.get("errors", {}).items():
+        regressions.append(f"{label}: {count} error responses")
+    return regressions
+
+
+def scale_from_args(name: str, overrides: dict) -> dict:
+    scale = dict(SCALES[name])
+    scale.update({k: v for k, v in overrides.items() if v is not None})
+    return scale
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
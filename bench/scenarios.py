@@ -0,0 +1,126 @@
+"""Scripted user journeys.
+
+A scenario logs its virtual user in once (untimed), then each iteration
+performs timed steps through `timed(label, method, path, data)`. Labels use
+path templates (`/dinaro/parent/log/<id>/approve`) so results aggregate per
+route, not per id.
+"""
+from __future__ import annotations
+
+from bench.datagen import BENCH_PIN
+
+
+def login_parent(driver, family_code: str, parent_id: int) -> None:
+    driver.request("POST", "/dinaro/parent/login", {"action": "find_family", "family_code": family_code})
+    driver.request("POST", "/dinaro/parent/login",
+                   {"action": "login", "parent_id": str(parent_id), "parent_pin": BENCH_PIN})
+
+
+def login_child(driver, family_code: str, child_id: int) -> None:
+    driver.request("POST", "/dinaro/child/login", {"action": "find_family", "family_code": family_code})
+    driver.request("POST", "/dinaro/child/login",
+                   {"action": "login", "child_id": str(child_id), "child_pin": BENCH_PIN})
+
+
+def login_partner(driver, partnership_code: str, partner_id: int) -> None:
+    driver.request("POST", "/couples/login", {"action": "find_partnership", "partnership_code": partnership_code})
+    driver.request("POST", "/couples/login",
+                   {"action": "login", "partner_id": str(partner_id), "pin": BENCH_PIN})
+
+
+def login_profile(driver, profile_name: str) -> None:
+    driver.request("POST", "/personal",
+                   {"action": "load", "profile_name": profile_name, "profile_pin": BENCH_PIN})
+
+
+# ----------------------------
+# Scenarios
+# ----------------------------
+# Lazily loaded parent dashboard panels (dinaro-sections.js).
+PARENT_SECTIONS = ["analytics", "treasury", "history", "requests", "goals", "trends"]
+
+
+def parent_dashboard(new_driver, ds, timed, iterations: int) -> None:
+    for i in range(iterations):
+        code, parent_id, _kids = ds.families[i % len(ds.families)]
+        d = new_driver()
+        login_parent(d, code, parent_id)
+        timed(d, "GET /dinaro/parent", "GET", "/dinaro/parent")
+        # The panels the page then fetches (in parallel, in a browser).
+        for name in PARENT_SECTIONS:
+            timed(d, f"GET /dinaro/parent/section/{name}", "GET", f"/dinaro/parent/section/{name}")
+
+
+def child_dashboard(new_driver, ds, timed, iterations: int) -> None:
+    for i in range(iterations):
+        code, _parent_id, kids = ds.families[i % len(ds.families)]
+        d = new_driver()
+        login_child(d, code, kids[i % len(kids)])
+        timed(d, "GET /dinaro/child", "GET", "/dinaro/child")
+        timed(d, "GET /dinaro/child/history", "GET", "/dinaro/child/history")
+
+
+def chore_approval(new_driver, ds, timed, iterations: int) -> None:
+    parents = {}
+    for i in range(iterations):
+        code, parent_id, kids = ds.families[i % len(ds.families)]
+        kid = new_driver()
+        login_child(kid, code, kids[i % len(kids)])
+        timed(kid, "POST /dinaro/child/log-chore", "POST", "/dinaro/child/log-chore",
+              {"chore_id": str(ds.chores[code])})
+
+        pending = ds.pending_logs[code]
+        if not pending:
+            continue
+        if code not in parents:
+            parents[code] = new_driver()
+            login_parent(parents[code], code, parent_id)
+        timed(parents[code], "POST /dinaro/parent/log/<id>/approve", "POST",
+              f"/dinaro/parent/log/{pending.pop()}/approve", {})
+
+
+def calculator(new_driver, ds, timed, iterations: int) -> None:
+    d = new_driver()
+    for i in range(iterations):
+        timed(d, "POST /calculate", "POST", "/calculate",
+              {"itemCost": str(5 + i % 400), "wageAmount": "18.50", "wageType": "hourly"})
+
+
+def personal_finance(new_driver, ds, timed, iterations: int) -> None:
+    for i in range(iterations):
+        d = new_driver()
+        login_profile(d, ds.profiles[i % len(ds.profiles)])
+        timed(d, "GET /expenses", "GET", "/expenses")
+        timed(d, "GET /budget", "GET", "/budget")
+
+
+def couples_dashboard(new_driver, ds, timed, iterations: int) -> None:
+    for i in range(iterations):
+        code, partner_id = ds.couples[i % len(ds.couples)]
+        d = new_driver()
+        login_partner(d, code, partner_id)
+        timed(d, "GET /couples/dashboard", "GET", "/couples/dashboard")
+
+
+def exports(new_driver, ds, timed, iterations: int) -> None:
+    for i in range(iterations):
+        code, parent_id, _kids = ds.families[i % len(ds.families)]
+        d = new_driver()
+        login_parent(d, code, parent_id)
+        timed(d, "GET /dinaro/parent/export", "GET", "/dinaro/parent/export")
+
+        code, partner_id = ds.couples[i % len(ds.couples)]
+        d = new_driver()
+        login_partner(d, code, partner_id)
+        timed(d, "GET /couples/export", "GET", "/couples/export")
+
+
+SCENARIOS = {
+    "parent_dashboard": parent_dashboard,
+    "child_dashboard": child_dashboard,
+    "chore_approval": chore_approval,
+    "calculator": calculator,
+    "personal_finance": personal_finance,
+    "couples_dashboard": couples_dashboard,
+    "exports": exports,
+}
@@ -0,0 +1,93 @@
+"""Concurrent read/write throughput against a multi-worker gunicorn.
+
+Client threads log in as children and, until the time is up, either read
+their dashboard (GET /dinaro/child) or log a chore (POST
+/dinaro/child/log-chore, a write transaction). With several workers the
+writes contend for SQLite's single write lock, which is what SQLITE_TUNING
+(WAL, busy_timeout, ...) is about: run once with --sqlite-tuning off and once
+on, against the same scale.
+"""
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+
+from bench.datagen import generate, reset
+from bench.drivers import GunicornServer, HttpDriver
+from bench.runner import _prepare_database, summarise
+from bench.scenarios import login_child
+
+
+def throughput(*, scale: dict, workers: int, clients: int, seconds: float, write_ratio: float,
+               sqlite_tuning: bool, database_url: str | None = None) -> dict:
+    # Must be set before database.py is imported, here and in the server.
+    os.environ["SQLITE_TUNING"] = "1" if sqlite_tuning else "0"
+    database_url = _prepare_database(database_url)
+
+    from bootstrap import init_databases
+    from database import engine
+
+    init_databases()
+    if engine.dialect.name != "sqlite":
+        reset(engine)
+    ds = generate(engine, **scale)
+    engine.dispose()
+
+    samples: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def client(n: int, base_url: str, deadline: float) -> None:
+        code, _parent_id, kids = ds.families[n % len(ds.families)]
+        d = HttpDriver(base_url)
+        login_child(d, code, kids[(n // len(ds.families)) % len(kids)])
+        rng = random.Random(n)
+        local: dict[str, list[float]] = {}
+        local_errors: dict[str, int] = {}
+        while time.monotonic() < deadline:
+            if rng.random() < write_ratio:
+                label, method, path, data = ("POST /dinaro/child/log-chore", "POST",
+                                             "/dinaro/child/log-chore", {"chore_id": str(ds.chores[code])})
+            else:
+                label, method, path, data = "GET /dinaro/child", "GET", "/dinaro/child", None
+            start = time.perf_counter()
+            status = d.request(method, path, data)
+            local.setdefault(label, []).append((time.perf_counter() - start) * 1000.0)
+            if status >= 400 or (method == "GET" and status >= 300):
+                local_errors[label] = local_errors.get(label, 0) + 1
+        with lock:
+            for label, ms in local.items():
+                samples.setdefault(label, []).extend(ms)
+            for label, count in local_errors.items():
+                errors[label] = errors.get(label, 0) + count
+
+    env = {"DATABASE_URL": database_url, "FLASK_SECRET_KEY": "bench-only-secret",
+           "SQLITE_TUNING": os.environ["SQLITE_TUNING"]}
+    with GunicornServer(env, workers=workers) as server:
+        deadline = time.monotonic() + seconds
+        threads = [threading.Thread(target=client, args=(n, server.base_url, deadline))
+                   for n in range(clients)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    routes = summarise(samples)
+    total = sum(r["n"] for r in routes.values())
+    return {
+        "meta": {
+            "dialect": engine.dialect.name,
+            "sqlite_tuning": sqlite_tuning,
+            "workers": workers,
+            "clients": clients,
+            "seconds": seconds,
+            "write_ratio": write_ratio,
+            "scale": scale,
+        },
+        "requests_per_s": round(total / seconds, 1),
+        "per_route_per_s": {label: round(r["n"] / seconds, 1) for label, r in routes.items()},
+        "errors": errors,
+        "routes": routes,
+    }
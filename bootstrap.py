@@ -0,0 +1,74 @@
+"""One-shot startup work and deployment feature flags.
+
+init_databases() creates/migrates the tables of every enabled module. It only
+needs to run once per boot, not once per gunicorn worker: gunicorn.conf.py runs
+it from the master's on_starting hook, and `flask --app app init-db` runs it by
+hand. app.py still runs it at import when INIT_DB_ON_IMPORT is on (the default),
+so `python app.py` and the tests keep working with no setup step.
+
+Configuration (env):
+  DINARO_ENABLED     "0" to leave the Dinaro blueprint out (lean deployments)
+  COUPLES_ENABLED    "0" to leave the Couples blueprint out
+  INIT_DB_ON_IMPORT  "0" to skip init_databases() when app.py is imported
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+
+def _flag(name: str, default: bool = True) -> bool:
+    val = os.environ.get(name)
+    if val is None:
+        return default
+    return val.strip().lower() not in ("0", "false", "no", "off", "")
+
+
+DINARO_ENABLED = _flag("DINARO_ENABLED")
+COUPLES_ENABLED = _flag("COUPLES_ENABLED")
+
+
+def init_db_on_import() -> bool:
+    return _flag("INIT_DB_ON_IMPORT")
+
+
+def init_databases() -> None:
+    """Create/migrate tables for core (+ couples) and, if enabled, Dinaro.
+
+    Pooled connections are dropped afterwards so a forking server (gunicorn
+    master → workers) never shares a socket between processes.
+    """
+    from database import init_db
+
+    init_db()
+    if DINARO_ENABLED:
+        from dinaro.db import init_dinaro_db, _dinaro_ensure_family_codes
+
+        init_dinaro_db()
+        _dinaro_ensure_family_codes()
+    dispose_engines()
+
+
+def dispose_engines(close: bool = True) -> None:
+    """Drop the pooled connections of every engine imported so far.
+
+    close=False (after a fork) forgets the parent's connections without
+    closing them, so the parent's sockets are left alone.
+    """
+    engines = []
+    database = sys.modules.get("database")
+    if database is not None:
+        engines += [database.engine, database.read_engine]
+    dinaro_db = sys.modules.get("dinaro.db")
+    if dinaro_db is not None:
+        # When sharded, dinaro.db.engine is the shard router (it would only
+        # reach the current shard); the real engines are in _shard_engines.
+        engines += list(dinaro_db._shard_engines.values())
+        if not dinaro_db.SHARDED:
+            engines.append(dinaro_db.read_engine)
+
+    seen = set()
+    for eng in engines:
+        if id(eng) not in seen:
+            seen.add(id(eng))
+            eng.dispose(close=close)
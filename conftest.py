@@ -0,0 +1,38 @@
+"""Shared test setup.
+
+The app's engines are built from DATABASE_URL when `app` is first imported, so
+pytest_configure points it at a throwaway SQLite file before any test module
+is collected: the suite never writes to the repo's timecost.db (or to whatever
+database the shell happens to point at).
+"""
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from bench.drivers import TestClientDriver
+
+_db_dir = None
+
+
+def pytest_configure(config):
+    global _db_dir
+    _db_dir = tempfile.mkdtemp(prefix="timecost-tests-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'timecost.db')}"
+    for name in ("DATABASE_READ_URL", "DINARO_DATABASE_URL", "DINARO_DATABASE_READ_URL", "DINARO_SHARDS"):
+        os.environ.pop(name, None)
+
+
+def pytest_unconfigure(config):
+    if _db_dir:
+        shutil.rmtree(_db_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def make_driver():
+    """Returns a factory of in-process drivers, one per virtual user (own cookies)."""
+    from app import app
+
+    app.config["TESTING"] = True
+    return lambda: TestClientDriver(app)
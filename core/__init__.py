@@ -4,4 +4,7 @@ Submodules:
   - finance:  the "time as currency" domain math + wealth-comparison data
   - auth:     PIN hashing/verification
   - timeutil: timestamp helpers
+  - httpcache: the `static_page` marker + conditional-response headers
+  - freelance: freelance entries + the daily per-client rollup they feed
+  - expenses: the per-owner expense summary row the money pages read
 """
@@ -0,0 +1,94 @@
+"""Per-owner expense summaries.
+
+The personal, timebank, budget and expenses pages all need an owner's expense
+total (and some the per-category or savings totals). expense_summaries keeps
+them in one row per owner_key, recomputed by refresh_summary() in the same
+transaction as every write to that owner's expenses, so each page reads it
+with a single keyed lookup instead of aggregating the expenses table.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+
+from sqlalchemy import text
+
+# Categories the timebank counts as money put aside rather than spent.
+SAVINGS_CATEGORIES = ("Nest Egg", "Savings")
+
+_UPSERT = text(
+    """
+    INSERT INTO expense_summaries (owner_key, total, by_category)
+    VALUES (:uk, :total, :by_category)
+    ON CONFLICT (owner_key) DO UPDATE SET
+      total = excluded.total,
+      by_category = excluded.by_category
+    """
+)
+
+
+# Takes the owner's summary row lock (creating the row if need be) without
+# changing it. Concurrent writers for one owner queue here; under READ
+# COMMITTED the aggregate that follows then sees every write committed before.
+_LOCK = text(
+    """
+    INSERT INTO expense_summaries (owner_key, total, by_category)
+    VALUES (:uk, 0, '{}')
+    ON CONFLICT (owner_key) DO UPDATE SET total = expense_summaries.total
+    """
+)
+
+
+@dataclass(frozen=True)
+class ExpenseSummary:
+    total: float = 0.0
+    by_category: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def savings(self) -> float:
+        return sum(self.by_category.get(c, 0.0) for c in SAVINGS_CATEGORIES)
+
+    def category_totals(self) -> list[dict]:
+        return [{"category": c, "total": t} for c, t in sorted(self.by_category.items())]
+
+
+def _row(owner_key: str, by_category: dict[str, float]) -> dict:
+    return {"uk": owner_key, "total": sum(by_category.values()), "by_category": json.dumps(by_category)}
+
+
+def refresh_summary(conn, owner_key: str) -> None:
+    """Recompute `owner_key`'s summary; call it after writing their expenses."""
+    conn.execute(_LOCK, {"uk": owner_key})
+    by_category = {
+        r["category"]: float(r["total"])
+        for r in conn.execute(
+            text("SELECT category, SUM(amount) AS total FROM expenses WHERE owner_key = :uk GROUP BY category"),
+            {"uk": owner_key},
+        ).mappings()
+    }
+    conn.execute(_UPSERT, _row(owner_key, by_category))
+
+
+def rebuild_summaries(conn) -> None:
+    """Recompute every owner's summary (init backfill, bulk inserts)."""
+    owners: dict[str, dict[str, float]] = {}
+    for r in conn.execute(
+        text(
+            "SELECT owner_key, category, SUM(amount) AS total FROM expenses "
+            "WHERE owner_key IS NOT NULL GROUP BY owner_key, category"
+        )
+    ).mappings():
+        owners.setdefault(r["owner_key"], {})[r["category"]] = float(r["total"])
+    conn.execute(text("DELETE FROM expense_summaries"))
+    if owners:
+        conn.execute(_UPSERT, [_row(uk, cats) for uk, cats in owners.items()])
+
+
+def load_summary(conn, owner_key: str) -> ExpenseSummary:
+    row = conn.execute(
+        text("SELECT total, by_category FROM expense_summaries WHERE owner_key = :uk"),
+        {"uk": owner_key},
+    ).mappings().first()
+    if not row:
+        return ExpenseSummary()
+    return ExpenseSummary(float(row["total"]), json.loads(row["by_category"]))
@@ -5,6 +5,8 @@ calculations reusable across the TimeCost calculator, Couples, and Dinaro.
 """
 from __future__ import annotations
 
+import math
+
 
 # ----------------------------
 # Wealth comparison data
@@ -63,27 +65,111 @@ def format_wealth_time(hours: float) -> str:
     return f"{hours / 24:.1f} days"
 
 
-def wealth_comparison(item_cost: float, currency: str, user_hourly: float = 0.0) -> list[dict]:
+# Per-billionaire hourly rates (USD/h) - fixed data, so computed once at import
+# rather than on every calculator hit.
+BILLIONAIRE_HOURLY_NET_WORTH = tuple(b["net_worth_usd"] / WORKING_HOURS_PER_YEAR for b in BILLIONAIRES)
+BILLIONAIRE_HOURLY_GROWTH = tuple(b["annual_growth_usd"] / WORKING_HOURS_PER_YEAR for b in BILLIONAIRES)
+
+# Hours of billionaire time per one unit of local currency, per currency. An
+# item's time-to-afford is then a single multiply: cost * factor.
+_WEALTH_HOURS_PER_UNIT = {
+    cur: (
+        tuple(usd / r for r in BILLIONAIRE_HOURLY_NET_WORTH),
+        tuple(usd / r for r in BILLIONAIRE_HOURLY_GROWTH),
+    )
+    for cur, usd in CURRENCY_TO_USD.items()
+}
+
+try:  # NumPy is optional: it only speeds up the batch path.
+    import numpy as _np
+except ImportError:  # pragma: no cover - exercised when numpy isn't installed
+    _np = None
+
+
+def _hours_per_unit(currency: str) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    return _WEALTH_HOURS_PER_UNIT.get(currency) or _WEALTH_HOURS_PER_UNIT["$"]
+
+
+class WealthRow:
+    """One billionaire's time-to-afford for one item.
+
+    Holds the raw hours; the display strings are only formatted when a
+    template (or as_dict) actually reads them. Supports both attribute and
+    item access so templates can treat it like the old dict rows.
+    """
+
+    __slots__ = ("name", "is_trillionaire", "net_worth_hours", "growth_hours", "can_buy_num")
+
+    def __init__(self, name: str, is_trillionaire: bool, net_worth_hours: float,
+                 growth_hours: float, user_hours: float):
+        self.name = name
+        self.is_trillionaire = is_trillionaire
+        self.net_worth_hours = net_worth_hours
+        self.growth_hours = growth_hours
+        self.can_buy_num = (
+            round(user_hours / growth_hours, 1) if growth_hours > 0 and user_hours > 0 else 0
+        )
+
+    @property
+    def by_net_worth(self) -> str:
+        return format_wealth_time(self.net_worth_hours)
+
+    @property
+    def by_growth(self) -> str:
+        return format_wealth_time(self.growth_hours)
+
+    @property
+    def can_buy(self) -> str:
+        n = self.can_buy_num
+        return f"{n:,.0f}" if n >= 1 else f"{n:,.1f}"
+
+    def __getitem__(self, key: str):
+        return getattr(self, key)
+
+    def as_dict(self) -> dict:
+        return {
+            "name":            self.name,
+            "is_trillionaire": self.is_trillionaire,
+            "by_net_worth":    self.by_net_worth,
+            "by_growth":       self.by_growth,
+            "can_buy":         self.can_buy,
+            "can_buy_num":     self.can_buy_num,
+        }
+
+
+def wealth_hours_matrix(item_costs, currency: str):
+    """Hours for every item x every billionaire in one go.
+
+    Returns (by_net_worth, by_growth), each shaped (len(item_costs), len(BILLIONAIRES)).
+    NumPy arrays when numpy is installed, nested lists otherwise.
+    """
+    nw, gr = _hours_per_unit(currency)
+    if _np is not None:
+        costs = _np.asarray(item_costs, dtype=float)[:, None]
+        return costs * _np.asarray(nw), costs * _np.asarray(gr)
+    costs = [float(c) for c in item_costs]
+    return [[c * f for f in nw] for c in costs], [[c * f for f in gr] for c in costs]
+
+
+def wealth_comparison_batch(item_costs, currency: str, user_hourly: float = 0.0) -> list[list[WealthRow]]:
+    """wealth_comparison for many items at once; rows format lazily."""
+    by_nw, by_gr = wealth_hours_matrix(item_costs, currency)
+    if _np is not None:
+        by_nw, by_gr = by_nw.tolist(), by_gr.tolist()
+    out = []
+    for cost, nw_row, gr_row in zip(item_costs, by_nw, by_gr):
+        # User's time in hours (for the "can_buy" ratio); the FX rate cancels out.
+        user_hours = (float(cost) / user_hourly) if user_hourly > 0 else 0.0
+        out.append([
+            WealthRow(b["name"], b.get("is_trillionaire", False), nw_h, gr_h, user_hours)
+            for b, nw_h, gr_h in zip(BILLIONAIRES, nw_row, gr_row)
+        ])
+    return out
+
+
+def wealth_comparison(item_cost: float, currency: str, user_hourly: float = 0.0) -> list[WealthRow]:
     """Return per-billionaire time-to-afford rows for a given item cost."""
-    usd_rate = CURRENCY_TO_USD.get(currency, 1.0)
-    item_cost_usd = item_cost * usd_rate
-    # User's time in hours (for the "can_buy" ratio)
-    user_hours = (item_cost_usd / (user_hourly * usd_rate)) if user_hourly > 0 else 0.0
-    rows = []
-    for b in BILLIONAIRES:
-        hourly_net_worth  = b["net_worth_usd"]  / WORKING_HOURS_PER_YEAR
-        hourly_growth     = b["annual_growth_usd"] / WORKING_HOURS_PER_YEAR
-        b_hours = item_cost_usd / hourly_growth
-        can_buy_num = round(user_hours / b_hours, 1) if b_hours > 0 and user_hours > 0 else 0
-        rows.append({
-            "name":          b["name"],
-            "is_trillionaire": b.get("is_trillionaire", False),
-            "by_net_worth":  format_wealth_time(item_cost_usd / hourly_net_worth),
-            "by_growth":     format_wealth_time(item_cost_usd / hourly_growth),
-            "can_buy":       f"{can_buy_num:,.0f}" if can_buy_num >= 1 else f"{can_buy_num:,.1f}",
-            "can_buy_num":   can_buy_num,
-        })
-    return rows
+    return wealth_comparison_batch([item_cost], currency, user_hourly)[0]
 
 
 def money_to_time(cost: float, hourly_rate: float) -> dict:
@@ -92,6 +178,8 @@ def money_to_time(cost: float, hourly_rate: float) -> dict:
         hourly_rate = float(hourly_rate)
     except (TypeError, ValueError):
         return {"ok": False, "error": "Invalid number.", "human": ""}
+    if not (math.isfinite(cost) and math.isfinite(hourly_rate)):  # "inf", "nan", 1e400
+        return {"ok": False, "error": "Invalid number.", "human": ""}
 
     if hourly_rate <= 0:
         return {"ok": False, "error": "Hourly rate must be greater than 0.", "human": ""}
@@ -0,0 +1,146 @@
+"""Freelance entries and their daily rollup.
+
+freelance_entries holds one row per logged session; freelance_daily keeps the
+per owner/day/client totals (hours, earned, entries) that the freelance page
+and the "use effective rate" action read, so their cost grows with the days
+and clients in the range rather than with the number of sessions. Every write
+goes through add_entry()/delete_entry(), which update both tables in the
+caller's transaction; rebuild_rollup() recomputes it from the entries (init
+backfill, and scripts that insert entries directly).
+"""
+from __future__ import annotations
+
+from sqlalchemy import text
+
+# Rows shown in the page's ledger; the totals above it always cover the whole range.
+LEDGER_LIMIT = 200
+
+
+def add_entry(conn, owner_key: str, work_date: str, client: str, hours: float, rate: float,
+              notes: str | None) -> None:
+    conn.execute(
+        text(
+            """
+            INSERT INTO freelance_entries
+              (owner_key, work_date, client, hours, hourly_rate, notes)
+            VALUES
+              (:uk, :work_date, :client, :hours, :hourly_rate, :notes)
+            """
+        ),
+        {"uk": owner_key, "work_date": work_date, "client": client, "hours": hours,
+         "hourly_rate": rate, "notes": notes},
+    )
+    conn.execute(
+        text(
+            """
+            INSERT INTO freelance_daily (owner_key, work_date, client, hours, earned, entries)
+            VALUES (:uk, :work_date, :client, :hours, :earned, 1)
+            ON CONFLICT (owner_key, work_date, client) DO UPDATE SET
+              hours = freelance_daily.hours + excluded.hours,
+              earned = freelance_daily.earned + excluded.earned,
+              entries = freelance_daily.entries + 1
+            """
+        ),
+        {"uk": owner_key, "work_date": work_date, "client": client, "hours": hours,
+         "earned": hours * rate},
+    )
+
+
+def delete_entry(conn, owner_key: str, entry_id: int) -> None:
+    row = conn.execute(
+        text(
+            "DELETE FROM freelance_entries WHERE id = :id AND owner_key = :uk "
+            "RETURNING work_date, client, hours, hourly_rate"
+        ),
+        {"id": entry_id, "uk": owner_key},
+    ).mappings().first()
+    if not row:
+        return
+    key = {"uk": owner_key, "work_date": row["work_date"], "client": row["client"]}
+    conn.execute(
+        text(
+            """
+            UPDATE freelance_daily
+            SET hours = hours - :hours, earned = earned - :earned, entries = entries - 1
+            WHERE owner_key = :uk AND work_date = :work_date AND client = :client
+            """
+        ),
+        {**key, "hours": row["hours"], "earned": row["hours"] * row["hourly_rate"]},
+    )
+    conn.execute(
+        text(
+            "DELETE FROM freelance_daily "
+            "WHERE owner_key = :uk AND work_date = :work_date AND client = :client AND entries <= 0"
+        ),
+        key,
+    )
+
+
+def rebuild_rollup(conn, owner_key: str | None = None) -> None:
+    """Recompute freelance_daily from freelance_entries (one owner, or everyone)."""
+    scope = "owner_key = :uk" if owner_key is not None else "owner_key IS NOT NULL"
+    conn.execute(text(f"DELETE FROM freelance_daily WHERE {scope}"), {"uk": owner_key})
+    conn.execute(
+        text(
+            f"""
+            INSERT INTO freelance_daily (owner_key, work_date, client, hours, earned, entries)
+            SELECT owner_key, work_date, client, SUM(hours), SUM(hours * hourly_rate), COUNT(*)
+            FROM freelance_entries
+            WHERE {scope} AND work_date IS NOT NULL
+            GROUP BY owner_key, work_date, client
+            """
+        ),
+        {"uk": owner_key},
+    )
+
+
+def client_totals(conn, owner_key: str, start: str) -> list[dict]:
+    """[{client, hours, earned, entries}] since `start`, biggest earner first."""
+    return [
+        dict(r) for r in conn.execute(
+            text(
+                """
+                SELECT client, SUM(hours) AS hours, SUM(earned) AS earned, SUM(entries) AS entries
+                FROM freelance_daily
+                WHERE owner_key = :uk AND work_date >= :start
+                GROUP BY client
+                ORDER BY SUM(earned) DESC
+                """
+            ),
+            {"uk": owner_key, "start": start},
+        ).mappings()
+    ]
+
+
+def range_totals(conn, owner_key: str, start: str) -> tuple[float, float]:
+    """(hours, earned) since `start`."""
+    row = conn.execute(
+        text(
+            "SELECT COALESCE(SUM(hours), 0) AS hours, COALESCE(SUM(earned), 0) AS earned "
+            "FROM freelance_daily WHERE owner_key = :uk AND work_date >= :start"
+        ),
+        {"uk": owner_key, "start": start},
+    ).mappings().first()
+    return float(row["hours"]), float(row["earned"])
+
+
+def recent_entries(conn, owner_key: str, start: str, limit: int = LEDGER_LIMIT):
+    return conn.execute(
+        text(
+            """
+            SELECT
+              id,
+              work_date,
+              hours,
+              hourly_rate AS rate,
+              (hours * hourly_rate) AS total,
+              notes,
+              client AS job_name
+            FROM freelance_entries
+            WHERE work_date >= :start AND owner_key = :uk
+            ORDER BY work_date DESC, id DESC
+            LIMIT :limit
+            """
+        ),
+        {"start": start, "uk": owner_key, "limit": limit},
+    ).mappings().all()
@@ -0,0 +1,53 @@
+"""HTTP caching helpers for pages that don't depend on the visitor.
+
+`static_page` marks a view as content that only changes on deploy (landing,
+formulas, sitemap, …). The app-level request hooks check the marker via
+`is_static_page()` and skip their session writes and DB-backed globals, so the
+response carries no Set-Cookie and can be cached by browsers and CDNs. The
+decorator itself adds a strong ETag, Last-Modified and Cache-Control, and turns
+matching conditional requests into 304s.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from functools import wraps
+
+from flask import current_app, make_response, request
+
+from dataversion import source_files
+
+# Static pages only change when a new build ships, so the newest source file is
+# an honest Last-Modified. Unlike process start it is the same on every worker
+# and machine running the image, and across restarts; it is worked out once at
+# import so revalidation stays free of stat calls.
+DEPLOYED_AT = datetime.fromtimestamp(
+    max(st.st_mtime for _rel, st in source_files()), timezone.utc,
+).replace(microsecond=0)
+
+STATIC_PAGE_MAX_AGE = 3600
+
+
+def static_page(view=None, *, max_age: int = STATIC_PAGE_MAX_AGE):
+    """Decorator: serve `view` as a cacheable, session-free page."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            resp = make_response(fn(*args, **kwargs))
+            if resp.status_code != 200:
+                return resp
+            resp.add_etag()
+            resp.last_modified = DEPLOYED_AT
+            resp.cache_control.public = True
+            resp.cache_control.max_age = max_age
+            return resp.make_conditional(request)
+
+        wrapper.static_page = True
+        return wrapper
+
+    return decorate(view) if view is not None else decorate
+
+
+def is_static_page() -> bool:
+    """True when the current request is routed to a `static_page` view."""
+    fn = current_app.view_functions.get(request.endpoint or "")
+    return bool(getattr(fn, "static_page", False))
@@ -12,27 +12,38 @@ from __future__ import annotations
 
 import os
 import csv
+import hashlib
 import io
+import math
 import secrets
+import threading
 from datetime import datetime
 from itertools import zip_longest
-from collections import defaultdict
+from collections import OrderedDict
 
 from flask import (
-    Blueprint, render_template, request, session, redirect, url_for, Response,
+    Blueprint, render_template, request, session, redirect, url_for, Response, jsonify,
 )
 from sqlalchemy import text
 
-from database import engine, get_db_connection as get_connection
+import ogimage
+from database import engine, get_db_connection as get_connection, get_read_connection
+from dataversion import bump_after_writes, versioned
 from core.finance import (
     BILLIONAIRES,
+    BILLIONAIRE_HOURLY_NET_WORTH,
+    BILLIONAIRE_HOURLY_GROWTH,
     CURRENCY_TO_USD,
     WORKING_HOURS_PER_YEAR,
     safe_float,
     wealth_comparison,
+    wealth_comparison_batch,
     money_to_time,
     workday_equivalent,
 )
+from core import expenses as expense_store
+from core import freelance as freelance_store
+from core.httpcache import static_page
 from core.auth import make_pin as _make_pin, verify_pin as _verify_pin
 from core.timeutil import utc_now_iso as _dinaro_now
 from core.profile import (
@@ -57,6 +68,55 @@ from core.profile import (
 core_bp = Blueprint("core", __name__)
 
 
+# ----------------------------
+# Data version (see dataversion.py)
+# ----------------------------
+# The owner_key the personal pages use (see _personal_value), worked out in SQL
+# so reading or bumping the version stays a single statement.
+_OWNER_KEY_SQL = (
+    "COALESCE(NULLIF((SELECT profile_name FROM personal_profiles WHERE id = :pid), ''), :fallback)"
+)
+
+
+def _owner_key_params():
+    fallback = session.get("profile_name") or session.get("user_key")
+    if not fallback and not session.get("personal_profile_id"):
+        return None
+    return {"pid": session.get("personal_profile_id"), "fallback": fallback}
+
+
+def _bump_owner_version() -> None:
+    params = _owner_key_params()
+    if params is None:
+        return
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                f"INSERT INTO owner_versions (owner_key, data_version) VALUES ({_OWNER_KEY_SQL}, 1) "
+                "ON CONFLICT (owner_key) DO UPDATE SET data_version = owner_versions.data_version + 1"
+            ),
+            params,
+        )
+
+
+def _owner_version():
+    params = _owner_key_params()
+    if params is None:
+        return None
+    conn = get_read_connection()
+    try:
+        version = conn.execute(
+            text(f"SELECT data_version FROM owner_versions WHERE owner_key = {_OWNER_KEY_SQL}"),
+            params,
+        ).scalar()
+    finally:
+        conn.close()
+    return str(version or 0)
+
+
+bump_after_writes(core_bp, _bump_owner_version)
+
+
 @core_bp.get("/favicon.ico")
 def favicon():
     return redirect(url_for("static", filename="favicon.svg"))
@@ -71,12 +131,14 @@ def set_view():
 
 
 @core_bp.route("/")
+@static_page
 def landing():
     subscribed = request.args.get("subscribed") == "1"
     return render_template("landing.html", subscribed=subscribed)
 
 
 @core_bp.get("/sitemap.xml")
+@static_page(max_age=86400)
 def sitemap():
     base = "https://thetimecost.com"
     pages = [
@@ -111,6 +173,7 @@ def sitemap():
 
 
 @core_bp.get("/robots.txt")
+@static_page(max_age=86400)
 def robots():
     lines = [
         "User-agent: *",
@@ -125,6 +188,7 @@ def robots():
 
 
 @core_bp.route("/support")
+@static_page
 def support():
     links = {
         "min15": os.environ.get("STRIPE_LINK_15MIN", ""),
@@ -136,6 +200,7 @@ def support():
 
 
 @core_bp.get("/formulas")
+@static_page
 def formulas():
     return render_template("formulas.html")
 
@@ -271,26 +336,88 @@ def _detect_region(override: str | None) -> str:
     return _CURRENCY_TO_REGION.get(_currency(), "US")
 
 
+# Rendered /trillionaire pages, LRU-capped. The page is a pure function of the
+# key below: region/period/wage pick the numbers, and view/perspective are the
+# only per-session bits base.html renders (currency comes from the region).
+TRILLIONAIRE_CACHE_MAX = 512
+TRILLIONAIRE_MAX_AGE = 300
+_trillionaire_cache: OrderedDict[tuple, tuple[bytes, str]] = OrderedDict()
+_trillionaire_cache_lock = threading.Lock()
+
+
+def _trillionaire_key(region: str, overridden: bool, period: str, wage: float | None) -> tuple:
+    return (
+        region, overridden, period, wage,
+        session.get("view", "personality"), session.get("perspective", "leslie"),
+    )
+
+
+def _trillionaire_page(region: str, overridden: bool, period: str, wage: float | None) -> tuple[bytes, str]:
+    """Return (body, strong etag) for a page, rendering it on a cache miss."""
+    key = _trillionaire_key(region, overridden, period, wage)
+    with _trillionaire_cache_lock:
+        hit = _trillionaire_cache.get(key)
+        if hit is not None:
+            _trillionaire_cache.move_to_end(key)
+            return hit
+
+    body = _render_trillionaire(region, overridden, period, wage).encode("utf-8")
+    entry = (body, hashlib.sha256(body).hexdigest()[:32])
+    with _trillionaire_cache_lock:
+        _trillionaire_cache[key] = entry
+        _trillionaire_cache.move_to_end(key)
+        while len(_trillionaire_cache) > TRILLIONAIRE_CACHE_MAX:
+            _trillionaire_cache.popitem(last=False)
+    return entry
+
+
+def _trillionaire_prerender(app) -> None:
+    """Warm the cache with every region's default-wage page, as a first-time
+    visitor (default view/perspective) would see it."""
+    for region in REGIONS:
+        for overridden in (False, True):
+            query = f"?region={region}" if overridden else ""
+            with app.test_request_context(f"/trillionaire{query}"):
+                app.preprocess_request()  # same session defaults a real visit gets
+                _trillionaire_page(region, overridden, "hour", None)
+
+
 @core_bp.get("/trillionaire")
 def trillionaire():
     """Sarcastic campaign page: your everyday spend vs. what the first trillionaire
     pockets in the exact same slice of your working life - localised by region."""
     region_arg = request.args.get("region")
     region = _detect_region(region_arg)
-    reg = REGIONS[region]
-    currency = reg["currency"]
-    usd_rate = reg["usd_rate"]
 
     # Wage can be entered per hour / month / year; convert to an hourly rate.
     period = request.args.get("period", "hour")
     if period not in _PERIOD_HOURS:
         period = "hour"
+
+    # Normalise to cents so "20", "20.0" and "20.001" share one cache entry.
+    wage = round(safe_float(request.args.get("wage"), 0.0), 2)
+    body, etag = _trillionaire_page(region, bool(region_arg), period, wage if wage > 0 else None)
+
+    resp = Response(body, mimetype="text/html")
+    resp.set_etag(etag)
+    # The page depends on the session (view/perspective) and the session hooks
+    # set a cookie on first visit, so only the visitor's own browser may keep it.
+    resp.cache_control.private = True
+    resp.cache_control.max_age = TRILLIONAIRE_MAX_AGE
+    if not region_arg:
+        resp.vary.add("Accept-Language")
+    return resp.make_conditional(request)
+
+
+def _render_trillionaire(region: str, overridden: bool, period: str, wage: float | None) -> str:
+    reg = REGIONS[region]
+    currency = reg["currency"]
+    usd_rate = reg["usd_rate"]
     divisor = _PERIOD_HOURS[period]
 
-    wage_q = request.args.get("wage")
     used_default = False
-    if wage_q and safe_float(wage_q, 0.0) > 0:
-        wage_value = safe_float(wage_q, 0.0)
+    if wage is not None:
+        wage_value = wage
         hourly = wage_value / divisor
     else:
         used_default = True
@@ -325,8 +452,15 @@ def trillionaire():
             "homes_round": f"{homes_round:,.0f}",
         })
 
+    # Shared links name the region (and a custom wage), so the card a crawler
+    # gets matches the page: the lead basket item at this wage.
+    wage_args = {} if used_default else {"period": period, "wage": wage_value}
+    share_args = _share_args(rows[0]["name"], rows[0]["minutes"] / 60.0, region)
+
     return render_template(
         "trillionaire.html",
+        share_url=SHARE_ORIGIN + url_for("core.trillionaire", region=region, **wage_args),
+        share_image=_share_image_url(share_args) if share_args else f"{SHARE_ORIGIN}/static/og-trillionaire.png",
         currency=currency,
         hourly=hourly,
         used_default=used_default,
@@ -335,7 +469,7 @@ def trillionaire():
         region=region,
         region_flag=reg["flag"],
         region_label=reg["label"],
-        region_overridden=bool(region_arg),
+        region_overridden=overridden,
         regions=[(code, r["flag"], r["label"]) for code, r in REGIONS.items()],
         period=period,
         wage_value=wage_value,
@@ -461,6 +595,7 @@ TRILLIONAIRE_REFERENCES = [
 
 
 @core_bp.get("/SendElonToSpace")
+@static_page
 def trillionaire_credits():
     """A satirical 80s-terminal 'celebration' of the first trillionaire, with the
     real human cost of the funding cuts rolling underneath as respectful credits.
@@ -476,6 +611,7 @@ def trillionaire_credits_legacy():
 
 
 @core_bp.get("/SendElonToSpace/sources")
+@static_page
 def celebration_sources():
     """Public reference sheet - every figure on the trillionaire/celebration pages
     with its verified source(s). Shareable by link."""
@@ -602,6 +738,22 @@ def calculator():
     if isinstance(result, float) and result > 0:
         wealth_rows = wealth_comparison(float(item_cost), session.get("currency", DEFAULT_CURRENCY), user_hourly=hourly_rate)
 
+    # A result links to /calculate?item=…&hours=…&region=…; opening that link is
+    # what gives crawlers the result's own share card.
+    share_url = None
+    if isinstance(result, float):
+        args = _share_args(item_name, result, _CURRENCY_TO_REGION.get(_currency(), "US"))
+        if args:
+            share_url = SHARE_ORIGIN + url_for("core.calculator", **args)
+    shared = _share_args(request.args.get("item"), request.args.get("hours"), request.args.get("region"))
+    share_meta = None
+    if shared:
+        share_meta = {
+            "title": f"{shared['item'] or 'This'} costs {_share_human(shared)} of work",
+            "image": _share_image_url(shared),
+            "url": SHARE_ORIGIN + url_for("core.calculator", **shared),
+        }
+
     return render_template(
         "calculator.html",
         result=result,
@@ -617,13 +769,163 @@ def calculator():
         display_wage_amount=display_wage_amount,
         wealth_rows=wealth_rows,
         now_month_year=datetime.now().strftime("%B %Y"),
+        share_url=share_url,
+        share_meta=share_meta,
     )
 
 
+# ----------------------------
+# Routes: Share images
+# ----------------------------
+# og:image / og:url must be absolute; same origin base.html hard-codes.
+SHARE_ORIGIN = "https://thetimecost.com"
+OG_MAX_AGE = 24 * 3600
+OG_ITEM_MAX = 60
+OG_MAX_HOURS = 1_000_000
+
+
+def _share_args(item, hours, region) -> dict | None:
+    """A result's share-link query args, normalised so equal results share one
+    URL (and one cached card). None when there's nothing to share."""
+    hours = safe_float(hours)
+    if not math.isfinite(hours):
+        return None
+    minutes = round(min(max(hours, 0.0), OG_MAX_HOURS) * 60)
+    if minutes <= 0:
+        return None
+    region = (region or "").strip().upper()
+    return {
+        "item": " ".join(str(item or "").split())[:OG_ITEM_MAX],
+        "hours": round(minutes / 60, 2),
+        "region": region if region in REGIONS else "US",
+    }
+
+
+def _share_image_url(args: dict) -> str:
+    return SHARE_ORIGIN + url_for("core.og_result", **args)
+
+
+def _share_human(args: dict) -> str:
+    # An hourly rate of 60 turns minutes into money_to_time's "9h 57m" text.
+    return money_to_time(round(args["hours"] * 60), 60.0)["human"]
+
+
+@core_bp.get("/og/result.png")
+@static_page(max_age=OG_MAX_AGE)
+def og_result():
+    """Share card for one result (item, hours, region), rendered once per
+    distinct result and then served from ogimage's disk cache."""
+    args = _share_args(request.args.get("item"), request.args.get("hours"), request.args.get("region"))
+    if args is None:
+        return "Nothing to share", 400
+    reg = REGIONS[args["region"]]
+    minutes = round(args["hours"] * 60)
+    key = ogimage.card_key("result", args["item"], minutes, args["region"])
+
+    def render():
+        item = args["item"] or "This"
+        earns = TRILLIONAIRE_GROWTH_USD / WORKING_HOURS_PER_YEAR / reg["usd_rate"] * args["hours"]
+        return ogimage.result_card(
+            item[:1].upper() + item[1:],
+            _share_human(args),
+            f"The first trillionaire earns {reg['currency']}{_humanize_big(earns)} in the same time.",
+            reg["label"],
+        )
+
+    try:
+        png = ogimage.cached_png(key, render)
+    except ogimage.RenderBusy:
+        return Response("Busy rendering cards, try again shortly", status=503,
+                        headers={"Retry-After": "5"}, mimetype="text/plain")
+    resp = Response(png, mimetype="image/png")
+    resp.set_etag(key)
+    return resp
+
+
+# ----------------------------
+# Routes: JSON API
+# ----------------------------
+# Hard cap on one batch so a single request can't pin a worker.
+API_MAX_ITEMS = 1000
+
+
+def _api_time_cost_item(raw, hourly_rate: float) -> dict:
+    """One priced item → time cost and workday text.
+    Accepts a bare number or {"name": ..., "price": ...}."""
+    if isinstance(raw, dict):
+        name = str(raw.get("name") or "")
+        price = raw.get("price")
+    else:
+        name = ""
+        price = raw
+
+    if isinstance(price, bool):
+        price = None
+    time_cost = money_to_time(price, hourly_rate)
+    if not time_cost["ok"]:
+        return {"name": name, "ok": False, "error": time_cost["error"]}
+
+    return {
+        "name": name,
+        "ok": True,
+        "price": time_cost["cost"],
+        "time_cost": time_cost,
+        "workday_text": workday_equivalent(time_cost["total_hours"]),
+    }
+
+
+@core_bp.post("/api/v1/time-cost")
+def api_time_cost():
+    """Batch version of /calculate for browser tooling and basket imports.
+
+    Body: {"wage": 20, "wage_type": "hourly", "currency": "£",
+           "items": [12.5, {"name": "Headphones", "price": 199}, ...]}
+    `wage` may be omitted to use the session's effective hourly rate.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+
+    items = data.get("items")
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "items must be a non-empty list"}), 400
+    if len(items) > API_MAX_ITEMS:
+        return jsonify({"error": f"At most {API_MAX_ITEMS} items per request"}), 400
+
+    wage_type = str(data.get("wage_type") or "hourly").strip().lower()
+    if data.get("wage") in (None, ""):
+        hourly_rate = get_effective_hourly_rate() or 0.0
+    else:
+        wage = safe_float(data.get("wage"), 0.0)
+        hourly_rate = _hourly_from_wage(wage, wage_type) if wage > 0 else 0.0
+    if not math.isfinite(hourly_rate) or hourly_rate <= 0:
+        return jsonify({"error": "A positive wage is required"}), 400
+
+    c = data.get("currency")
+    currency = c if c in ALLOWED_CURRENCIES else _currency()
+
+    results = [_api_time_cost_item(raw, hourly_rate) for raw in items]
+
+    # Billionaire comparison for every valid item in one matrix operation.
+    valid = [r for r in results if r["ok"]]
+    if valid:
+        rows = wealth_comparison_batch([r["price"] for r in valid], currency, user_hourly=hourly_rate)
+        for r, wealth_rows in zip(valid, rows):
+            r["billionaires"] = [w.as_dict() for w in wealth_rows]
+
+    return jsonify({
+        "hourly_rate": round(hourly_rate, 4),
+        "currency": currency,
+        "count": len(results),
+        "items": results,
+    })
+
+
 # ----------------------------
 # Routes: Personal
 # ----------------------------
 @core_bp.route("/personal", methods=["GET", "POST"])
+@versioned(_owner_version)
 def personal():
     error = None
     profile = _get_personal_profile()
@@ -746,11 +1048,7 @@ def personal():
     owner_key = _personal_value("profile_name") or session.get("user_key")
     conn = get_connection()
     try:
-        row = conn.execute(
-            text("SELECT COALESCE(SUM(amount), 0) AS total FROM expenses WHERE owner_key = :uk"),
-            {"uk": owner_key}
-        ).mappings().first()
-        expenses_total = float(row["total"]) if row and row["total"] is not None else 0.0
+        expenses_total = expense_store.load_summary(conn, owner_key).total
     except Exception:
         expenses_total = 0.0
     finally:
@@ -778,37 +1076,23 @@ def personal():
 # Routes: Timebank
 # ----------------------------
 @core_bp.route("/timebank", methods=["GET", "POST"])
+@versioned(_owner_version)
 def timebank():
     currency = _currency()
     owner_key = _personal_value("profile_name") or session.get("user_key")
 
-    def fetch_savings_total() -> float:
-        conn = get_connection()
-        try:
-            row = conn.execute(
-            text("SELECT COALESCE(SUM(amount), 0) AS total FROM expenses WHERE category = 'Nest Egg' AND owner_key = :uk"),
-            {"uk": owner_key}
-            ).mappings().first()
-            return float(row["total"]) if row and row["total"] is not None else 0.0
-        finally:
-            conn.close()
-
-    def fetch_all_expenses():
-        conn = get_connection()
-        try:
-            return conn.execute(
-                text("SELECT amount, category FROM expenses WHERE owner_key = :uk"),
-                {"uk": owner_key}
-            ).mappings().all()
-        finally:
-            conn.close()
+    conn = get_connection()
+    try:
+        summary = expense_store.load_summary(conn, owner_key)
+    finally:
+        conn.close()
 
     if request.method == "POST":
         income = safe_float(request.form.get("income"), 0.0)
         expenses = safe_float(request.form.get("expenses"), 0.0)
         hoursWorked = safe_float(request.form.get("hoursWorked"), 0.0)
 
-        savings_value = fetch_savings_total()
+        savings_value = summary.by_category.get("Nest Egg", 0.0)
 
         return render_template(
             "timebank.html",
@@ -821,10 +1105,8 @@ def timebank():
 
     income = safe_float(_personal_value("annual_rate", session.get("annualRate")), 0.0) / 12.0
 
-    all_rows = fetch_all_expenses()
-    expenses_total = sum((row.get("amount") or 0) for row in all_rows)
-    savings_value = sum((row.get("amount") or 0) for row in all_rows if row.get("category") in ("Nest Egg", "Savings")
-)
+    expenses_total = summary.total
+    savings_value = summary.savings
 
     weekly_hours = safe_float(_personal_value("work_hours", session.get("workHours")), 0.0)
     hoursWorked = _weekly_to_monthly_hours(weekly_hours) if weekly_hours > 0 else 0.0
@@ -843,6 +1125,7 @@ def timebank():
 # Routes: Expenses
 # ----------------------------
 @core_bp.route("/expenses", methods=["GET", "POST"])
+@versioned(_owner_version)
 def expenses():
     owner_key = _personal_value("profile_name") or session.get("user_key")
 
@@ -857,6 +1140,7 @@ def expenses():
                     ),
                     {"name": "", "amount": 0.0, "category": "House & Light", "scope": "personal", "owner_key": owner_key},
                 )
+                expense_store.refresh_summary(conn, owner_key)
             return redirect(url_for("core.expenses"))
 
         # Otherwise treat as Save
@@ -891,6 +1175,7 @@ def expenses():
                     ),
                     {"name": name, "amount": amt, "category": category, "scope": scope, "owner_key": owner_key},
                 )
+            expense_store.refresh_summary(conn, owner_key)
 
         return redirect(url_for("core.expenses"))
 
@@ -901,10 +1186,7 @@ def expenses():
             text("SELECT * FROM expenses WHERE owner_key = :uk ORDER BY id ASC"),
             {"uk": owner_key}
         ).mappings().all()
-        category_totals = conn.execute(
-            text("SELECT category, COALESCE(SUM(amount), 0) AS total FROM expenses WHERE owner_key = :uk GROUP BY category"),
-            {"uk": owner_key}
-        ).mappings().all()
+        category_totals = expense_store.load_summary(conn, owner_key).category_totals()
         hourly_value = get_effective_hourly_rate() or 0.0
     finally:
         conn.close()
@@ -923,6 +1205,7 @@ def expenses_reset():
     owner_key = _personal_value("profile_name") or session.get("user_key")
     with engine.begin() as conn:
         conn.execute(text("DELETE FROM expenses WHERE owner_key = :uk"), {"uk": owner_key})
+        expense_store.refresh_summary(conn, owner_key)
     return redirect(url_for("core.expenses"))
 
 @core_bp.route("/update_expense_category", methods=["POST"])
@@ -938,6 +1221,7 @@ def update_expense_category():
             text("UPDATE expenses SET category = :cat WHERE id = :id AND owner_key = :uk"),
             {"cat": new_category, "id": int(expense_id), "uk": owner_key},
         )
+        expense_store.refresh_summary(conn, owner_key)
 
     return redirect(url_for("core.expenses"))
 
@@ -947,6 +1231,7 @@ def remove_expense(index):
     owner_key = _personal_value("profile_name") or session.get("user_key")
     with engine.begin() as conn:
         conn.execute(text("DELETE FROM expenses WHERE id = :id AND owner_key = :uk"), {"id": index, "uk": owner_key})
+        expense_store.refresh_summary(conn, owner_key)
     return redirect(url_for("core.expenses"))
 
 
@@ -954,24 +1239,21 @@ def remove_expense(index):
 # Routes: Budget
 # ----------------------------
 @core_bp.route("/budget", methods=["GET", "POST"])
+@versioned(_owner_version)
 def budget():
     currency = _currency()
     owner_key = _personal_value("profile_name") or session.get("user_key")
 
-    conn = get_connection()
+    conn = get_read_connection()
     try:
-        row = conn.execute(
-            text("SELECT COALESCE(SUM(amount), 0) AS total FROM expenses WHERE owner_key = :uk"),
-            {"uk": owner_key}
-        ).mappings().first()
-        expenses_total = float(row["total"]) if row and row["total"] is not None else 0.0
+        expenses_total = expense_store.load_summary(conn, owner_key).total
     except Exception:
         expenses_total = 0.0
     finally:
         conn.close()
 
     def fetch_goals():
-        conn2 = get_connection()
+        conn2 = get_read_connection()
         try:
             return conn2.execute(
                 text("SELECT * FROM goals WHERE owner_key = :uk"),
@@ -1052,6 +1334,7 @@ def budget():
 # Routes: Goals
 # ----------------------------
 @core_bp.route("/goals", methods=["GET", "POST"])
+@versioned(_owner_version)
 def goals():
     owner_key = _personal_value("profile_name") or session.get("user_key")
 
@@ -1086,7 +1369,7 @@ def goals():
 
         return redirect(url_for("core.goals"))
 
-    conn = get_connection()
+    conn = get_read_connection()
     try:
         goals_rows = conn.execute(
             text("SELECT * FROM goals WHERE owner_key = :uk"),
@@ -1110,6 +1393,7 @@ def delete_goal(goal_id):
 # Routes: Staples
 # ----------------------------
 @core_bp.route("/staples", methods=["GET"])
+@versioned(_owner_version)
 def staples():
     currency = _currency()
     hr = _personal_value("hourly_rate", session.get("hourlyRate")) or ""
@@ -1119,16 +1403,13 @@ def staples():
         hr = f"{eff:.2f}" if eff and eff > 0 else ""
 
     # Billionaires data for client-side JS
-    b_data = []
-    for b in BILLIONAIRES:
-        b_data.append({
-            "name": b["name"],
-            "hourly_net_worth": b["net_worth_usd"] / WORKING_HOURS_PER_YEAR,
-            "hourly_growth": b["annual_growth_usd"] / WORKING_HOURS_PER_YEAR
-        })
+    b_data = [
+        {"name": b["name"], "hourly_net_worth": nw, "hourly_growth": gr}
+        for b, nw, gr in zip(BILLIONAIRES, BILLIONAIRE_HOURLY_NET_WORTH, BILLIONAIRE_HOURLY_GROWTH)
+    ]
 
     # GET view
-    conn = get_connection()
+    conn = get_read_connection()
     owner_key = _personal_value("profile_name") or session.get("user_key")
     try:
         saved_staples = conn.execute(
@@ -1180,12 +1461,9 @@ def staples_post():
 
     with engine.begin() as conn:
         conn.execute(text("DELETE FROM staples WHERE owner_key = :uk"), {"uk": owner_key})
-        for n, c in zip(names, costs):
-            if n.strip():
-                conn.execute(
-                    text("INSERT INTO staples (owner_key, name, cost) VALUES (:uk, :n, :c)"),
-                    {"uk": owner_key, "n": n.strip(), "c": safe_float(c)}
-                )
+        rows = [{"uk": owner_key, "n": n.strip(), "c": safe_float(c)} for n, c in zip(names, costs) if n.strip()]
+        if rows:
+            conn.execute(text("INSERT INTO staples (owner_key, name, cost) VALUES (:uk, :n, :c)"), rows)
 
     return redirect(url_for("core.staples"))
 
@@ -1194,37 +1472,22 @@ def staples_post():
 # Routes: Freelance
 # ----------------------------
 @core_bp.route("/freelance", methods=["GET", "POST"])
+@versioned(_owner_version)
 def freelance():
     owner_key = _personal_value("profile_name") or session.get("user_key")
     range_key = (request.args.get("range") or "month").strip().lower()
     start_date = _freelance_range_to_start(range_key)
 
-    date_col = "work_date"
-
     # POST: Use this effective rate in TimeCost
     if request.method == "POST":
         action = (request.form.get("action") or "").strip().lower()
         if action == "use_effective_rate":
             conn = get_connection()
             try:
-                rows = conn.execute(
-                    text(
-                        f"""
-                        SELECT hours, hourly_rate
-                        FROM freelance_entries
-                        WHERE {date_col} >= :start AND owner_key = :uk
-                        """
-                    ),
-                    {"start": start_date, "uk": owner_key},
-                ).mappings().all()
+                total_hours, total_earned = freelance_store.range_totals(conn, owner_key, start_date)
             finally:
                 conn.close()
 
-            total_hours = sum(safe_float(r.get("hours"), 0.0) for r in rows)
-            total_earned = sum(
-                safe_float(r.get("hours"), 0.0) * safe_float(r.get("hourly_rate"), 0.0)
-                for r in rows
-            )
             effective = (total_earned / total_hours) if total_hours > 0 else 0.0
 
             if effective > 0:
@@ -1233,60 +1496,34 @@ def freelance():
 
         return redirect(url_for("core.freelance", range=range_key))
 
-    # GET view
-    conn = get_connection()
+    # GET view: totals and the per-client breakdown come from the daily rollup;
+    # only the ledger's most recent rows are loaded individually.
+    conn = get_read_connection()
     try:
-        entries = conn.execute(
-            text(
-                f"""
-                SELECT
-                  id,
-                  work_date,
-                  hours,
-                  hourly_rate AS rate,
-                  (hours * hourly_rate) AS total,
-                  notes,
-                  client AS job_name
-                FROM freelance_entries
-                WHERE {date_col} >= :start AND owner_key = :uk
-                ORDER BY work_date DESC, id DESC
-                """
-            ),
-            {"start": start_date, "uk": owner_key},
-        ).mappings().all()
-
+        by_client = freelance_store.client_totals(conn, owner_key, start_date)
+        entries = freelance_store.recent_entries(conn, owner_key, start_date)
     finally:
         conn.close()
 
-    total_hours = round(sum(safe_float(e.get("hours"), 0.0) for e in entries), 2)
-    total_earned = round(sum(safe_float(e.get("total"), 0.0) for e in entries), 2)
+    total_hours = round(sum(safe_float(c["hours"], 0.0) for c in by_client), 2)
+    total_earned = round(sum(safe_float(c["earned"], 0.0) for c in by_client), 2)
+    entry_count = sum(int(c["entries"] or 0) for c in by_client)
     effective_rate = round((total_earned / total_hours) if total_hours > 0 else 0.0, 2)
 
     using_freelance = session.get("wageSource") == "freelance"
     freelance_hourly = session.get("freelanceHourlyRate", "")
 
     # Breakdown: how much time/earned per "job/client"
-    by_client = defaultdict(lambda: {"hours": 0.0, "earned": 0.0})
-
-    for e in entries:
-        client = (e.get("job_name") or "Private").strip()
-        hours = float(e.get("hours") or 0)
-        rate = float(e.get("rate") or 0)
-        earned = float(e.get("total") or (hours * rate) or 0)
-
-        by_client[client]["hours"] += hours
-        by_client[client]["earned"] += earned
-
     client_rows = []
-    for client, v in by_client.items():
-        h = v["hours"]
-        earned = v["earned"]
+    for c in by_client:
+        h = safe_float(c["hours"], 0.0)
+        earned = safe_float(c["earned"], 0.0)
         avg_rate = (earned / h) if h > 0 else 0.0
         equiv_hours = (earned / effective_rate) if effective_rate > 0 else 0.0
 
         client_rows.append(
             {
-                "client": client,
+                "client": (c["client"] or "Private").strip(),
                 "hours": round(h, 2),
                 "earned": round(earned, 2),
                 "avg_rate": round(avg_rate, 2),
@@ -1294,8 +1531,6 @@ def freelance():
             }
         )
 
-    client_rows.sort(key=lambda r: r["earned"], reverse=True)
-
     equiv_total_hours = round((total_earned / effective_rate) if effective_rate > 0 else 0.0, 2)
 
     return render_template(
@@ -1304,6 +1539,7 @@ def freelance():
         range_key=range_key,
         jobs=[],
         entries=entries,
+        entry_count=entry_count,
         total_hours=total_hours,
         total_earned=total_earned,
         effective_rate=effective_rate,
@@ -1336,24 +1572,7 @@ def freelance_add_entry():
         return redirect(url_for("core.freelance"))
 
     with engine.begin() as conn:
-        conn.execute(
-            text(
-                """
-                INSERT INTO freelance_entries
-                  (owner_key, work_date, client, hours, hourly_rate, notes)
-                VALUES
-                  (:uk, :work_date, :client, :hours, :hourly_rate, :notes)
-                """
-            ),
-            {
-                "uk": owner_key,
-                "work_date": work_date,
-                "client": client,
-                "hours": hours,
-                "hourly_rate": rate,
-                "notes": notes or None,
-            },
-        )
+        freelance_store.add_entry(conn, owner_key, work_date, client, hours, rate, notes or None)
 
     return redirect(url_for("core.freelance"))
 
@@ -1362,10 +1581,7 @@ def freelance_add_entry():
 def freelance_delete_entry(entry_id: int):
     owner_key = _personal_value("profile_name") or session.get("user_key")
     with engine.begin() as conn:
-        conn.execute(
-            text("DELETE FROM freelance_entries WHERE id = :id AND owner_key = :uk"),
-            {"id": entry_id, "uk": owner_key},
-        )
+        freelance_store.delete_entry(conn, owner_key, entry_id)
     return redirect(url_for("core.freelance"))
 
 
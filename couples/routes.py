@@ -14,7 +14,8 @@ from flask import redirect, render_template, request, session, url_for, Response
 from sqlalchemy import text
 
 from . import couples_bp
-from database import engine
+from database import engine, get_read_connection
+from dataversion import bump_after_writes, versioned
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -110,6 +111,39 @@ def _safe_float(val, default=0.0):
 def _get_connection():
     return engine.connect()
 
+# ---------------------------------------------------------------------------
+# Data version (see dataversion.py): bumped for the partner's partnership
+# ---------------------------------------------------------------------------
+
+_PARTNERSHIP_OF_PARTNER = "SELECT partnership_id FROM couples_partners WHERE id = :id"
+
+def _couples_bump_version():
+    partner_id = _couples_require_partner()
+    if not partner_id:
+        return
+    with engine.begin() as conn:
+        conn.execute(
+            text(f"UPDATE couples_partnerships SET data_version = data_version + 1 "
+                 f"WHERE id = ({_PARTNERSHIP_OF_PARTNER})"),
+            {"id": partner_id},
+        )
+
+def _couples_version():
+    partner_id = _couples_require_partner()
+    if not partner_id:
+        return None
+    conn = get_read_connection()
+    try:
+        row = conn.execute(
+            text(f"SELECT id, data_version FROM couples_partnerships WHERE id = ({_PARTNERSHIP_OF_PARTNER})"),
+            {"id": partner_id},
+        ).mappings().first()
+    finally:
+        conn.close()
+    return f"{row['id']}.{row['data_version']}" if row else None
+
+bump_after_writes(couples_bp, _couples_bump_version)
+
 # ---------------------------------------------------------------------------
 # Phase 1: Landing, Setup, Join, Login, Logout
 # ---------------------------------------------------------------------------
@@ -158,12 +192,12 @@ def couples_setup():
                 partner_id = conn.execute(text("SELECT last_insert_rowid() AS id")).mappings().first()["id"]
 
             # Seed default tasks
-            for title, cat, mins in DEFAULT_TASKS:
-                conn.execute(
-                    text("""INSERT INTO couples_tasks (partnership_id, title, category, default_minutes, created_by, created_at)
-                            VALUES (:pid, :t, :c, :m, :cb, :now)"""),
-                    {"pid": pid, "t": title, "c": cat, "m": mins, "cb": partner_id, "now": now},
-                )
+            conn.execute(
+                text("""INSERT INTO couples_tasks (partnership_id, title, category, default_minutes, created_by, created_at)
+                        VALUES (:pid, :t, :c, :m, :cb, :now)"""),
+                [{"pid": pid, "t": title, "c": cat, "m": mins, "cb": partner_id, "now": now}
+                 for title, cat, mins in DEFAULT_TASKS],
+            )
 
         session["couples_partner_id"] = int(partner_id)
         session["couples_partnership_code"] = code
@@ -463,7 +497,7 @@ def _couples_compute_insights(partnership_id, period="this_week"):
     start_str = start.isoformat()
     end_str = end.isoformat()
 
-    conn = _get_connection()
+    conn = get_read_connection()
     try:
         # Per-partner totals
         totals = conn.execute(
@@ -525,6 +559,7 @@ def _couples_compute_insights(partnership_id, period="this_week"):
 
 
 @couples_bp.get("/dashboard")
+@versioned(_couples_version)
 def couples_dashboard():
     partner_id = _couples_require_partner()
     if not partner_id:
@@ -532,7 +567,7 @@ def couples_dashboard():
 
     partnership_id = _couples_partnership_id(partner_id)
 
-    conn = _get_connection()
+    conn = get_read_connection()
     try:
         partnership = conn.execute(
             text("SELECT * FROM couples_partnerships WHERE id = :id"),
@@ -1,5 +1,9 @@
 import os
-from sqlalchemy import create_engine, text
+import time
+
+from flask import g, has_request_context, session
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import NullPool
 
 DEFAULT_SQLITE_URL = "sqlite:///timecost.db"
 
@@ -16,17 +20,191 @@ def get_database_url() -> str:
     return url
 
 
-engine = create_engine(
-    get_database_url(),
-    pool_pre_ping=True,
-    future=True,
+def _env_flag(name: str, default: bool) -> bool:
+    val = os.environ.get(name)
+    if val is None or not val.strip():
+        return default
+    return val.strip().lower() not in ("0", "false", "no", "off")
+
+
+def _env_int(name: str) -> int | None:
+    val = (os.environ.get(name) or "").strip()
+    return int(val) if val.lstrip("-").isdigit() else None
+
+
+def engine_options(url: str) -> dict:
+    """create_engine() keyword arguments from the environment.
+
+      DB_POOL_SIZE / DB_MAX_OVERFLOW  pool sizing (gunicorn.conf.py derives them
+                                      from its thread count; else 5 + 10)
+      DB_POOL_RECYCLE                 seconds before a pooled connection is replaced
+      DB_POOL_TIMEOUT                 seconds to wait for a free connection
+      DB_POOL_PRE_PING                "0" skips the liveness ping on checkout (saves
+                                      a round trip; pair with DB_POOL_RECYCLE below
+                                      the server's idle timeout)
+      DB_STATEMENT_TIMEOUT_MS         Postgres statement_timeout for app queries
+      DB_PGBOUNCER                    "1" when DATABASE_URL points at a transaction
+                                      pooler (PgBouncer, Fly's pooler): no client
+                                      pool, no startup options, no pre-ping
+
+    Postgres bulk writes (executemany) go through psycopg2's
+    execute_values / execute_batch instead of one round trip per row.
+    """
+    opts = {"future": True}
+    postgres = url.startswith("postgresql")
+    pgbouncer = postgres and _env_flag("DB_PGBOUNCER", False)
+
+    if pgbouncer:
+        # The pooler multiplexes server connections per transaction: keeping a
+        # second pool here only pins them, and it rejects startup parameters.
+        opts["poolclass"] = NullPool
+        opts["pool_pre_ping"] = False
+    else:
+        opts["pool_pre_ping"] = _env_flag("DB_POOL_PRE_PING", True)
+        for env, key in (("DB_POOL_SIZE", "pool_size"), ("DB_MAX_OVERFLOW", "max_overflow"),
+                         ("DB_POOL_RECYCLE", "pool_recycle"), ("DB_POOL_TIMEOUT", "pool_timeout")):
+            val = _env_int(env)
+            if val is not None:
+                opts[key] = val
+
+    if postgres:
+        opts["executemany_mode"] = "values_plus_batch"
+        timeout = _env_int("DB_STATEMENT_TIMEOUT_MS")
+        if timeout and not pgbouncer:
+            opts["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return opts
+
+
+def configure_engine(engine) -> None:
+    """Per-connection/transaction hooks that create_engine() can't express."""
+    url = str(engine.url)
+    event.listen(engine, "commit", _note_commit)
+    if _sqlite_tuning_enabled(url):
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    timeout = _env_int("DB_STATEMENT_TIMEOUT_MS")
+    if url.startswith("postgresql") and timeout and _env_flag("DB_PGBOUNCER", False):
+        # Session settings don't survive transaction pooling: set it per transaction.
+        @event.listens_for(engine, "begin")
+        def _statement_timeout(conn):
+            conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout)}")
+
+
+def _note_commit(_conn) -> None:
+    if has_request_context():
+        g.db_committed = True
+
+
+def committed_in_request() -> bool:
+    """True once the current request has committed a transaction on any engine."""
+    return bool(has_request_context() and g.get("db_committed"))
+
+
+# Connect-time tuning for file-backed SQLite (self-hosted and load-test setups):
+# WAL lets readers run alongside the single writer, which matters as soon as
+# gunicorn has more than one worker; NORMAL sync is durable in WAL mode except
+# for the last commits on power loss. SQLITE_TUNING=0 leaves SQLite's defaults.
+SQLITE_PRAGMAS = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("busy_timeout", "5000"),  # ms to wait for the write lock before "database is locked"
+    ("mmap_size", str(256 * 1024 * 1024)),
+    ("cache_size", "-32000"),  # negative = KiB, so ~32 MB per connection
+    ("temp_store", "MEMORY"),
 )
 
 
+def _sqlite_tuning_enabled(url: str) -> bool:
+    if not _env_flag("SQLITE_TUNING", True):
+        return False
+    return url.startswith("sqlite") and ":memory:" not in url and url.rstrip("/") != "sqlite:"
+
+
+def _set_sqlite_pragmas(dbapi_conn, _record) -> None:
+    cur = dbapi_conn.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS:
+            cur.execute(f"PRAGMA {name}={value}")
+    finally:
+        cur.close()
+
+
+engine = create_engine(get_database_url(), **engine_options(get_database_url()))
+configure_engine(engine)
+
+
 def get_db_connection():
     return engine.connect()
 
 
+# ----------------------------
+# Read replica routing
+# ----------------------------
+# With DATABASE_READ_URL set, GET handlers read through get_read_connection()
+# from the replica. Two things pin reads to the primary instead: a write
+# committed earlier in the same request, and a write in the same session less
+# than DB_READ_STICKY_SECONDS ago (replication lag would otherwise make a
+# just-approved chore reappear as pending). Without a read URL, read_engine is
+# engine and nothing here runs.
+READ_STICKY_SECONDS = float(os.environ.get("DB_READ_STICKY_SECONDS", "10"))
+STICKY_SESSION_KEY = "db_primary_until"
+
+
+def _read_url(env: str) -> str:
+    url = os.environ.get(env, "")
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+    return url
+
+
+def _note_write(_conn) -> None:
+    if has_request_context():
+        g.db_wrote = True
+
+
+def enable_read_routing(primary, replica) -> None:
+    """Watch `primary` for commits so later reads can stay on it."""
+    if replica is not primary and not event.contains(primary, "commit", _note_write):
+        event.listen(primary, "commit", _note_write)
+
+
+def reads_pinned_to_primary() -> bool:
+    if not has_request_context():
+        return False
+    if g.get("db_wrote"):
+        return True
+    return time.time() < session.get(STICKY_SESSION_KEY, 0)
+
+
+def route_read(primary, replica):
+    """A connection for read-only queries: the replica unless pinned (see above)."""
+    if replica is primary or reads_pinned_to_primary():
+        return primary.connect()
+    return replica.connect()
+
+
+def init_read_routing(app) -> None:
+    """Start a session's sticky window whenever a request committed a write."""
+
+    @app.after_request
+    def _stick_to_primary(response):
+        if g.get("db_wrote"):
+            session[STICKY_SESSION_KEY] = time.time() + READ_STICKY_SECONDS
+        return response
+
+
+_read_only_url = _read_url("DATABASE_READ_URL")
+if _read_only_url:
+    read_engine = create_engine(_read_only_url, **engine_options(_read_only_url))
+    configure_engine(read_engine)
+else:
+    read_engine = engine
+enable_read_routing(engine, read_engine)
+
+
+def get_read_connection():
+    return route_read(engine, read_engine)
+
+
 def _is_postgres() -> bool:
     return engine.dialect.name in ("postgresql", "postgres")
 
@@ -79,6 +257,32 @@ def init_db() -> None:
     )
     """
 
+    # Per owner expense totals, overall and by category (see core/expenses.py).
+    expense_summaries_sql = f"""
+    CREATE TABLE IF NOT EXISTS expense_summaries (
+        owner_key TEXT PRIMARY KEY,
+        total {num_col} NOT NULL DEFAULT 0,
+        by_category TEXT NOT NULL DEFAULT '{{}}'
+    )
+    """
+
+    # Per owner/day/client totals of freelance_entries (see core/freelance.py).
+    freelance_daily_sql = f"""
+    CREATE TABLE IF NOT EXISTS freelance_daily (
+        owner_key TEXT NOT NULL,
+        work_date DATE NOT NULL,
+        client TEXT NOT NULL,
+        hours {num_col} NOT NULL DEFAULT 0,
+        earned {num_col} NOT NULL DEFAULT 0,
+        entries INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (owner_key, work_date, client)
+    )
+    """
+    freelance_entries_idx = (
+        "CREATE INDEX IF NOT EXISTS idx_freelance_entries_owner_date "
+        "ON freelance_entries (owner_key, work_date)"
+    )
+
     personal_profiles_sql = f"""
     CREATE TABLE IF NOT EXISTS personal_profiles (
         id {id_col},
@@ -131,6 +335,14 @@ def init_db() -> None:
     )
     """
 
+    # Bumped after every write on behalf of an owner_key (see dataversion.py).
+    owner_versions_sql = """
+    CREATE TABLE IF NOT EXISTS owner_versions (
+        owner_key TEXT PRIMARY KEY,
+        data_version INTEGER NOT NULL DEFAULT 0
+    )
+    """
+
     # --- Couples: Making Invisible Work Visible ---
     couples_partnerships_sql = f"""
     CREATE TABLE IF NOT EXISTS couples_partnerships (
@@ -139,7 +351,8 @@ def init_db() -> None:
         partnership_code TEXT UNIQUE,
         currency TEXT NOT NULL DEFAULT '£',
         hourly_rate {num_col} NOT NULL DEFAULT 13.00,
-        created_at TEXT NOT NULL
+        created_at TEXT NOT NULL,
+        data_version INTEGER NOT NULL DEFAULT 0
     )
     """
 
@@ -184,13 +397,16 @@ def init_db() -> None:
 
     with engine.begin() as conn:
         conn.execute(text(expenses_sql))
+        conn.execute(text(expense_summaries_sql))
         conn.execute(text(goals_sql))
         conn.execute(text(freelance_entries_sql))
+        conn.execute(text(freelance_daily_sql))
         conn.execute(text(personal_profiles_sql))
         conn.execute(text(email_signups_sql))
         conn.execute(text(staples_sql))
         conn.execute(text(households_sql))
         conn.execute(text(household_members_sql))
+        conn.execute(text(owner_versions_sql))
         conn.execute(text(couples_partnerships_sql))
         conn.execute(text(couples_partners_sql))
         conn.execute(text(couples_tasks_sql))
@@ -215,6 +431,10 @@ def init_db() -> None:
             if "owner_key" not in col_names:
                 conn.execute(text("ALTER TABLE goals ADD COLUMN owner_key TEXT"))
 
+            cols = conn.execute(text("PRAGMA table_info(couples_partnerships)")).mappings().all()
+            if "data_version" not in {c["name"] for c in cols}:
+                conn.execute(text("ALTER TABLE couples_partnerships ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0"))
+
             # freelance_entries legacy patch
             cols = conn.execute(text("PRAGMA table_info(freelance_entries)")).mappings().all()
             col_names = {c["name"] for c in cols}
@@ -259,3 +479,23 @@ def init_db() -> None:
             """)).mappings().first()
             if not res:
                 conn.execute(text("ALTER TABLE freelance_entries ADD COLUMN owner_key TEXT"))
+
+            res = conn.execute(text("""
+                SELECT column_name
+                FROM information_schema.columns
+                WHERE table_name='couples_partnerships' AND column_name='data_version'
+            """)).mappings().first()
+            if not res:
+                conn.execute(text("ALTER TABLE couples_partnerships ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0"))
+
+        # After the migrations above: older databases only now have both columns.
+        conn.execute(text(freelance_entries_idx))
+        # First run with the rollup/summary tables: fill them from existing rows.
+        rollup_empty = conn.execute(text("SELECT 1 FROM freelance_daily LIMIT 1")).first() is None
+        if rollup_empty and conn.execute(text("SELECT 1 FROM freelance_entries LIMIT 1")).first():
+            from core.freelance import rebuild_rollup
+            rebuild_rollup(conn)
+        summaries_empty = conn.execute(text("SELECT 1 FROM expense_summaries LIMIT 1")).first() is None
+        if summaries_empty and conn.execute(text("SELECT 1 FROM expenses WHERE owner_key IS NOT NULL LIMIT 1")).first():
+            from core.expenses import rebuild_summaries
+            rebuild_summaries(conn)
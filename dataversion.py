@@ -0,0 +1,121 @@
+"""Per-tenant data versions, and the conditional GETs they make cheap.
+
+Every tenant - a Dinaro family, a Couples partnership, a personal owner_key -
+has a counter that goes up whenever a request commits a write on its behalf:
+`bump_after_writes(bp, bump)` registers the hook on a blueprint, so no write
+path has to remember to do it. Dashboard and history views decorated with
+`@versioned(current)` read only that counter first and derive a weak ETag
+
+    W/"<version>-<session>-<date>-<build>"
+
+where <session> fingerprints the visitor's session (who they are, plus the
+cookie prefs pages render from), <date> covers "today"-relative content and
+<build> changes with each deploy. A reload whose If-None-Match still matches
+gets an empty 304 before any of the view's queries run. Responses are
+`private, no-cache`, so browsers (and the PWA's network fetches, which go
+through the HTTP cache) revalidate every time instead of showing stale data.
+
+Configuration (env):
+  BUILD_ID   identifies the deploy in ETags (default: FLY_IMAGE_REF on Fly,
+             else a fingerprint of the source tree taken at startup)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from datetime import date
+from functools import wraps
+from typing import Callable, Iterator
+
+from flask import Blueprint, current_app, make_response, request, session
+
+from database import STICKY_SESSION_KEY, committed_in_request
+
+# Written by hooks on (almost) every request without changing what a page shows.
+VOLATILE_SESSION_KEYS = {STICKY_SESSION_KEY, "_permanent"}
+SOURCE_EXTENSIONS = (".py", ".html", ".js", ".css", ".svg", ".json")
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+_build_id: str | None = None
+
+
+def source_files(root: str = ROOT) -> Iterator[tuple[str, os.stat_result]]:
+    """(relative path, stat) of every file the app serves or renders from, in a
+    stable order. Built output (dist/) is left out: it derives from these."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith((".", "__")) and d != "dist")
+        for name in sorted(filenames):
+            if name.endswith(SOURCE_EXTENSIONS):
+                path = os.path.join(dirpath, name)
+                yield os.path.relpath(path, root), os.stat(path)
+
+
+def _source_fingerprint(root: str) -> str:
+    digest = hashlib.sha1()
+    for rel, st in source_files(root):
+        digest.update(f"{rel}:{st.st_mtime_ns}:{st.st_size}\n".encode())
+    return digest.hexdigest()[:10]
+
+
+def build_id() -> str:
+    """This deploy's identity, worked out once per process."""
+    global _build_id
+    if _build_id is None:
+        ref = os.environ.get("BUILD_ID") or os.environ.get("FLY_IMAGE_REF")
+        _build_id = hashlib.sha1(ref.encode()).hexdigest()[:10] if ref else _source_fingerprint(ROOT)
+    return _build_id
+
+
+def session_fingerprint() -> str:
+    state = {k: v for k, v in session.items() if k not in VOLATILE_SESSION_KEYS}
+    blob = json.dumps(state, sort_keys=True, default=str).encode()
+    return hashlib.sha1(blob).hexdigest()[:12]
+
+
+def bump_after_writes(bp: Blueprint, bump: Callable[[], None]) -> None:
+    """Call `bump` after every request to `bp` that committed a write.
+
+    GETs that write (e.g. Dinaro's daily interest) count too. Session-only
+    changes need no bump: they already change the session fingerprint.
+    """
+
+    @bp.after_request
+    def _bump_data_version(response):
+        if committed_in_request() and response.status_code < 400:
+            bump()
+        return response
+
+
+def versioned(current: Callable[[], str | None]):
+    """Decorator: answer unchanged reloads of a per-tenant GET with 304.
+
+    `current()` returns the tenant's version as a string (None when there is
+    no tenant, e.g. logged out: the view then runs as usual). Keep it to one
+    cheap query - it runs on every request, including the ones it saves.
+    """
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if request.method not in ("GET", "HEAD") or current_app.debug:
+                return fn(*args, **kwargs)
+            version = current()
+            if version is None:
+                return fn(*args, **kwargs)
+            etag = f"{version}-{session_fingerprint()}-{date.today().isoformat()}-{build_id()}"
+            if request.if_none_match.contains_weak(etag):
+                resp = current_app.response_class(status=304)
+            else:
+                resp = make_response(fn(*args, **kwargs))
+                # A view that wrote (and so bumped afterwards) has no tag to
+                # give yet: the next load fetches the new version in full.
+                if resp.status_code != 200 or committed_in_request():
+                    return resp
+            resp.set_etag(etag, weak=True)
+            resp.cache_control.private = True
+            resp.cache_control.no_cache = True
+            return resp
+
+        return wrapper
+
+    return decorate
@@ -6,15 +6,23 @@ standalone app.
 
 By default it shares the main application database (so existing data and local
 dev keep working with no migration). Set DINARO_DATABASE_URL to point Dinaro at
-its own database when running it independently.
+its own database when running it independently, and DINARO_DATABASE_READ_URL
+to serve its dashboard reads from a replica of that database.
 """
 import os
+import secrets
+import time
+import zlib
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 from sqlalchemy import create_engine, text
 
+from database import configure_engine, enable_read_routing, engine_options, route_read
 
-def _dinaro_database_url() -> str:
-    url = os.environ.get("DINARO_DATABASE_URL")
+
+def _dinaro_database_url(env: str = "DINARO_DATABASE_URL") -> str:
+    url = os.environ.get(env)
     if not url:
         return ""  # empty => share the main app engine
     # Fly sometimes provides postgres:// which SQLAlchemy doesn't like
@@ -25,17 +33,185 @@ def _dinaro_database_url() -> str:
 
 _own_url = _dinaro_database_url()
 if _own_url:
-    # Standalone: Dinaro runs against its own database.
-    engine = create_engine(_own_url, pool_pre_ping=True, future=True)
+    # Standalone: Dinaro runs against its own database, with the same pool,
+    # SQLite and Postgres tuning as the main engine (see database.engine_options).
+    engine = create_engine(_own_url, **engine_options(_own_url))
+    configure_engine(engine)
+    # Optional replica of Dinaro's own database (see database.route_read).
+    _read_url = _dinaro_database_url("DINARO_DATABASE_READ_URL")
+    if _read_url:
+        read_engine = create_engine(_read_url, **engine_options(_read_url))
+        configure_engine(read_engine)
+    else:
+        read_engine = engine
+    enable_read_routing(engine, read_engine)
 else:
-    # Default: share the main application database (no data migration needed).
-    from database import engine  # noqa: F401
+    # Default: share the main application database (no data migration needed),
+    # and its replica when DATABASE_READ_URL is set.
+    from database import engine, read_engine  # noqa: F401
 
 
 def get_db_connection():
     return engine.connect()
 
 
+def get_read_connection():
+    """Connection for read-only queries in GET handlers: the replica, unless
+    this session wrote recently (read-your-writes)."""
+    return route_read(engine, read_engine)
+
+
+# ----------------------------
+# Shards
+# ----------------------------
+# DINARO_SHARDS="eu2=postgresql://...,us1=postgresql://..." spreads families
+# over more databases. The engine above stays the "default" shard: it keeps
+# every family created before sharding and holds the shard map
+# (dinaro_shard_map: family_code -> shard). New families are placed by a hash
+# of their code over DINARO_NEW_FAMILY_SHARDS (default: every shard).
+#
+# When sharded, `engine` resolves to the current shard's engine on each use:
+# dinaro.routes sets the shard per request from the session's family, and
+# scripts wrap work in use_shard(name). Row ids are per database, so an id only
+# means something together with its shard. DINARO_DATABASE_READ_URL is ignored
+# when sharded. Families that share a teacher (link_code) must share a shard:
+# setup keeps added classes on the teacher's shard, and dinaro.rebalance moves
+# linked classes together. While a family is being moved its map row is marked
+# `moving`, and dinaro.routes turns its writes away until the move lands.
+DEFAULT_SHARD = "default"
+# How long a process trusts its cached family -> shard lookups.
+SHARD_CACHE_SECONDS = 30
+
+_current_shard: ContextVar[str] = ContextVar("dinaro_shard", default=DEFAULT_SHARD)
+_shard_engines = {DEFAULT_SHARD: engine}
+for _spec in filter(None, (s.strip() for s in os.environ.get("DINARO_SHARDS", "").split(","))):
+    _name, _, _url = _spec.partition("=")
+    _url = _url.strip().replace("postgres://", "postgresql://", 1)
+    if not _name.strip() or not _url:
+        raise ValueError(f"DINARO_SHARDS entry {_spec!r} is not name=url")
+    _shard_engines[_name.strip()] = create_engine(_url, **engine_options(_url))
+    configure_engine(_shard_engines[_name.strip()])
+SHARDED = len(_shard_engines) > 1
+_new_family_shards = [
+    n.strip() for n in os.environ.get("DINARO_NEW_FAMILY_SHARDS", "").split(",") if n.strip()
+] or sorted(_shard_engines)
+_shard_cache: dict[str, tuple[str, float]] = {}
+
+
+class _ShardRouter:
+    """Stands in for an Engine: every attribute is looked up on the current shard's."""
+
+    def __getattr__(self, name):
+        return getattr(_shard_engines[_current_shard.get()], name)
+
+    def __repr__(self):
+        return f"<dinaro shard router ({_current_shard.get()})>"
+
+
+if SHARDED:
+    engine = _ShardRouter()
+    read_engine = engine
+
+
+def shard_names() -> list[str]:
+    return sorted(_shard_engines)
+
+
+def shard_engine(name: str):
+    return _shard_engines[name]
+
+
+def current_shard() -> str:
+    return _current_shard.get()
+
+
+def enter_shard(name: str):
+    """Make `name` the current shard; returns a token for leave_shard()."""
+    if name not in _shard_engines:
+        raise KeyError(f"unknown Dinaro shard {name!r}")
+    return _current_shard.set(name)
+
+
+def leave_shard(token) -> None:
+    _current_shard.reset(token)
+
+
+@contextmanager
+def use_shard(name: str):
+    token = enter_shard(name)
+    try:
+        yield _shard_engines[name]
+    finally:
+        leave_shard(token)
+
+
+class FamilyMoving(Exception):
+    """The family is being moved to another shard; its writes must wait."""
+
+
+def family_shard(family_code: str, *, for_write: bool = False) -> str:
+    """The shard holding `family_code` (families missing from the map are on the default).
+
+    `for_write` skips the cache, so a write always lands on the family's
+    current shard, and raises FamilyMoving while a move is in progress.
+    """
+    if not SHARDED or not family_code:
+        return DEFAULT_SHARD
+    hit = _shard_cache.get(family_code)
+    if not for_write and hit and hit[1] > time.monotonic():
+        return hit[0]
+    with _shard_engines[DEFAULT_SHARD].connect() as conn:
+        row = conn.execute(
+            text("SELECT shard, moving FROM dinaro_shard_map WHERE family_code = :c"), {"c": family_code}
+        ).first()
+    if for_write and row is not None and row.moving:
+        raise FamilyMoving(family_code)
+    shard = row.shard if row is not None and row.shard in _shard_engines else DEFAULT_SHARD
+    _shard_cache[family_code] = (shard, time.monotonic() + SHARD_CACHE_SECONDS)
+    return shard
+
+
+def set_family_shard(family_code: str, shard: str, *, moving: bool = False) -> None:
+    """Overwrite a family's shard map entry. Only for moves (dinaro.rebalance):
+    new families go through place_family, which never overwrites."""
+    if shard not in _shard_engines:
+        raise KeyError(f"unknown Dinaro shard {shard!r}")
+    with _shard_engines[DEFAULT_SHARD].begin() as conn:
+        conn.execute(text("DELETE FROM dinaro_shard_map WHERE family_code = :c"), {"c": family_code})
+        conn.execute(
+            text("INSERT INTO dinaro_shard_map (family_code, shard, moving) VALUES (:c, :s, :m)"),
+            {"c": family_code, "s": shard, "m": int(moving)},
+        )
+    _shard_cache[family_code] = (shard, time.monotonic() + SHARD_CACHE_SECONDS)
+
+
+def place_family(family_code: str, shard: str | None = None) -> str | None:
+    """Pick and record the shard for a new family; `shard` pins it, e.g. to
+    keep a teacher's added class next to their other classes.
+
+    Returns None when `family_code` is already in the map, so the caller can
+    generate another code (an existing family is never re-pointed here).
+    """
+    if not SHARDED:
+        return DEFAULT_SHARD
+    if shard is None:
+        shard = _new_family_shards[zlib.crc32(family_code.encode()) % len(_new_family_shards)]
+    if shard not in _shard_engines:
+        raise KeyError(f"unknown Dinaro shard {shard!r}")
+    with _shard_engines[DEFAULT_SHARD].begin() as conn:
+        placed = conn.execute(
+            text(
+                "INSERT INTO dinaro_shard_map (family_code, shard) VALUES (:c, :s) "
+                "ON CONFLICT (family_code) DO NOTHING"
+            ),
+            {"c": family_code, "s": shard},
+        ).rowcount
+    if not placed:
+        return None
+    _shard_cache[family_code] = (shard, time.monotonic() + SHARD_CACHE_SECONDS)
+    return shard
+
+
 def _is_postgres() -> bool:
     return engine.dialect.name in ("postgresql", "postgres")
 
@@ -45,6 +221,27 @@ def _id_column_sql() -> str:
 
 
 def init_dinaro_db() -> None:
+    """Create/migrate the Dinaro tables on every shard, and the shard map."""
+    for name in shard_names():
+        with use_shard(name):
+            _init_dinaro_tables()
+    if SHARDED:
+        with _shard_engines[DEFAULT_SHARD].begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS dinaro_shard_map "
+                "(family_code TEXT PRIMARY KEY, shard TEXT NOT NULL, moving INTEGER NOT NULL DEFAULT 0)"
+            ))
+            if conn.dialect.name == "sqlite":
+                cols = {c["name"] for c in conn.execute(text("PRAGMA table_info(dinaro_shard_map)")).mappings()}
+                if "moving" not in cols:
+                    conn.execute(text("ALTER TABLE dinaro_shard_map ADD COLUMN moving INTEGER NOT NULL DEFAULT 0"))
+            else:
+                conn.execute(text(
+                    "ALTER TABLE dinaro_shard_map ADD COLUMN IF NOT EXISTS moving INTEGER NOT NULL DEFAULT 0"
+                ))
+
+
+def _init_dinaro_tables() -> None:
     """Create the Dinaro tables (and run column migrations) for SQLite/Postgres."""
     id_col = _id_column_sql()
     num_col = "DOUBLE PRECISION" if _is_postgres() else "REAL"
@@ -61,7 +258,8 @@ def init_dinaro_db() -> None:
         interest_threshold {num_col} NOT NULL DEFAULT 100,
         tax_rate {num_col} NOT NULL DEFAULT 0,
         show_leaderboard INTEGER NOT NULL DEFAULT 0,
-        grade_mode TEXT NOT NULL DEFAULT 'score'
+        grade_mode TEXT NOT NULL DEFAULT 'score',
+        data_version INTEGER NOT NULL DEFAULT 0
     )
     """
 
@@ -234,7 +432,8 @@ def init_dinaro_db() -> None:
     CREATE TABLE IF NOT EXISTS dinaro_fund_options (
         id {id_col},
         fund_id INTEGER NOT NULL,
-        label TEXT NOT NULL
+        label TEXT NOT NULL,
+        votes INTEGER NOT NULL DEFAULT 0
     )
     """
 
@@ -247,6 +446,50 @@ def init_dinaro_db() -> None:
     )
     """
 
+    # One vote per student per fund (changing your vote is an upsert), plus the
+    # lookups the vote/option-delete paths make. The running tally lives on
+    # dinaro_fund_options.votes so dashboards never COUNT(*) the votes table.
+    dinaro_fund_votes_dedupe_sql = """
+    DELETE FROM dinaro_fund_votes
+    WHERE id NOT IN (SELECT MAX(id) FROM dinaro_fund_votes GROUP BY fund_id, child_id)
+    """
+
+    dinaro_fund_votes_idx = """
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_fund_votes_fund_child
+    ON dinaro_fund_votes (fund_id, child_id)
+    """
+
+    dinaro_fund_votes_option_idx = """
+    CREATE INDEX IF NOT EXISTS idx_fund_votes_option
+    ON dinaro_fund_votes (option_id)
+    """
+
+    dinaro_fund_options_idx = """
+    CREATE INDEX IF NOT EXISTS idx_fund_options_fund
+    ON dinaro_fund_options (fund_id)
+    """
+
+    # Live dashboard events (dinaro.events): short-lived, pruned as new ones arrive.
+    dinaro_events_sql = f"""
+    CREATE TABLE IF NOT EXISTS dinaro_events (
+        id {id_col},
+        family_id INTEGER NOT NULL,
+        kind TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    )
+    """
+
+    dinaro_events_idx = """
+    CREATE INDEX IF NOT EXISTS idx_dinaro_events_family
+    ON dinaro_events (family_id, id)
+    """
+
+    dinaro_fund_options_backfill_sql = """
+    UPDATE dinaro_fund_options
+    SET votes = (SELECT COUNT(*) FROM dinaro_fund_votes v WHERE v.option_id = dinaro_fund_options.id)
+    """
+
     with engine.begin() as conn:
         conn.execute(text(dinaro_families_sql))
         conn.execute(text(dinaro_parents_sql))
@@ -264,6 +507,14 @@ def init_dinaro_db() -> None:
         conn.execute(text(dinaro_fund_bills_sql))
         conn.execute(text(dinaro_fund_options_sql))
         conn.execute(text(dinaro_fund_votes_sql))
+        # Older databases may hold duplicate votes from the old DELETE+INSERT
+        # path; drop them (no-op once the unique index exists) before indexing.
+        conn.execute(text(dinaro_fund_votes_dedupe_sql))
+        conn.execute(text(dinaro_fund_votes_idx))
+        conn.execute(text(dinaro_fund_votes_option_idx))
+        conn.execute(text(dinaro_fund_options_idx))
+        conn.execute(text(dinaro_events_sql))
+        conn.execute(text(dinaro_events_idx))
 
         # --- Column migrations for older databases ---
         if engine.dialect.name == "sqlite":
@@ -314,11 +565,19 @@ def init_dinaro_db() -> None:
                 conn.execute(text("ALTER TABLE dinaro_families ADD COLUMN show_leaderboard INTEGER NOT NULL DEFAULT 0"))
             if "grade_mode" not in col_names:
                 conn.execute(text("ALTER TABLE dinaro_families ADD COLUMN grade_mode TEXT NOT NULL DEFAULT 'score'"))
+            if "data_version" not in col_names:
+                conn.execute(text("ALTER TABLE dinaro_families ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0"))
 
             cols = conn.execute(text("PRAGMA table_info(dinaro_children)")).mappings().all()
             col_names = {c["name"] for c in cols}
             if "standing" not in col_names:
                 conn.execute(text("ALTER TABLE dinaro_children ADD COLUMN standing REAL NOT NULL DEFAULT 0"))
+
+            cols = conn.execute(text("PRAGMA table_info(dinaro_fund_options)")).mappings().all()
+            col_names = {c["name"] for c in cols}
+            if "votes" not in col_names:
+                conn.execute(text("ALTER TABLE dinaro_fund_options ADD COLUMN votes INTEGER NOT NULL DEFAULT 0"))
+                conn.execute(text(dinaro_fund_options_backfill_sql))
         else:
             res = conn.execute(text("""
                 SELECT column_name FROM information_schema.columns
@@ -389,9 +648,58 @@ def init_dinaro_db() -> None:
             if not res:
                 conn.execute(text("ALTER TABLE dinaro_families ADD COLUMN grade_mode TEXT NOT NULL DEFAULT 'score'"))
 
+            res = conn.execute(text("""
+                SELECT column_name FROM information_schema.columns
+                WHERE table_name='dinaro_families' AND column_name='data_version'
+            """)).mappings().first()
+            if not res:
+                conn.execute(text("ALTER TABLE dinaro_families ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0"))
+
             res = conn.execute(text("""
                 SELECT column_name FROM information_schema.columns
                 WHERE table_name='dinaro_children' AND column_name='standing'
             """)).mappings().first()
             if not res:
                 conn.execute(text("ALTER TABLE dinaro_children ADD COLUMN standing DOUBLE PRECISION NOT NULL DEFAULT 0"))
+
+            res = conn.execute(text("""
+                SELECT column_name FROM information_schema.columns
+                WHERE table_name='dinaro_fund_options' AND column_name='votes'
+            """)).mappings().first()
+            if not res:
+                conn.execute(text("ALTER TABLE dinaro_fund_options ADD COLUMN votes INTEGER NOT NULL DEFAULT 0"))
+                conn.execute(text(dinaro_fund_options_backfill_sql))
+
+
+def _dinaro_make_family_code() -> str:
+    """Generate a unique 6-char code for families."""
+    chars = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"  # No I, O, 0, 1
+    code = "".join(secrets.choice(chars) for _ in range(6))
+    return code
+
+
+def _dinaro_ensure_family_codes():
+    """Fill in missing family codes (one-off backfill run after init_dinaro_db)."""
+    for name in shard_names():
+        with use_shard(name):
+            _dinaro_ensure_shard_family_codes()
+
+
+def _dinaro_ensure_shard_family_codes():
+    conn = get_db_connection()
+    try:
+        rows = conn.execute(
+            text("SELECT id FROM dinaro_families WHERE family_code IS NULL")
+        ).mappings().all()
+        if not rows:
+            return
+
+        with engine.begin() as conn2:
+            for r in rows:
+                code = _dinaro_make_family_code()
+                conn2.execute(
+                    text("UPDATE dinaro_families SET family_code = :code WHERE id = :id"),
+                    {"code": code, "id": r["id"]}
+                )
+    finally:
+        conn.close()
@@ -0,0 +1,266 @@
+"""Live per-family events for the parent dashboard, streamed as SSE.
+
+publish() appends a row to dinaro_events (on the family's shard) once the
+change it describes has committed. Open streams never query on their own: one
+poller thread per process reads the new rows of every family that has a stream
+open, every POLL_SECONDS or straight after a publish from this process, and
+wakes only those families' streams. Events published by other processes
+arrive within POLL_SECONDS. A stream that reconnects with Last-Event-ID first
+catches up from the table, so a dropped connection loses nothing younger than
+KEEP_SECONDS.
+
+Event ids are handed out at INSERT but become visible at COMMIT, so on
+Postgres a lower id can show up after a higher one has been read. The poller
+therefore re-reads the last LAG_SECONDS of events on every pass and skips the
+ids it has already delivered: an event that commits late is still delivered,
+just after its neighbours.
+
+Idle streams are only cheap on a cooperative worker (GUNICORN_WORKER_CLASS=
+gevent, see gunicorn.conf.py). On thread workers an open stream would pin a
+thread, so the endpoint answers with what is new and asks the browser to come
+back in POLL_RETRY_MS: polling through the same EventSource.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from sqlalchemy import bindparam, text
+
+from dinaro.db import current_shard, engine, shard_engine
+from dinaro.kernel import utc_now_iso
+
+logger = logging.getLogger(__name__)
+
+POLL_SECONDS = float(os.environ.get("DINARO_EVENTS_POLL_SECONDS", "2"))
+KEEP_SECONDS = 3600
+# Old rows are pruned by every PRUNE_EVERY-th publish rather than on a timer.
+PRUNE_EVERY = 200
+HEARTBEAT_SECONDS = 15
+# A stream ends after this long and the browser reconnects (after RETRY_MS),
+# so a logged-out session stops receiving within a few minutes and workers can
+# still be recycled.
+STREAM_SECONDS = 300
+RETRY_MS = 3000
+POLL_RETRY_MS = 10000
+# Recent events kept in memory per watched family, for streams that fall behind.
+RECENT_EVENTS = 100
+# How far back (by created_at) each poll looks for events that committed late.
+LAG_SECONDS = 10
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    kind: str
+    data: dict
+
+    def sse(self) -> str:
+        return f"id: {self.id}\nevent: {self.kind}\ndata: {json.dumps(self.data)}\n\n"
+
+
+def publish(family_id: int, kind: str, **data) -> int:
+    """Record an event for `family_id`'s dashboards. Call it after the change has committed."""
+    with engine.begin() as conn:
+        event_id = conn.execute(
+            text(
+                "INSERT INTO dinaro_events (family_id, kind, payload, created_at) "
+                "VALUES (:fid, :kind, :payload, :now) RETURNING id"
+            ),
+            {"fid": family_id, "kind": kind, "payload": json.dumps(data), "now": utc_now_iso()},
+        ).scalar()
+        if event_id % PRUNE_EVERY == 0:
+            cutoff = (datetime.utcnow() - timedelta(seconds=KEEP_SECONDS)).isoformat(timespec="seconds")
+            conn.execute(text("DELETE FROM dinaro_events WHERE created_at < :cutoff"), {"cutoff": cutoff})
+    _hub.poke()
+    return event_id
+
+
+def latest_id(conn, family_id: int) -> int:
+    """The id a freshly rendered dashboard is up to date with (its stream starts after it)."""
+    return conn.execute(
+        text("SELECT COALESCE(MAX(id), 0) FROM dinaro_events WHERE family_id = :fid"),
+        {"fid": family_id},
+    ).scalar()
+
+
+_NEW_EVENTS = text(
+    "SELECT id, family_id, kind, payload FROM dinaro_events "
+    "WHERE id > :after AND family_id IN :fids ORDER BY id LIMIT :limit"
+).bindparams(bindparam("fids", expanding=True))
+_NEW_OR_RECENT_EVENTS = text(
+    "SELECT id, family_id, kind, payload FROM dinaro_events "
+    "WHERE id > :floor AND (id > :after OR created_at >= :since) AND family_id IN :fids "
+    "ORDER BY id LIMIT :limit"
+).bindparams(bindparam("fids", expanding=True))
+
+
+def _fetch(shard: str, family_ids: list[int], after: int, limit: int = 500,
+           since: str | None = None) -> list[tuple[int, Event]]:
+    """The families' events after id `after` (and, with `since`, any created since then)."""
+    query = _NEW_EVENTS if since is None else _NEW_OR_RECENT_EVENTS
+    params = {"fids": family_ids, "after": after, "since": since, "floor": 0, "limit": limit}
+    rows: list[tuple[int, Event]] = []
+    with shard_engine(shard).connect() as conn:
+        while True:
+            page = conn.execute(query, params).all()
+            rows += [(r.family_id, Event(r.id, r.kind, json.loads(r.payload))) for r in page]
+            if len(page) < limit:
+                return rows
+            params["after"] = params["floor"] = page[-1].id
+
+
+def _max_id(shard: str) -> int:
+    with shard_engine(shard).connect() as conn:
+        return conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM dinaro_events")).scalar()
+
+
+class _Hub:
+    """This process's open streams, and the one poller thread that feeds them."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._poke = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Per (shard, family_id): open streams, a condition they wait on, recent
+        # events (in delivery order) and how many have been delivered so far.
+        self._watchers: dict[tuple[str, int], int] = {}
+        self._waiting: dict[tuple[str, int], threading.Condition] = {}
+        self._recent: dict[tuple[str, int], deque[Event]] = {}
+        self._delivered: dict[tuple[str, int], int] = {}
+        # Per shard: the highest event id the poller has read.
+        self._cursor: dict[str, int] = {}
+
+    def poke(self) -> None:
+        self._poke.set()
+
+    def listen(self, shard: str, family_id: int, after: int, seconds: float) -> Iterator[list[Event]]:
+        """Yield batches of the family's events newer than `after` for `seconds`.
+
+        The first batch is the catch-up from the table; after that an empty
+        batch means HEARTBEAT_SECONDS passed without one.
+        """
+        if seconds <= 0:
+            backlog = [e for _fid, e in _fetch(shard, [family_id], after)]
+            if backlog:
+                yield backlog
+            return
+
+        key = (shard, family_id)
+        top = _max_id(shard)
+        with self._lock:
+            # The poller delivers what comes after the cursor; the catch-up
+            # below covers everything up to now, so nothing falls in between.
+            self._cursor.setdefault(shard, top)
+            if key not in self._watchers:
+                self._watchers[key] = 0
+                self._waiting[key] = threading.Condition(self._lock)
+                self._recent[key] = deque(maxlen=RECENT_EVENTS)
+                self._delivered[key] = 0
+            self._watchers[key] += 1
+            cond, recent = self._waiting[key], self._recent[key]
+            seen = self._delivered[key]
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="dinaro-events", daemon=True)
+                self._thread.start()
+        # Ids already sent on this stream: the poller's lag window and the
+        # catch-up overlap, and a late commit can arrive below the newest id.
+        sent: set[int] = set()
+        try:
+            backlog = [e for _fid, e in _fetch(shard, [family_id], after)]
+            if backlog:
+                sent.update(e.id for e in backlog)
+                yield backlog
+            deadline = time.monotonic() + seconds
+            while (left := deadline - time.monotonic()) > 0:
+                with self._lock:
+                    cond.wait_for(lambda: self._delivered[key] > seen, min(HEARTBEAT_SECONDS, left))
+                    fresh = min(self._delivered[key] - seen, len(recent))
+                    seen = self._delivered[key]
+                    new = list(recent)[len(recent) - fresh:] if fresh else []
+                # Ids up to `after` are what the page (or a previous stream) showed.
+                batch = [e for e in new if e.id > after and e.id not in sent]
+                sent.update(e.id for e in batch)
+                yield batch
+        finally:
+            with self._lock:
+                self._watchers[key] -= 1
+                if not self._watchers[key]:
+                    del self._watchers[key], self._waiting[key], self._recent[key], self._delivered[key]
+                    if not any(s == shard for s, _fid in self._watchers):
+                        self._cursor.pop(shard, None)
+
+    def _run(self) -> None:
+        while True:
+            self._poke.wait(POLL_SECONDS)
+            self._poke.clear()
+            with self._lock:
+                if not self._watchers:
+                    self._thread = None
+                    return
+                families: dict[str, list[int]] = {}
+                for shard, fid in self._watchers:
+                    families.setdefault(shard, []).append(fid)
+                cursors = dict(self._cursor)
+            since = (datetime.utcnow() - timedelta(seconds=LAG_SECONDS)).isoformat(timespec="seconds")
+            for shard, fids in families.items():
+                try:
+                    rows = _fetch(shard, fids, cursors[shard], since=since)
+                except Exception:
+                    logger.exception("dinaro events: polling shard %s failed", shard)
+                    continue
+                if rows:
+                    self._deliver(shard, rows)
+
+    def _deliver(self, shard: str, rows: list[tuple[int, Event]]) -> None:
+        with self._lock:
+            if shard in self._cursor:
+                self._cursor[shard] = max(self._cursor[shard], rows[-1][1].id)
+            woken = set()
+            known: dict[tuple[str, int], set[int]] = {}
+            for fid, ev in rows:
+                key = (shard, fid)
+                if key not in self._recent:
+                    continue
+                if key not in known:
+                    known[key] = {e.id for e in self._recent[key]}
+                if ev.id in known[key]:  # re-read by the lag window
+                    continue
+                known[key].add(ev.id)
+                self._recent[key].append(ev)
+                self._delivered[key] += 1
+                woken.add(key)
+            for key in woken:
+                self._waiting[key].notify_all()
+
+
+_hub = _Hub()
+
+
+def _stream_seconds() -> float:
+    override = os.environ.get("DINARO_EVENTS_STREAM_SECONDS")
+    if override:
+        return float(override)
+    monkey = sys.modules.get("gevent.monkey")
+    return STREAM_SECONDS if monkey and monkey.is_module_patched("socket") else 0
+
+
+def sse_body(family_id: int, after: int) -> Iterator[str]:
+    """The text/event-stream body for one parent dashboard."""
+    # Resolved now: the body is generated after the request's shard is reset.
+    shard, seconds = current_shard(), _stream_seconds()
+
+    def body():
+        yield f"retry: {RETRY_MS if seconds > 0 else POLL_RETRY_MS}\n\n"
+        for batch in _hub.listen(shard, family_id, after, seconds):
+            yield "".join(e.sse() for e in batch) if batch else ": keep-alive\n\n"
+
+    return body()
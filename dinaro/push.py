@@ -6,7 +6,6 @@ import logging
 import os
 from datetime import datetime, timezone
 
-from pywebpush import webpush, WebPushException
 from sqlalchemy import text
 
 from dinaro.db import engine, get_db_connection as get_connection
@@ -50,6 +49,9 @@ def _remove_subscription(sub_id: int) -> None:
 def _send_push(sub_row: dict, payload: dict) -> bool:
     if not VAPID_PRIVATE_KEY:
         return False
+    # Imported on first send: pywebpush pulls in aiohttp + its crypto stack
+    # (~175 ms), which every worker would otherwise pay at boot.
+    from pywebpush import webpush, WebPushException
 
     subscription_info = {
         "endpoint": sub_row["endpoint"],
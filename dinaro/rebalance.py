@@ -0,0 +1,173 @@
+"""Move a Dinaro family (and the classes linked to it) to another shard.
+
+Row ids are per database, so the family's rows are re-inserted on the target
+with fresh ids and every reference between them is rewritten. The order of a
+move is: mark the families `moving` in the shard map (dinaro.routes answers
+their writes with a 503 from then on) -> wait for writes already under way to
+finish -> copy (one transaction on the target) -> flip the shard map and clear
+the mark -> wait for other processes' cached lookups to expire -> delete from
+the source. Writes look the shard up uncached, so none reach the source after
+the flip; reads may, until their cache expires. Sessions of the moved family
+are logged out on their next request (their ids no longer exist).
+CLI: scripts/dinaro_move_family.py.
+"""
+from __future__ import annotations
+
+import time
+
+from sqlalchemy import bindparam, text
+
+from dinaro.db import (
+    SHARD_CACHE_SECONDS,
+    family_shard,
+    set_family_shard,
+    shard_engine,
+    shard_names,
+)
+
+# How long a move waits, after marking the families, for in-flight writes.
+DRAIN_SECONDS = 5
+
+# (table, column that scopes it to the family, the table that column points at,
+#  other id columns to rewrite -> the table they point at). Parents first.
+PLAN = [
+    ("dinaro_families", "id", "dinaro_families", {}),
+    ("dinaro_parents", "family_id", "dinaro_families", {}),
+    ("dinaro_children", "family_id", "dinaro_families", {}),
+    ("dinaro_chores", "family_id", "dinaro_families", {}),
+    ("dinaro_spendables", "family_id", "dinaro_families", {}),
+    ("dinaro_group_rewards", "family_id", "dinaro_families", {"condition_chore_id": "dinaro_chores"}),
+    ("dinaro_class_funds", "family_id", "dinaro_families", {}),
+    # user_id points at parents or children depending on user_type (see _rewrite).
+    ("push_subscriptions", "family_id", "dinaro_families", {}),
+    ("dinaro_chore_logs", "child_id", "dinaro_children", {"chore_id": "dinaro_chores"}),
+    ("dinaro_requests", "child_id", "dinaro_children", {}),
+    ("dinaro_goals", "child_id", "dinaro_children", {}),
+    ("dinaro_ledger", "child_id", "dinaro_children",
+     {"request_id": "dinaro_requests", "log_id": "dinaro_chore_logs"}),
+    ("dinaro_fund_bills", "fund_id", "dinaro_class_funds", {"child_id": "dinaro_children"}),
+    ("dinaro_fund_options", "fund_id", "dinaro_class_funds", {}),
+    ("dinaro_fund_votes", "fund_id", "dinaro_class_funds",
+     {"child_id": "dinaro_children", "option_id": "dinaro_fund_options"}),
+]
+
+
+def _in(sql: str):
+    return text(sql).bindparams(bindparam("ids", expanding=True))
+
+
+def linked_family_ids(conn, family_code: str) -> list[int]:
+    """The family plus every class that shares one of its teachers (link_code)."""
+    fid = conn.execute(
+        text("SELECT id FROM dinaro_families WHERE family_code = :c"), {"c": family_code}
+    ).scalar()
+    if fid is None:
+        return []
+    return sorted({fid} | {
+        row[0] for row in conn.execute(text(
+            "SELECT DISTINCT p2.family_id FROM dinaro_parents p1 "
+            "JOIN dinaro_parents p2 ON p2.link_code = p1.link_code "
+            "WHERE p1.family_id = :fid AND p1.link_code IS NOT NULL"
+        ), {"fid": fid})
+    })
+
+
+def _read(conn, family_ids: list[int]) -> dict[str, list[dict]]:
+    rows: dict[str, list[dict]] = {}
+    for table, scope_col, scope_table, _refs in PLAN:
+        ids = family_ids if table == "dinaro_families" else [r["id"] for r in rows[scope_table]]
+        rows[table] = [
+            dict(r) for r in conn.execute(
+                _in(f"SELECT * FROM {table} WHERE {scope_col} IN :ids ORDER BY id"), {"ids": ids}
+            ).mappings()
+        ] if ids else []
+    return rows
+
+
+def _rewrite(table: str, row: dict, scope_col: str, scope_table: str, refs: dict, new_ids: dict) -> dict:
+    values = dict(row)
+    values.pop("id")
+    if table != "dinaro_families":
+        values[scope_col] = new_ids[scope_table][values[scope_col]]
+    if table == "push_subscriptions":
+        refs = {"user_id": "dinaro_parents" if values["user_type"] == "parent" else "dinaro_children"}
+    for col, ref in refs.items():
+        if values.get(col) is not None:
+            # A dangling reference (e.g. a deleted chore) stays dangling.
+            values[col] = new_ids[ref].get(values[col])
+    return values
+
+
+def move_family(family_code: str, target: str, *, settle_seconds: float = SHARD_CACHE_SECONDS,
+                drain_seconds: float = DRAIN_SECONDS, dry_run: bool = False) -> dict[str, int]:
+    """Move `family_code` (with its linked classes) to shard `target`.
+
+    Returns rows copied per table. Raises ValueError when there is nothing to
+    do and RuntimeError when the target already holds one of the families.
+    """
+    source = family_shard(family_code)
+    if source == target:
+        raise ValueError(f"{family_code} is already on shard {target!r}")
+    src, dst = shard_engine(source), shard_engine(target)
+
+    with src.connect() as conn:
+        family_ids = linked_family_ids(conn, family_code)
+        if not family_ids:
+            raise ValueError(f"family {family_code} not found on shard {source!r}")
+        codes = conn.execute(
+            _in("SELECT family_code FROM dinaro_families WHERE id IN :ids ORDER BY id"), {"ids": family_ids}
+        ).scalars().all()
+    if dry_run:
+        with src.connect() as conn:
+            rows = _read(conn, family_ids)
+        return {table: len(rows[table]) for table, *_ in PLAN}
+
+    # Freeze: from here on the families' writes are refused, so the copy
+    # below is complete and nothing is written to the source after it.
+    for code in codes:
+        set_family_shard(code, source, moving=True)
+    try:
+        time.sleep(drain_seconds)
+        with src.connect() as conn:
+            rows = _read(conn, family_ids)
+        counts = {table: len(rows[table]) for table, *_ in PLAN}
+
+        with dst.begin() as conn:
+            clash = conn.execute(
+                _in("SELECT family_code FROM dinaro_families WHERE family_code IN :ids"), {"ids": codes}
+            ).scalars().all()
+            if clash:
+                raise RuntimeError(f"shard {target!r} already has {clash}: clean up a half-finished move first")
+            new_ids: dict[str, dict[int, int]] = {table: {} for table, *_ in PLAN}
+            for table, scope_col, scope_table, refs in PLAN:
+                for row in rows[table]:
+                    values = _rewrite(table, row, scope_col, scope_table, refs, new_ids)
+                    cols = list(values)
+                    new_ids[table][row["id"]] = conn.execute(
+                        text(f"INSERT INTO {table} ({', '.join(cols)}) "
+                             f"VALUES ({', '.join(':' + c for c in cols)}) RETURNING id"),
+                        values,
+                    ).scalar()
+    except BaseException:
+        for code in codes:  # thaw in place: the source still has everything
+            set_family_shard(code, source)
+        raise
+
+    for code in codes:
+        set_family_shard(code, target)
+    time.sleep(settle_seconds)
+
+    with src.begin() as conn:
+        for table, *_ in reversed(PLAN):
+            ids = [r["id"] for r in rows[table]]
+            if ids:
+                conn.execute(_in(f"DELETE FROM {table} WHERE id IN :ids"), {"ids": ids})
+    return counts
+
+
+def shard_family_counts() -> dict[str, int]:
+    counts = {}
+    for name in shard_names():
+        with shard_engine(name).connect() as conn:
+            counts[name] = conn.execute(text("SELECT COUNT(*) FROM dinaro_families")).scalar()
+    return counts
@@ -1,15 +1,31 @@
 from __future__ import annotations
 
-import secrets
 import csv
 import io
 from datetime import date, datetime, timedelta
 from typing import Optional
 
-from flask import render_template, request, session, redirect, url_for, Response, jsonify
-from sqlalchemy import text
-
-from dinaro.db import engine, get_db_connection as get_connection
+from flask import g, render_template, request, session, redirect, url_for, Response, jsonify
+from sqlalchemy import bindparam, text
+
+from dataversion import bump_after_writes, versioned
+from dinaro.db import (
+    DEFAULT_SHARD,
+    SHARDED,
+    FamilyMoving,
+    engine,
+    current_shard,
+    enter_shard,
+    family_shard,
+    get_db_connection as get_connection,
+    get_read_connection,
+    leave_shard,
+    place_family,
+    use_shard,
+    _is_postgres,
+    _dinaro_make_family_code,
+)
+from dinaro.events import latest_id as latest_event_id, publish as publish_event, sse_body
 from dinaro.push import notify_parents, notify_child
 from dinaro.kernel import (
     safe_float,
@@ -21,46 +37,143 @@ from . import dinaro_bp
 
 
 # ----------------------------
-# Dinaro Helpers
-# (safe_float / pin / timestamp helpers now live in the core package)
+# Shard routing (see dinaro/db.py)
 # ----------------------------
+@dinaro_bp.before_request
+def _dinaro_enter_session_shard():
+    """Point `engine` at the shard of the session's family for this request."""
+    if not SHARDED:
+        return
+    try:
+        shard = family_shard(session.get("dinaro_family_code"),
+                             for_write=request.method not in ("GET", "HEAD", "OPTIONS"))
+    except FamilyMoving:
+        # dinaro.rebalance is copying this family; a write now would be lost.
+        return Response("This class is being moved to a new server. Please try again in a minute.",
+                        status=503, headers={"Retry-After": "60"}, mimetype="text/plain")
+    if session.get("dinaro_shard", DEFAULT_SHARD) != shard:
+        # The family moved: the session's ids belong to the old database.
+        session.pop("dinaro_parent_id", None)
+        session.pop("dinaro_child_id", None)
+        session["dinaro_shard"] = shard
+    g.dinaro_shard_token = enter_shard(shard)
 
-def _dinaro_rate_for_family(family_id: int) -> float:
-    conn = get_connection()
+
+@dinaro_bp.teardown_request
+def _dinaro_leave_session_shard(_exc):
+    token = g.pop("dinaro_shard_token", None)
+    if token is not None:
+        leave_shard(token)
+
+
+def _dinaro_select_family(code: str) -> bool:
+    """Look `code` up on its shard; if it exists, make it the session's family."""
+    shard = family_shard(code)
+    with use_shard(shard):
+        conn = get_connection()
+        try:
+            fam = conn.execute(
+                text("SELECT id FROM dinaro_families WHERE family_code = :code"),
+                {"code": code},
+            ).mappings().first()
+        finally:
+            conn.close()
+    if not fam:
+        return False
+    if SHARDED and session.get("dinaro_shard", DEFAULT_SHARD) != shard:
+        session.pop("dinaro_parent_id", None)
+        session.pop("dinaro_child_id", None)
+        session["dinaro_shard"] = shard
+    session["dinaro_family_code"] = code
+    return True
+
+
+# ----------------------------
+# Data version (see dataversion.py)
+# ----------------------------
+# The family a session acts for: a parent's or child's own, else the one whose
+# code it entered (e.g. a child waiting for their enrollment to be approved).
+_DINARO_SESSION_FAMILY = (
+    ("dinaro_parent_id", "SELECT family_id FROM dinaro_parents WHERE id = :key"),
+    ("dinaro_child_id", "SELECT family_id FROM dinaro_children WHERE id = :key"),
+    ("dinaro_family_code", "SELECT id FROM dinaro_families WHERE family_code = :key"),
+)
+
+
+def _dinaro_session_family_sql():
+    for key, sql in _DINARO_SESSION_FAMILY:
+        if session.get(key):
+            return sql, session[key]
+    return None, None
+
+
+def _dinaro_bump_version() -> None:
+    sql, key = _dinaro_session_family_sql()
+    if sql is None:
+        return
+    with engine.begin() as conn:
+        conn.execute(
+            text(f"UPDATE dinaro_families SET data_version = data_version + 1 WHERE id = ({sql})"),
+            {"key": key},
+        )
+
+
+def _dinaro_bump_families(conn, family_ids) -> None:
+    """Bump other families' versions inside the transaction that wrote their
+    rows (the after-request hook only knows the session's own family)."""
+    ids = sorted({int(f) for f in family_ids})
+    if ids:
+        conn.execute(
+            text("UPDATE dinaro_families SET data_version = data_version + 1 WHERE id IN :ids")
+            .bindparams(bindparam("ids", expanding=True)),
+            {"ids": ids},
+        )
+
+
+def _dinaro_bump_linked_classes(conn, parent_id: int) -> None:
+    """Bump every class that shares this teacher's link_code: their dashboards
+    list each other (names, the class switcher)."""
+    conn.execute(
+        text(
+            "UPDATE dinaro_families SET data_version = data_version + 1 WHERE id IN ("
+            "SELECT p2.family_id FROM dinaro_parents p1 "
+            "JOIN dinaro_parents p2 ON p2.link_code = p1.link_code WHERE p1.id = :pid)"
+        ),
+        {"pid": parent_id},
+    )
+
+
+def _dinaro_version() -> str | None:
+    sql, key = _dinaro_session_family_sql()
+    if sql is None:
+        return None
+    conn = get_read_connection()
     try:
         row = conn.execute(
-            text("SELECT rate_per_hour FROM dinaro_families WHERE id = :id"),
-            {"id": family_id},
+            text(f"SELECT id, data_version FROM dinaro_families WHERE id = ({sql})"),
+            {"key": key},
         ).mappings().first()
-        return float(row["rate_per_hour"]) if row else 4.0
     finally:
         conn.close()
+    return f"{row['id']}.{row['data_version']}" if row else None
 
 
-def _dinaro_make_family_code() -> str:
-    """Generate a unique 6-char code for families."""
-    chars = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"  # No I, O, 0, 1
-    code = "".join(secrets.choice(chars) for _ in range(6))
-    return code
+bump_after_writes(dinaro_bp, _dinaro_bump_version)
 
 
-def _dinaro_ensure_family_codes():
-    """Fill in missing family codes."""
+# ----------------------------
+# Dinaro Helpers
+# (safe_float / pin / timestamp helpers now live in the core package)
+# ----------------------------
+
+def _dinaro_rate_for_family(family_id: int) -> float:
     conn = get_connection()
     try:
-        rows = conn.execute(
-            text("SELECT id FROM dinaro_families WHERE family_code IS NULL")
-        ).mappings().all()
-        if not rows:
-            return
-        
-        with engine.begin() as conn2:
-            for r in rows:
-                code = _dinaro_make_family_code()
-                conn2.execute(
-                    text("UPDATE dinaro_families SET family_code = :code WHERE id = :id"),
-                    {"code": code, "id": r["id"]}
-                )
+        row = conn.execute(
+            text("SELECT rate_per_hour FROM dinaro_families WHERE id = :id"),
+            {"id": family_id},
+        ).mappings().first()
+        return float(row["rate_per_hour"]) if row else 4.0
     finally:
         conn.close()
 
@@ -83,10 +196,46 @@ def _dinaro_add_ledger(child_id: int, delta: float, reason: str, request_id=None
                 "log_id": log_id,
             },
         )
+        child = conn.execute(
+            text("UPDATE dinaro_children SET balance = balance + :delta WHERE id = :id RETURNING family_id, balance"),
+            {"delta": delta, "id": child_id},
+        ).mappings().first()
+    if child:
+        publish_event(child["family_id"], "balance_changed", balances={child_id: child["balance"]})
+
+
+def _dinaro_add_ledger_many(child_ids: list[int], delta: float, reason: str) -> None:
+    """The same credit/debit for several children, in one transaction and two batched statements."""
+    if not child_ids:
+        return
+    now = _dinaro_now()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO dinaro_ledger (child_id, delta, reason, created_at) "
+                "VALUES (:child_id, :delta, :reason, :created_at)"
+            ),
+            [{"child_id": cid, "delta": delta, "reason": reason, "created_at": now} for cid in child_ids],
+        )
         conn.execute(
             text("UPDATE dinaro_children SET balance = balance + :delta WHERE id = :id"),
-            {"delta": delta, "id": child_id},
+            [{"delta": delta, "id": cid} for cid in child_ids],
         )
+        rows = conn.execute(
+            text("SELECT id, family_id, balance FROM dinaro_children WHERE id IN :ids").bindparams(
+                bindparam("ids", expanding=True)),
+            {"ids": child_ids},
+        ).mappings().all()
+    _dinaro_publish_balances(rows)
+
+
+def _dinaro_publish_balances(rows) -> None:
+    """One balance_changed event per family for rows of (id, family_id, balance)."""
+    by_family: dict[int, dict[int, float]] = {}
+    for row in rows:
+        by_family.setdefault(row["family_id"], {})[row["id"]] = row["balance"]
+    for family_id, balances in by_family.items():
+        publish_event(family_id, "balance_changed", balances=balances)
 
 
 def _dinaro_require_parent() -> int:
@@ -249,21 +398,27 @@ def _dinaro_class_analytics(family_id: int) -> dict:
             {"fid": family_id},
         ).mappings().first()["cnt"]
 
-        leaderboard = []
-        for kid in kids:
-            tasks_week = conn.execute(
+        tasks_week = {
+            row["child_id"]: row["cnt"]
+            for row in conn.execute(
                 text("""
-                    SELECT COUNT(*) AS cnt FROM dinaro_chore_logs
-                    WHERE child_id = :cid AND work_date >= :monday AND status IN ('approved', 'pending')
+                    SELECT l.child_id, COUNT(*) AS cnt FROM dinaro_chore_logs l
+                    JOIN dinaro_children c ON c.id = l.child_id
+                    WHERE c.family_id = :fid AND l.work_date >= :monday AND l.status IN ('approved', 'pending')
+                    GROUP BY l.child_id
                 """),
-                {"cid": kid["id"], "monday": monday},
-            ).mappings().first()["cnt"]
-            leaderboard.append({
+                {"fid": family_id, "monday": monday},
+            ).mappings()
+        }
+        leaderboard = [
+            {
                 "id": kid["id"],
                 "name": kid["name"],
                 "balance": float(kid["balance"] or 0),
-                "tasks_week": tasks_week,
-            })
+                "tasks_week": tasks_week.get(kid["id"], 0),
+            }
+            for kid in kids
+        ]
 
         total_possible = recurring_chores * len(kids)
         total_done_today = conn.execute(
@@ -322,20 +477,16 @@ def _dinaro_check_group_rewards(family_id: int) -> None:
             met = False
 
             if reward["condition_type"] == "all_complete" and reward["condition_chore_id"]:
-                all_done = True
-                for kid in kids:
-                    has_log = conn.execute(
-                        text("""
-                            SELECT COUNT(*) AS cnt FROM dinaro_chore_logs
-                            WHERE child_id = :cid AND chore_id = :chid
-                            AND work_date >= :start AND status = 'approved'
-                        """),
-                        {"cid": kid["id"], "chid": reward["condition_chore_id"], "start": period_start},
-                    ).mappings().first()["cnt"]
-                    if has_log == 0:
-                        all_done = False
-                        break
-                met = all_done
+                done = conn.execute(
+                    text("""
+                        SELECT COUNT(DISTINCT l.child_id) AS cnt FROM dinaro_chore_logs l
+                        JOIN dinaro_children c ON c.id = l.child_id
+                        WHERE c.family_id = :fid AND c.approved = 1 AND l.chore_id = :chid
+                        AND l.work_date >= :start AND l.status = 'approved'
+                    """),
+                    {"fid": family_id, "chid": reward["condition_chore_id"], "start": period_start},
+                ).mappings().first()["cnt"]
+                met = done == len(kids)
 
             elif reward["condition_type"] == "class_target" and reward["condition_target"]:
                 total = conn.execute(
@@ -350,8 +501,9 @@ def _dinaro_check_group_rewards(family_id: int) -> None:
 
             if met:
                 reward_amount = float(reward["reward_dinaro"])
+                _dinaro_add_ledger_many([int(kid["id"]) for kid in kids], reward_amount,
+                                        f"🏅 Group Reward: {reward['title']}")
                 for kid in kids:
-                    _dinaro_add_ledger(int(kid["id"]), reward_amount, f"🏅 Group Reward: {reward['title']}")
                     notify_child(family_id, int(kid["id"]),
                                  "Group reward earned!",
                                  f"Your class earned '{reward['title']}'! +{reward_amount:.2f} dinaro")
@@ -398,14 +550,18 @@ def dinaro_setup():
             return render_template("dinaro_setup.html", error="Please check name and matching PIN.")
 
         pin_hash, pin_salt = _make_pin(pin)
+        shard = None
+        while shard is None:  # place_family refuses a code that's already taken
+            family_code = _dinaro_make_family_code()
+            shard = place_family(family_code)
 
-        with engine.begin() as conn:
+        with use_shard(shard), engine.begin() as conn:
             row = conn.execute(
                 text(
                     "INSERT INTO dinaro_families (name, rate_per_hour, family_code, is_classroom) "
                     "VALUES (:name, :rate, :code, :ic) RETURNING id"
                 ),
-                {"name": family_name or None, "rate": 4, "code": _dinaro_make_family_code(), "ic": is_classroom},
+                {"name": family_name or None, "rate": 4, "code": family_code, "ic": is_classroom},
             ).mappings().first()
             family_id = row["id"] if row else None
             if family_id is None:
@@ -427,6 +583,9 @@ def dinaro_setup():
                 parent_id = conn.execute(text("SELECT last_insert_rowid() AS id")).mappings().first()["id"]
 
         # Sign the new teacher straight in — no re-login, no picking from a list.
+        session["dinaro_family_code"] = family_code
+        if SHARDED:
+            session["dinaro_shard"] = shard
         session["dinaro_parent_id"] = int(parent_id)
         return redirect(url_for("dinaro.dinaro_parent_dashboard"))
 
@@ -472,16 +631,7 @@ def dinaro_parent_login():
 
         if action == "find_family":
             code = (request.form.get("family_code") or "").strip().upper()
-            conn = get_connection()
-            try:
-                fam = conn.execute(
-                    text("SELECT id FROM dinaro_families WHERE family_code = :code"),
-                    {"code": code},
-                ).mappings().first()
-            finally:
-                conn.close()
-            if fam:
-                session["dinaro_family_code"] = code
+            if _dinaro_select_family(code):
                 return redirect(url_for("dinaro.dinaro_parent_login"))
             return render_template("dinaro_parent_login.html", error="Class code not found.")
 
@@ -539,18 +689,21 @@ def _dinaro_active_fund(family_id: int):
 
 
 @dinaro_bp.get("/parent")
+@versioned(_dinaro_version)
 def dinaro_parent_dashboard():
     parent_id = _dinaro_require_parent()
     if not parent_id:
         return redirect(url_for("dinaro.dinaro_parent_login"))
 
     family_id = _dinaro_parent_family_id(parent_id)
-    conn = get_connection()
+    conn = get_read_connection()
     try:
         family = conn.execute(
             text("SELECT id, name, rate_per_hour, family_code, is_classroom, interest_rate, interest_threshold, tax_rate, show_leaderboard, grade_mode FROM dinaro_families WHERE id = :id"),
             {"id": family_id},
         ).mappings().first()
+        # Read before the rest: the live feed replays anything newer than this.
+        events_after = latest_event_id(conn, family_id)
         kids = conn.execute(
             text("SELECT id, name, balance, view_mode FROM dinaro_children WHERE family_id = :id AND approved = 1 ORDER BY name ASC"),
             {"id": family_id},
@@ -581,7 +734,8 @@ def dinaro_parent_dashboard():
             text(
                 """
                 SELECT l.id, l.child_id, l.chore_id, l.work_date, l.overtime_hours,
-                       l.requested_hours, l.status, c.title AS chore_title, ch.name AS child_name
+                       l.requested_hours, l.requested_hours AS total_hours, l.status,
+                       c.title AS chore_title, c.default_hours, ch.name AS child_name
                 FROM dinaro_chore_logs l
                 LEFT JOIN dinaro_chores c ON c.id = l.chore_id
                 LEFT JOIN dinaro_children ch ON ch.id = l.child_id
@@ -591,42 +745,6 @@ def dinaro_parent_dashboard():
             ),
             {"id": family_id},
         ).mappings().all()
-        requests = conn.execute(
-            text(
-                """
-                SELECT r.*, ch.name AS child_name
-                FROM dinaro_requests r
-                JOIN dinaro_children ch ON ch.id = r.child_id
-                WHERE ch.family_id = :id
-                ORDER BY r.created_at DESC
-                """
-            ),
-            {"id": family_id},
-        ).mappings().all()
-        goals = conn.execute(
-            text(
-                """
-                SELECT g.*, ch.name AS child_name, ch.balance
-                FROM dinaro_goals g
-                JOIN dinaro_children ch ON ch.id = g.child_id
-                WHERE ch.family_id = :id
-                ORDER BY g.id DESC
-                """
-            ),
-            {"id": family_id},
-        ).mappings().all()
-        ledger = conn.execute(
-            text(
-                """
-                SELECT l.*, ch.name AS child_name
-                FROM dinaro_ledger l
-                JOIN dinaro_children ch ON ch.id = l.child_id
-                WHERE ch.family_id = :id
-                ORDER BY l.created_at DESC LIMIT 100
-                """
-            ),
-            {"id": family_id},
-        ).mappings().all()
         group_rewards = conn.execute(
             text(
                 """
@@ -639,37 +757,6 @@ def dinaro_parent_dashboard():
             ),
             {"id": family_id},
         ).mappings().all()
-
-        # 7-day trend data
-        today_dt = datetime.now()
-        dates = [(today_dt - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7)]
-        dates.reverse()
-        
-        chart_data = {"labels": dates, "datasets": []}
-        for kid in kids:
-            balances = []
-            curr_balance = float(kid["balance"] or 0)
-            
-            # Simplified: work backwards from current balance
-            # For a more accurate chart, we'd need to sum deltas by date
-            daily_deltas = {}
-            for entry in ledger:
-                if entry["child_id"] == kid["id"]:
-                    edate = entry["created_at"][:10]
-                    daily_deltas[edate] = daily_deltas.get(edate, 0) + float(entry["delta"])
-            
-            temp_balance = curr_balance
-            day_balances = []
-            for d in reversed(dates):
-                day_balances.append(round(temp_balance, 2))
-                temp_balance -= daily_deltas.get(d, 0)
-            
-            day_balances.reverse()
-            chart_data["datasets"].append({
-                "label": kid["name"],
-                "data": day_balances
-            })
-
     finally:
         conn.close()
     
@@ -677,23 +764,30 @@ def dinaro_parent_dashboard():
     today = date.today().isoformat()
     monday = (date.today() - timedelta(days=date.today().weekday())).isoformat()
     
+    # Recurring chores for the family, and the last week's logs for every
+    # child in one query (grouped below) instead of one query per child.
+    recurring = [c for c in chores if c["recurrence"] in ("daily", "weekly")]
+    logs_by_kid = {}
+    conn = get_read_connection()
+    try:
+        week_logs = conn.execute(
+            text(
+                "SELECT l.child_id, l.chore_id, l.work_date, l.status FROM dinaro_chore_logs l "
+                "JOIN dinaro_children ch ON ch.id = l.child_id "
+                "WHERE ch.family_id = :fid AND l.work_date >= :monday"
+            ),
+            {"fid": family_id, "monday": (date.today() - timedelta(days=7)).isoformat()},
+        ).mappings().all()
+    finally:
+        conn.close()
+    for log in week_logs:
+        logs_by_kid.setdefault(log["child_id"], []).append(log)
+
     kids_with_progress = []
     for kid in kids:
         kid_dict = dict(kid)
-        
-        # Get recurring chores for the family
-        recurring = [c for c in chores if c["recurrence"] in ("daily", "weekly")]
-        
-        # Get logs for this kid
-        conn = get_connection()
-        try:
-            kid_logs = conn.execute(
-                text("SELECT chore_id, work_date, status FROM dinaro_chore_logs WHERE child_id = :id AND work_date >= :monday"),
-                {"id": kid["id"], "monday": (date.today() - timedelta(days=7)).isoformat()},
-            ).mappings().all()
-        finally:
-            conn.close()
-        
+        kid_logs = logs_by_kid.get(kid["id"], [])
+
         done_count = 0
         total_count = len(recurring)
         
@@ -709,34 +803,6 @@ def dinaro_parent_dashboard():
         kid_dict["todo_total"] = total_count
         kids_with_progress.append(kid_dict)
 
-    # Classroom analytics
-    analytics = _dinaro_class_analytics(family_id) if family and family["is_classroom"] else None
-
-    treasury = _dinaro_active_fund(family_id)
-    treasury_options = []
-    treasury_bill_stats = {"paid": 0, "total": 0}
-    if treasury:
-        conn = get_connection()
-        try:
-            treasury_options = conn.execute(
-                text(
-                    "SELECT o.id, o.label, "
-                    "(SELECT COUNT(*) FROM dinaro_fund_votes v WHERE v.option_id = o.id) AS votes "
-                    "FROM dinaro_fund_options o WHERE o.fund_id = :fid ORDER BY o.id"
-                ),
-                {"fid": treasury["id"]},
-            ).mappings().all()
-            treasury_bill_stats = conn.execute(
-                text(
-                    "SELECT COUNT(*) AS total, "
-                    "COALESCE(SUM(CASE WHEN amount_paid >= amount_owed THEN 1 ELSE 0 END), 0) AS paid "
-                    "FROM dinaro_fund_bills WHERE fund_id = :fid"
-                ),
-                {"fid": treasury["id"]},
-            ).mappings().first()
-        finally:
-            conn.close()
-
     return render_template(
         "dinaro_parent_dashboard.html",
         family=family,
@@ -745,18 +811,184 @@ def dinaro_parent_dashboard():
         chores=chores,
         spendables=spendables,
         pending_logs=pending_logs,
-        requests=requests,
-        goals=goals,
-        ledger=ledger,
-        chart_data=chart_data,
         rate_per_hour=family["rate_per_hour"] if family else 4,
         pending_enrollments=pending_enrollments,
         other_classes=_dinaro_get_linked_families(parent_id) if family and family["is_classroom"] else [],
-        analytics=analytics,
         group_rewards=group_rewards,
-        treasury=treasury,
-        treasury_options=treasury_options,
-        treasury_bill_stats=treasury_bill_stats,
+        events_after=events_after,
+    )
+
+
+# ----------------------------
+# Parent dashboard sections
+# ----------------------------
+# The heavy, below-the-fold panels are rendered by /parent/section/<name> and
+# fetched in parallel by dinaro-sections.js after first paint, so the page
+# itself only waits for the kids list, pending approvals and the setup forms.
+# The live feed (dinaro-live.js) refetches the ones an event makes stale.
+
+def _dinaro_section_analytics(conn, family) -> dict:
+    return {"analytics": _dinaro_class_analytics(family["id"]) if family["is_classroom"] else None}
+
+
+def _dinaro_section_treasury(conn, family) -> dict:
+    treasury = _dinaro_active_fund(family["id"]) if family["is_classroom"] else None
+    treasury_options = []
+    treasury_bill_stats = {"paid": 0, "total": 0}
+    if treasury:
+        treasury_options = conn.execute(
+            text("SELECT id, label, votes FROM dinaro_fund_options WHERE fund_id = :fid ORDER BY id"),
+            {"fid": treasury["id"]},
+        ).mappings().all()
+        treasury_bill_stats = conn.execute(
+            text(
+                "SELECT COUNT(*) AS total, "
+                "COALESCE(SUM(CASE WHEN amount_paid >= amount_owed THEN 1 ELSE 0 END), 0) AS paid "
+                "FROM dinaro_fund_bills WHERE fund_id = :fid"
+            ),
+            {"fid": treasury["id"]},
+        ).mappings().first()
+    return {"treasury": treasury, "treasury_options": treasury_options, "treasury_bill_stats": treasury_bill_stats}
+
+
+def _dinaro_section_history(conn, family) -> dict:
+    ledger = conn.execute(
+        text(
+            """
+            SELECT l.*, ch.name AS child_name
+            FROM dinaro_ledger l
+            JOIN dinaro_children ch ON ch.id = l.child_id
+            WHERE ch.family_id = :id
+            ORDER BY l.created_at DESC LIMIT 100
+            """
+        ),
+        {"id": family["id"]},
+    ).mappings().all()
+    return {"ledger": ledger}
+
+
+def _dinaro_section_requests(conn, family) -> dict:
+    requests = conn.execute(
+        text(
+            """
+            SELECT r.*, ch.name AS child_name
+            FROM dinaro_requests r
+            JOIN dinaro_children ch ON ch.id = r.child_id
+            WHERE ch.family_id = :id
+            ORDER BY r.created_at DESC
+            """
+        ),
+        {"id": family["id"]},
+    ).mappings().all()
+    return {"requests": requests}
+
+
+def _dinaro_section_goals(conn, family) -> dict:
+    goals = conn.execute(
+        text(
+            """
+            SELECT g.*, ch.name AS child_name, ch.balance
+            FROM dinaro_goals g
+            JOIN dinaro_children ch ON ch.id = g.child_id
+            WHERE ch.family_id = :id
+            ORDER BY g.id DESC
+            """
+        ),
+        {"id": family["id"]},
+    ).mappings().all()
+    return {"goals": goals}
+
+
+def _dinaro_section_trends(conn, family) -> dict:
+    """Each child's balance at the end of the last 7 days, worked back from today's."""
+    today_dt = datetime.now()
+    dates = [(today_dt - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(6, -1, -1)]
+    kids = conn.execute(
+        text("SELECT id, name, balance FROM dinaro_children WHERE family_id = :id AND approved = 1 ORDER BY name ASC"),
+        {"id": family["id"]},
+    ).mappings().all()
+    daily_deltas = {
+        (row["child_id"], row["day"]): float(row["delta"])
+        for row in conn.execute(
+            text(
+                """
+                SELECT l.child_id, substr(l.created_at, 1, 10) AS day, SUM(l.delta) AS delta
+                FROM dinaro_ledger l
+                JOIN dinaro_children ch ON ch.id = l.child_id
+                WHERE ch.family_id = :id AND l.created_at >= :since
+                GROUP BY l.child_id, substr(l.created_at, 1, 10)
+                """
+            ),
+            {"id": family["id"], "since": dates[0]},
+        ).mappings()
+    }
+
+    chart_data = {"labels": dates, "datasets": []}
+    for kid in kids:
+        temp_balance = float(kid["balance"] or 0)
+        day_balances = []
+        for d in reversed(dates):
+            day_balances.append(round(temp_balance, 2))
+            temp_balance -= daily_deltas.get((kid["id"], d), 0)
+        day_balances.reverse()
+        chart_data["datasets"].append({"label": kid["name"], "data": day_balances})
+    return {"chart_data": chart_data}
+
+
+_DINARO_PARENT_SECTIONS = {
+    "analytics": _dinaro_section_analytics,
+    "treasury": _dinaro_section_treasury,
+    "history": _dinaro_section_history,
+    "requests": _dinaro_section_requests,
+    "goals": _dinaro_section_goals,
+    "trends": _dinaro_section_trends,
+}
+
+
+@dinaro_bp.get("/parent/section/<name>")
+@versioned(_dinaro_version)
+def dinaro_parent_section(name: str):
+    """One lazily loaded panel of the parent dashboard, as an HTML fragment."""
+    parent_id = _dinaro_require_parent()
+    family_id = _dinaro_parent_family_id(parent_id) if parent_id else 0
+    if not family_id:
+        return Response(status=401)
+    loader = _DINARO_PARENT_SECTIONS.get(name)
+    if loader is None:
+        return Response(status=404)
+    conn = get_read_connection()
+    try:
+        family = conn.execute(
+            text("SELECT id, name, is_classroom, grade_mode FROM dinaro_families WHERE id = :id"),
+            {"id": family_id},
+        ).mappings().first()
+        context = loader(conn, family)
+    finally:
+        conn.close()
+    return render_template(f"dinaro_parent_sections/{name}.html", family=family, **context)
+
+
+@dinaro_bp.get("/parent/events")
+def dinaro_parent_events():
+    """Live feed for the parent dashboard (server-sent events, see dinaro/events.py)."""
+    parent_id = _dinaro_require_parent()
+    family_id = _dinaro_parent_family_id(parent_id) if parent_id else 0
+    if not family_id:
+        return Response(status=401)
+    # The browser resends the last id it saw on reconnect; ?after= is where the page started.
+    after = request.headers.get("Last-Event-ID") or request.args.get("after") or ""
+    if after.isdigit():
+        after_id = int(after)
+    else:
+        conn = get_connection()
+        try:
+            after_id = latest_event_id(conn, family_id)
+        finally:
+            conn.close()
+    return Response(
+        sse_body(family_id, after_id),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -946,6 +1178,8 @@ def dinaro_parent_settings():
                 "id": family_id
             },
         )
+        # The class name shows in its linked classes' dashboards too.
+        _dinaro_bump_linked_classes(conn, parent_id)
     return redirect(url_for("dinaro.dinaro_parent_dashboard"))
 
 
@@ -985,13 +1219,17 @@ def dinaro_parent_create_class():
                 {"lc": link_code, "id": parent_id},
             )
 
+    # Linked classes live on the teacher's shard (class switching is a local join).
+    family_code = _dinaro_make_family_code()
+    while place_family(family_code, current_shard()) is None:
+        family_code = _dinaro_make_family_code()
     with engine.begin() as conn:
         row = conn.execute(
             text(
                 "INSERT INTO dinaro_families (name, rate_per_hour, family_code, is_classroom) "
                 "VALUES (:name, :rate, :code, 1) RETURNING id"
             ),
-            {"name": class_name, "rate": 4, "code": _dinaro_make_family_code()},
+            {"name": class_name, "rate": 4, "code": family_code},
         ).mappings().first()
         new_family_id = row["id"] if row else None
         if new_family_id is None:
@@ -1008,6 +1246,8 @@ def dinaro_parent_create_class():
         new_parent_id = row2["id"] if row2 else None
         if new_parent_id is None:
             new_parent_id = conn.execute(text("SELECT last_insert_rowid() AS id")).mappings().first()["id"]
+        # Every class of this teacher now lists the new one.
+        _dinaro_bump_linked_classes(conn, new_parent_id)
 
     session["dinaro_parent_id"] = int(new_parent_id)
     return redirect(url_for("dinaro.dinaro_parent_dashboard"))
@@ -1265,31 +1505,26 @@ def dinaro_parent_add_chore():
     if not title:
         return redirect(url_for("dinaro.dinaro_parent_dashboard"))
 
+    # Broadcast to other classes if requested (classroom mode)
+    fids = [family_id]
+    broadcast_ids = request.form.getlist("broadcast_to_families")
+    if broadcast_ids:
+        linked = _dinaro_get_linked_families(parent_id)
+        valid_fids = {f["family_id"] for f in linked}
+        fids += sorted({int(f) for f in broadcast_ids if f.isdigit()} & valid_fids)
+    rows = [
+        {"family_id": fid, "title": title, "hours": hours, "recurrence": recurrence, "chore_type": chore_type}
+        for fid in fids
+    ]
     with engine.begin() as conn:
         conn.execute(
             text(
                 "INSERT INTO dinaro_chores (family_id, title, default_hours, recurrence, chore_type) "
                 "VALUES (:family_id, :title, :hours, :recurrence, :chore_type)"
             ),
-            {"family_id": family_id, "title": title, "hours": hours, "recurrence": recurrence, "chore_type": chore_type},
+            rows,
         )
-
-    # Broadcast to other classes if requested (classroom mode)
-    broadcast_ids = request.form.getlist("broadcast_to_families")
-    if broadcast_ids:
-        linked = _dinaro_get_linked_families(parent_id)
-        valid_fids = {f["family_id"] for f in linked}
-        with engine.begin() as conn:
-            for fid_str in broadcast_ids:
-                fid = int(fid_str)
-                if fid in valid_fids:
-                    conn.execute(
-                        text(
-                            "INSERT INTO dinaro_chores (family_id, title, default_hours, recurrence, chore_type) "
-                            "VALUES (:family_id, :title, :hours, :recurrence, :chore_type)"
-                        ),
-                        {"family_id": fid, "title": title, "hours": hours, "recurrence": recurrence, "chore_type": chore_type},
-                    )
+        _dinaro_bump_families(conn, fids[1:])
 
     return redirect(url_for("dinaro.dinaro_parent_dashboard"))
 
@@ -1642,16 +1877,7 @@ def dinaro_parent_decline_request(request_id: int):
 def dinaro_join(code):
     """Shareable join link (and QR target): pre-fills the class code so a
     student lands straight on name + PIN instead of typing the code."""
-    code = (code or "").strip().upper()
-    conn = get_connection()
-    try:
-        fam = conn.execute(
-            text("SELECT id FROM dinaro_families WHERE family_code = :c"), {"c": code}
-        ).mappings().first()
-    finally:
-        conn.close()
-    if fam:
-        session["dinaro_family_code"] = code
+    _dinaro_select_family((code or "").strip().upper())
     return redirect(url_for("dinaro.dinaro_child_login"))
 
 
@@ -1664,19 +1890,9 @@ def dinaro_child_login():
         
         if action == "find_family":
             code = (request.form.get("family_code") or "").strip().upper()
-            conn = get_connection()
-            try:
-                family = conn.execute(
-                    text("SELECT id, is_classroom FROM dinaro_families WHERE family_code = :code"),
-                    {"code": code},
-                ).mappings().first()
-                if family:
-                    session["dinaro_family_code"] = code
-                    return redirect(url_for("dinaro.dinaro_child_login"))
-                else:
-                    return render_template("dinaro_child_login.html", error="Family code not found.")
-            finally:
-                conn.close()
+            if _dinaro_select_family(code):
+                return redirect(url_for("dinaro.dinaro_child_login"))
+            return render_template("dinaro_child_login.html", error="Family code not found.")
                 
         elif action == "login":
             pin = (request.form.get("child_pin") or "").strip()
@@ -1809,6 +2025,7 @@ def dinaro_child_enroll():
             {"fid": family["id"], "name": name, "hash": pin_hash, "salt": pin_salt},
         )
 
+    publish_event(family["id"], "enrollment_pending", name=name)
     notify_parents(family["id"], "New enrollment request",
                    f"{name} wants to join your class.")
 
@@ -1921,6 +2138,7 @@ def dinaro_parent_delete_group_reward(reward_id: int):
 
 
 @dinaro_bp.get("/child")
+@versioned(_dinaro_version)
 def dinaro_child_dashboard():
     child_id = _dinaro_require_child()
     if not child_id:
@@ -1931,7 +2149,7 @@ def dinaro_child_dashboard():
     family_id = _dinaro_child_family_id(child_id)
     rate = _dinaro_rate_for_family(family_id)
 
-    conn = get_connection()
+    conn = get_read_connection()
     try:
         child = conn.execute(
             text("SELECT id, family_id, name, balance, view_mode, standing FROM dinaro_children WHERE id = :id"),
@@ -2042,11 +2260,7 @@ def dinaro_child_dashboard():
                 {"fid": family_id, "c": child_id},
             ).mappings().all()
             treasury_options = conn.execute(
-                text(
-                    "SELECT o.id, o.label, "
-                    "(SELECT COUNT(*) FROM dinaro_fund_votes v WHERE v.option_id = o.id) AS votes "
-                    "FROM dinaro_fund_options o WHERE o.fund_id = :f ORDER BY o.id"
-                ),
+                text("SELECT id, label, votes FROM dinaro_fund_options WHERE fund_id = :f ORDER BY id"),
                 {"f": treasury["id"]},
             ).mappings().all()
             if treasury["status"] == "voting":
@@ -2099,6 +2313,40 @@ def _dinaro_fund_match(fund, amount: float) -> float:
     return round(amount * (fund["match_num"] or 0) / den, 2)
 
 
+def _dinaro_cast_vote(conn, fund_id: int, child_id: int, option_id: int) -> None:
+    """Record a student's vote and keep the per-option tallies in step, inside
+    the caller's transaction. Re-voting for the same option is a no-op.
+
+    The insert comes first so a double-submitted first vote can't be counted
+    twice: only the request whose INSERT lands adds the tally; the other hits
+    the unique (fund_id, child_id) index and falls through to the change path,
+    which reads the stored vote under a row lock."""
+    first = conn.execute(
+        text(
+            "INSERT INTO dinaro_fund_votes (fund_id, child_id, option_id) VALUES (:f, :c, :o) "
+            "ON CONFLICT (fund_id, child_id) DO NOTHING RETURNING id"
+        ),
+        {"f": fund_id, "c": child_id, "o": option_id},
+    ).scalar()
+    if first is None:
+        lock = " FOR UPDATE" if _is_postgres() else ""
+        prev = conn.execute(
+            text(f"SELECT option_id FROM dinaro_fund_votes WHERE fund_id=:f AND child_id=:c{lock}"),
+            {"f": fund_id, "c": child_id},
+        ).scalar()
+        if prev == option_id:
+            return
+        conn.execute(
+            text("UPDATE dinaro_fund_votes SET option_id=:o WHERE fund_id=:f AND child_id=:c"),
+            {"f": fund_id, "c": child_id, "o": option_id},
+        )
+        conn.execute(
+            text("UPDATE dinaro_fund_options SET votes = votes - 1 WHERE id=:o AND votes > 0"),
+            {"o": prev},
+        )
+    conn.execute(text("UPDATE dinaro_fund_options SET votes = votes + 1 WHERE id=:o"), {"o": option_id})
+
+
 @dinaro_bp.post("/child/treasury/pay")
 def dinaro_child_treasury_pay():
     """Pay toward your fair-share bill (capped at what you owe and what you have)."""
@@ -2108,6 +2356,7 @@ def dinaro_child_treasury_pay():
     family_id = _dinaro_child_family_id(child_id)
     fund = _dinaro_active_fund(family_id)
     amount = safe_float(request.form.get("amount"), 0.0)
+    paid = 0.0
     if fund and amount > 0:
         with engine.begin() as conn:
             bal = float(conn.execute(text("SELECT balance FROM dinaro_children WHERE id=:c"), {"c": child_id}).scalar() or 0)
@@ -2123,6 +2372,9 @@ def dinaro_child_treasury_pay():
                     conn.execute(text("UPDATE dinaro_fund_bills SET amount_paid = amount_paid + :p WHERE id=:b"), {"p": pay, "b": bill["id"]})
                     conn.execute(text("UPDATE dinaro_class_funds SET raised = raised + :amt WHERE id=:f"), {"amt": pay + _dinaro_fund_match(fund, pay), "f": fund["id"]})
                     conn.execute(text("INSERT INTO dinaro_ledger (child_id, delta, reason, created_at) VALUES (:c, :d, 'treasury_tax', :now)"), {"c": child_id, "d": -pay, "now": _dinaro_now()})
+                    paid = pay
+    if paid:
+        publish_event(family_id, "balance_changed", balances={child_id: round(bal - paid, 2)})
     return redirect(url_for("dinaro.dinaro_child_dashboard"))
 
 
@@ -2135,6 +2387,7 @@ def dinaro_child_treasury_donate():
     family_id = _dinaro_child_family_id(child_id)
     fund = _dinaro_active_fund(family_id)
     amount = safe_float(request.form.get("amount"), 0.0)
+    give = 0.0
     if fund and amount > 0:
         with engine.begin() as conn:
             bal = float(conn.execute(text("SELECT balance FROM dinaro_children WHERE id=:c"), {"c": child_id}).scalar() or 0)
@@ -2143,6 +2396,8 @@ def dinaro_child_treasury_donate():
                 conn.execute(text("UPDATE dinaro_children SET balance = balance - :g WHERE id=:c"), {"g": give, "c": child_id})
                 conn.execute(text("UPDATE dinaro_class_funds SET raised = raised + :amt WHERE id=:f"), {"amt": give + _dinaro_fund_match(fund, give), "f": fund["id"]})
                 conn.execute(text("INSERT INTO dinaro_ledger (child_id, delta, reason, created_at) VALUES (:c, :d, 'treasury_donation', :now)"), {"c": child_id, "d": -give, "now": _dinaro_now()})
+    if give > 0:
+        publish_event(family_id, "balance_changed", balances={child_id: round(bal - give, 2)})
     return redirect(url_for("dinaro.dinaro_child_dashboard"))
 
 
@@ -2153,6 +2408,7 @@ def dinaro_child_treasury_grade():
     if not child_id:
         return redirect(url_for("dinaro.dinaro_child_login"))
     amount = safe_float(request.form.get("amount"), 0.0)
+    spend = 0.0
     if amount > 0:
         with engine.begin() as conn:
             bal = float(conn.execute(text("SELECT balance FROM dinaro_children WHERE id=:c"), {"c": child_id}).scalar() or 0)
@@ -2160,6 +2416,8 @@ def dinaro_child_treasury_grade():
             if spend > 0:
                 conn.execute(text("UPDATE dinaro_children SET balance = balance - :s, standing = standing + :s WHERE id=:c"), {"s": spend, "c": child_id})
                 conn.execute(text("INSERT INTO dinaro_ledger (child_id, delta, reason, created_at) VALUES (:c, :d, 'grade_self', :now)"), {"c": child_id, "d": -spend, "now": _dinaro_now()})
+    if spend > 0:
+        publish_event(_dinaro_child_family_id(child_id), "balance_changed", balances={child_id: round(bal - spend, 2)})
     return redirect(url_for("dinaro.dinaro_child_dashboard"))
 
 
@@ -2172,6 +2430,7 @@ def dinaro_child_treasury_gift():
     family_id = _dinaro_child_family_id(child_id)
     target_id = int(safe_float(request.form.get("target_id"), 0))
     amount = safe_float(request.form.get("amount"), 0.0)
+    spent = 0.0
     if target_id and target_id != child_id and amount > 0:
         with engine.begin() as conn:
             target = conn.execute(
@@ -2184,6 +2443,9 @@ def dinaro_child_treasury_gift():
                 conn.execute(text("UPDATE dinaro_children SET balance = balance - :s WHERE id=:c"), {"s": spend, "c": child_id})
                 conn.execute(text("UPDATE dinaro_children SET standing = standing + :s WHERE id=:t"), {"s": spend, "t": target_id})
                 conn.execute(text("INSERT INTO dinaro_ledger (child_id, delta, reason, created_at) VALUES (:c, :d, 'grade_gift', :now)"), {"c": child_id, "d": -spend, "now": _dinaro_now()})
+                spent = spend
+    if spent:
+        publish_event(family_id, "balance_changed", balances={child_id: round(bal - spent, 2)})
     return redirect(url_for("dinaro.dinaro_child_dashboard"))
 
 
@@ -2216,15 +2478,12 @@ def dinaro_child_treasury_vote():
                 owed, paid = float(bill["amount_owed"]), float(bill["amount_paid"])
                 eligible = owed <= 0 or paid >= owed
         if opt and eligible:
-            conn.execute(text("DELETE FROM dinaro_fund_votes WHERE fund_id=:f AND child_id=:c"), {"f": fund["id"], "c": child_id})
-            conn.execute(
-                text("INSERT INTO dinaro_fund_votes (fund_id, child_id, option_id) VALUES (:f, :c, :o)"),
-                {"f": fund["id"], "c": child_id, "o": option_id},
-            )
+            _dinaro_cast_vote(conn, fund["id"], child_id, option_id)
     return redirect(url_for("dinaro.dinaro_child_dashboard"))
 
 
 @dinaro_bp.get("/child/history")
+@versioned(_dinaro_version)
 def dinaro_child_history():
     child_id = _dinaro_require_child()
     if not child_id:
@@ -2302,6 +2561,8 @@ def dinaro_child_log_chore():
         conn.close()
     child_name = child_row["name"] if child_row else "Your child"
     chore_title = chore["title"] or "a chore"
+    publish_event(family_id, "chore_logged", child_id=child_id, child_name=child_name,
+                  chore_title=chore_title, hours=requested_hours)
     notify_parents(family_id, f"{child_name} finished a chore",
                    f"{child_name} completed '{chore_title}' and needs approval.")
     return redirect(url_for("dinaro.dinaro_child_dashboard"))
@@ -2403,6 +2664,8 @@ def dinaro_child_add_request():
     finally:
         conn.close()
     child_name = child_row["name"] if child_row else "Your child"
+    publish_event(family_id, "request_created", child_id=child_id, child_name=child_name,
+                  item_name=item_name, offer=offer)
     notify_parents(family_id, f"{child_name} wants something!",
                    f"{child_name} requested '{item_name}' for {offer:.2f} dinaro.")
     return redirect(url_for("dinaro.dinaro_child_dashboard"))
@@ -9,8 +9,11 @@ app (app.py) — this module just proves Dinaro is liftable on its own.
 
 Configuration (env):
   DINARO_DATABASE_URL  give Dinaro its own database (else shares the main app's)
+  DINARO_DATABASE_READ_URL  optional read replica of that database
+  DINARO_SHARDS        extra databases to spread families over (see dinaro/db.py)
   FLASK_SECRET_KEY     session signing key
   TIMECOST_URL         optional external link back to TimeCost (else hidden)
+  JINJA_CACHE_DIR, TEMPLATE_WARMUP   see templating.py
 """
 from __future__ import annotations
 
@@ -18,8 +21,11 @@ import os
 
 from flask import Flask
 
+from assets import init_assets
+from database import init_read_routing
+from templating import init_templates
 from dinaro import dinaro_bp
-from dinaro.db import init_dinaro_db
+from dinaro.db import init_dinaro_db, _dinaro_ensure_family_codes
 
 
 def create_app() -> Flask:
@@ -31,13 +37,16 @@ def create_app() -> Flask:
         static_folder=os.path.join(os.path.dirname(__file__), os.pardir, "static"),
     )
     app.secret_key = os.environ.get("FLASK_SECRET_KEY", os.urandom(32))
+    # Fingerprinted asset URLs, shared with the main app (repo-level assets.py).
+    init_assets(app)
+    init_read_routing(app)
 
     # Mounted at the root (its own domain), not under /dinaro.
     app.register_blueprint(dinaro_bp)
+    init_templates(app)
 
     try:
         init_dinaro_db()
-        from dinaro.routes import _dinaro_ensure_family_codes
         _dinaro_ensure_family_codes()
     except Exception as e:  # pragma: no cover
         print("Dinaro DB init error:", e)
@@ -0,0 +1,118 @@
+"""Gunicorn settings (picked up automatically from the working directory).
+
+Most requests spend their time waiting on Postgres or a web-push endpoint, so
+the default is gthread: a few processes, each with a handful of threads.
+Deployments that serve the live parent dashboard (SSE, dinaro/events.py) use
+gevent instead, where an idle stream costs a greenlet rather than a thread;
+the Dockerfile sets that. Everything can be overridden from the environment
+(or the command line, which wins over this file):
+
+  PORT                        listen port (default 8080)
+  GUNICORN_WORKER_CLASS       gthread (default), gevent, sync, ...
+  GUNICORN_THREADS            threads per worker (default 4; 1 otherwise)
+  GUNICORN_WORKER_CONNECTIONS gevent: open connections per worker (default 1000)
+  GUNICORN_WORKERS            fixed worker count (default: sized, see below)
+  GUNICORN_WORKER_MEMORY_MB   memory budgeted per worker (default 150)
+  GUNICORN_MAX_REQUESTS       recycle a worker after this many requests (default 1000)
+  GUNICORN_KEEPALIVE          idle keep-alive seconds (default 5)
+  GUNICORN_PRELOAD            "0" to import the app in each worker instead of the master
+
+Workers default to 2 x CPUs + 1, capped by what fits in the container's memory
+limit. The SQLAlchemy pool is sized from the thread count (DB_POOL_SIZE /
+DB_MAX_OVERFLOW, unless already set) so a busy worker never waits on a
+connection; under gevent it is a fixed 10 (+10), as most connections are
+streams that hold no database connection while they wait.
+"""
+import os
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not Linux
+        return os.cpu_count() or 1
+
+
+def _memory_limit_mb() -> int | None:
+    """The cgroup memory limit (containers), else physical memory."""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as f:
+                raw = f.read().strip()
+        except OSError:
+            continue
+        if raw.isdigit() and int(raw) < 1 << 60:  # v1 reports "no limit" as a huge number
+            return int(raw) // (1024 * 1024)
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return None
+
+
+def _default_workers() -> int:
+    workers = 2 * _cpu_count() + 1
+    memory = _memory_limit_mb()
+    if memory:
+        # Leave a quarter for the master, page cache and the OS.
+        workers = min(workers, int(memory * 0.75) // _int_env("GUNICORN_WORKER_MEMORY_MB", 150))
+    return max(1, workers)
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = _int_env("GUNICORN_THREADS", 4 if worker_class == "gthread" else 1)
+workers = _int_env("GUNICORN_WORKERS", 0) or _default_workers()
+worker_connections = _int_env("GUNICORN_WORKER_CONNECTIONS", 1000)
+max_requests = _int_env("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = max_requests // 10
+keepalive = _int_env("GUNICORN_KEEPALIVE", 5)
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") != "0"
+timeout = 30
+graceful_timeout = 30
+
+if worker_class == "gevent":
+    # Patch before the app is imported (preload imports it in the master), so
+    # its locks and sockets, and psycopg2's waits, yield to other greenlets.
+    from gevent import monkey
+
+    monkey.patch_all()
+    from psycogreen.gevent import patch_psycopg
+
+    patch_psycopg()
+
+# One connection per thread, plus the same again for the requests that hold a
+# read connection while opening a write transaction. Set before the app (and
+# so database.py) is imported, in the master with preload or in each worker.
+_db_connections = 10 if worker_class == "gevent" else threads
+os.environ.setdefault("DB_POOL_SIZE", str(_db_connections))
+os.environ.setdefault("DB_MAX_OVERFLOW", str(_db_connections))
+
+
+# Tables are created once, by on_starting in the master; app.py must not repeat
+# it on import (in the master with preload, or in every worker without).
+os.environ["INIT_DB_ON_IMPORT"] = "0"
+
+
+def on_starting(server):
+    """Create/migrate tables once in the master instead of in every worker."""
+    from bootstrap import init_databases
+
+    init_databases()
+
+
+def post_fork(server, worker):
+    """Never reuse a connection the master opened (preload imports the app there)."""
+    from bootstrap import dispose_engines
+
+    dispose_engines(close=False)
@@ -0,0 +1,546 @@
+"""Open Graph share images (1200x630).
+
+Shared drawing for every card the site publishes, so scripts/build_og_images.py
+can regenerate them all in one go:
+  - backgrounds, glows, scanlines and vignettes are built whole with Pillow
+    (Image.linear_gradient, composited layers, tiled masks) instead of pixel
+    or line loops;
+  - wide Gaussian blurs (glows, vignettes) run on a downscaled layer that is
+    scaled back up (at those radii the result is indistinguishable), and
+    small text/firework halos are blurred on a layer cropped to the shape,
+    not the whole canvas;
+  - save_png() writes an adaptive 256-colour palette PNG (octree palette,
+    Floyd-Steinberg dithered so the soft gradients don't band), which is
+    roughly a third smaller than the RGB files and renders the same.
+
+Each card is a function returning an RGB image; CARDS maps the static/ file
+name to it. result_card() is the per-result card behind /og/result.png: the
+app renders it on demand through cached_png(), a content-addressed disk cache
+shared by every worker on the machine.
+
+Configuration (env):
+  OG_CACHE_DIR        rendered-card cache directory (default: <tmp>/timecost-og)
+  OG_CACHE_MAX_BYTES  size cap; least recently served cards are evicted first
+                      (default: 256 MB)
+  OG_RENDER_SLOTS     card renders allowed at once per worker (default 2)
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+W, H = 1200, 630
+SIZE = (W, H)
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+# Blurs at or above this radius run on a 1/GLOW_DOWNSCALE layer.
+WIDE_BLUR = 40
+GLOW_DOWNSCALE = 4
+PALETTE_COLORS = 256
+
+CACHE_DIR = os.environ.get("OG_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "timecost-og")
+CACHE_MAX_BYTES = int(os.environ.get("OG_CACHE_MAX_BYTES") or 256 * 1024 * 1024)
+# Part of every cache key: bump it when a card's drawing changes, so the new
+# look gets new keys (and ETags) instead of being masked by old renders.
+CARD_VERSION = "1"
+
+
+# ----------------------------
+# Fonts
+# ----------------------------
+# (path, face index) candidates, macOS first (where the cards were designed),
+# then the usual Linux equivalents. Missing everywhere -> Pillow's own font.
+_MAC = "/System/Library/Fonts/"
+_MAC_SUPP = _MAC + "Supplemental/"
+_DEJAVU = "/usr/share/fonts/truetype/dejavu/"
+
+SANS_BOLD = ((_MAC + "Avenir Next.ttc", 0), (_DEJAVU + "DejaVuSans-Bold.ttf", 0), ("arial.ttf", 0))
+SANS = ((_MAC + "Avenir Next.ttc", 0), (_DEJAVU + "DejaVuSans.ttf", 0), ("arial.ttf", 0))
+MONO = ((_MAC + "Menlo.ttc", 0), (_MAC_SUPP + "Courier New.ttf", 0), (_DEJAVU + "DejaVuSansMono.ttf", 0))
+MONO_BOLD = ((_MAC + "Menlo.ttc", 1), (_MAC_SUPP + "Courier New.ttf", 0), (_DEJAVU + "DejaVuSansMono-Bold.ttf", 0))
+IMPACT = ((_MAC_SUPP + "Impact.ttf", 0), (_DEJAVU + "DejaVuSansCondensed-Bold.ttf", 0))
+ARIAL = ((_MAC_SUPP + "Arial.ttf", 0), (_DEJAVU + "DejaVuSans.ttf", 0))
+ARIAL_BOLD = ((_MAC_SUPP + "Arial Bold.ttf", 0), (_DEJAVU + "DejaVuSans-Bold.ttf", 0))
+SCRIPT = ((_MAC_SUPP + "SnellRoundhand.ttc", 0), (_DEJAVU + "DejaVuSerif-Italic.ttf", 0))
+
+
+@lru_cache(maxsize=64)
+def font(candidates: tuple, size: int) -> ImageFont.FreeTypeFont:
+    for path, index in candidates:
+        try:
+            return ImageFont.truetype(path, size, index=index)
+        except OSError:
+            continue
+    return ImageFont.load_default(size)
+
+
+# ----------------------------
+# Layers
+# ----------------------------
+def vertical_gradient(top: tuple, bottom: tuple, size: tuple = SIZE) -> Image.Image:
+    """RGB fill blending `top` into `bottom` down the image."""
+    mask = Image.linear_gradient("L").resize(size, Image.Resampling.BILINEAR)
+    return Image.composite(Image.new("RGB", size, bottom), Image.new("RGB", size, top), mask)
+
+
+def _blurred(paint, radius: float, size: tuple = SIZE) -> Image.Image:
+    """A transparent layer drawn by paint(draw, scale) and Gaussian-blurred.
+
+    paint() gets the ImageDraw and the factor to multiply its coordinates by;
+    wide radii are drawn and blurred small, then scaled up to `size`.
+    """
+    scale = 1 / GLOW_DOWNSCALE if radius >= WIDE_BLUR else 1
+    small = (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+    layer = Image.new("RGBA", small, (0, 0, 0, 0))
+    paint(ImageDraw.Draw(layer), scale)
+    layer = layer.filter(ImageFilter.GaussianBlur(radius * scale))
+    return layer if scale == 1 else layer.resize(size, Image.Resampling.BICUBIC)
+
+
+def glow_ellipse(img: Image.Image, bbox, rgba: tuple, radius: float) -> Image.Image:
+    """`img` with a blurred ellipse of light composited over it."""
+    layer = _blurred(lambda d, s: d.ellipse([c * s for c in bbox], fill=rgba), radius, img.size)
+    return Image.alpha_composite(img, layer)
+
+
+def vignette(img: Image.Image, rgba: tuple, width: int, radius: float) -> Image.Image:
+    """`img` darkened towards its edges by a blurred `width`-px frame."""
+    w, h = img.size
+    layer = _blurred(
+        lambda d, s: d.rectangle([0, 0, w * s, h * s], outline=rgba, width=max(1, round(width * s))),
+        radius, img.size,
+    )
+    return Image.alpha_composite(img, layer)
+
+
+def scanlines(img: Image.Image, every: int = 3, alpha: int = 60) -> Image.Image:
+    """`img` with a 1px dark line every `every` rows (CRT look)."""
+    column = bytes(alpha if y % every == 0 else 0 for y in range(img.height))
+    mask = Image.frombytes("L", (1, img.height), column).resize(img.size, Image.Resampling.NEAREST)
+    shade = Image.new("RGBA", img.size, (0, 0, 0, 0))
+    shade.putalpha(mask)
+    return Image.alpha_composite(img, shade)
+
+
+def halo(img: Image.Image, paint, bbox, radius: float) -> None:
+    """Blur what paint(draw, dx, dy) draws inside `bbox` and composite it in place.
+
+    Only the bbox (padded by the blur) is blurred, not the whole canvas.
+    """
+    pad = int(radius * 3) + 2
+    x0, y0 = max(0, int(bbox[0]) - pad), max(0, int(bbox[1]) - pad)
+    x1, y1 = min(img.width, int(bbox[2]) + pad), min(img.height, int(bbox[3]) + pad)
+    layer = Image.new("RGBA", (x1 - x0, y1 - y0), (0, 0, 0, 0))
+    paint(ImageDraw.Draw(layer), -x0, -y0)
+    img.alpha_composite(layer.filter(ImageFilter.GaussianBlur(radius)), dest=(x0, y0))
+
+
+def glow_text(img: Image.Image, draw: ImageDraw.ImageDraw, pos, text: str, fnt, fill: tuple,
+              anchor: str = "la", glow_rgb: tuple | None = None, blur: float = 9) -> None:
+    """Crisp text with an optional soft halo of `glow_rgb` behind it."""
+    if glow_rgb:
+        halo(
+            img,
+            lambda d, dx, dy: d.text((pos[0] + dx, pos[1] + dy), text, font=fnt, fill=glow_rgb + (230,), anchor=anchor),
+            draw.textbbox(pos, text, font=fnt, anchor=anchor),
+            blur,
+        )
+    draw.text(pos, text, font=fnt, fill=fill + (255,), anchor=anchor)
+
+
+# ----------------------------
+# Output
+# ----------------------------
+def encode_png(img: Image.Image) -> bytes:
+    """Palette-reduced, max-compression PNG bytes for `img`."""
+    rgb = img.convert("RGB")
+    palette = rgb.quantize(PALETTE_COLORS, method=Image.Quantize.FASTOCTREE)
+    quantized = rgb.quantize(palette=palette, dither=Image.Dither.FLOYDSTEINBERG)
+    buf = io.BytesIO()
+    quantized.save(buf, "PNG", optimize=True)
+    return buf.getvalue()
+
+
+def save_png(img: Image.Image, path: str) -> int:
+    """Write `img` to `path` via encode_png(); returns the file size."""
+    data = encode_png(img)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+# ----------------------------
+# Cards
+# ----------------------------
+def landing() -> Image.Image:
+    """static/og-image.png: the home page's "a week in Paris" comparison."""
+    GOLD, WHITE = (242, 210, 143), (255, 255, 255)
+    MUTED, SOFT = (160, 175, 185), (120, 140, 150)
+    BAR_BG, BAR_FG, BAR_YOU = (55, 72, 85), (105, 165, 180), (242, 210, 143)
+    RULE = (60, 78, 90)
+
+    img = vertical_gradient((24, 32, 38), (42, 58, 68))
+    draw = ImageDraw.Draw(img, "RGBA")
+
+    # Faded clock face, upper right, pointing at ~10:10 (RGB canvas + RGBA draw: blended).
+    cx, cy, radius, alpha = W - 220, H // 2 - 20, 260, 18
+    for w in range(2):
+        draw.ellipse([cx - radius - w, cy - radius - w, cx + radius + w, cy + radius + w],
+                     outline=WHITE + (alpha,))
+    for h in range(12):
+        angle = math.radians(h * 30 - 90)
+        inner, outer = radius - 20, radius - 6
+        draw.line(
+            [(cx + int(inner * math.cos(angle)), cy + int(inner * math.sin(angle))),
+             (cx + int(outer * math.cos(angle)), cy + int(outer * math.sin(angle)))],
+            fill=WHITE + (alpha + 6,), width=3 if h % 3 == 0 else 1,
+        )
+    for degrees, length, width in ((60, 0.72, 2), (300, 0.48, 3)):
+        angle = math.radians(degrees - 90)
+        draw.line(
+            [(cx, cy), (cx + int(radius * length * math.cos(angle)), cy + int(radius * length * math.sin(angle)))],
+            fill=WHITE + (alpha + 4,), width=width,
+        )
+    draw.ellipse([cx - 4, cy - 4, cx + 4, cy + 4], fill=WHITE + (alpha + 8,))
+
+    left, right = 72, W - 72
+    bar_lbl = font(SANS, 18)
+
+    draw.text((left, 42), "TimeCost", fill=GOLD, font=font(SANS_BOLD, 26))
+    draw.line([(left, 82), (left + 120, 82)], fill=GOLD, width=2)
+    draw.text((left, 108), "A week in Paris", fill=WHITE, font=font(SANS_BOLD, 48))
+    price, price_font = "£2,200  =  ", font(SANS_BOLD, 34)
+    draw.text((left, 172), price, fill=GOLD, font=price_font)
+    after = draw.textbbox((left, 172), price, font=price_font)[2]
+    draw.text((after, 172), "146 hours of your life", fill=WHITE, font=price_font)
+
+    draw.line([(left, 228), (right, 228)], fill=RULE, width=1)
+    draw.text((left, 250), "While you work 146 hours, they work...", fill=MUTED, font=font(SANS, 20))
+
+    bars = [
+        ("Elon Musk", "0.05s", 1.0),
+        ("Jeff Bezos", "0.09s", 0.40),
+        ("Mark Zuckerberg", "0.10s", 0.53),
+        ("Bill Gates", "0.19s", 0.07),
+        ("You", "146h 40m", None),
+    ]
+    bar_x = left + 180
+    bar_w, bar_h = (right - 80) - bar_x, 24
+    for i, (name, time_str, pct) in enumerate(bars):
+        y = 290 + i * 52
+        name_w = draw.textlength(name, font=bar_lbl)
+        draw.text((bar_x - 16 - name_w, y + 2), name, fill=MUTED if pct is not None else GOLD, font=bar_lbl)
+        draw.rounded_rectangle([bar_x, y, bar_x + bar_w, y + bar_h], radius=4, fill=BAR_BG)
+        if pct is not None:
+            fill_w = max(8, int(bar_w * pct))
+            draw.rounded_rectangle([bar_x, y, bar_x + fill_w, y + bar_h], radius=4, fill=BAR_FG)
+            draw.text((bar_x + fill_w + 10, y + 1), time_str, fill=WHITE, font=bar_lbl)
+        else:
+            draw.rounded_rectangle([bar_x, y, bar_x + 4, y + bar_h], radius=2, fill=BAR_YOU)
+            draw.text((bar_x + 16, y + 1), time_str, fill=GOLD, font=bar_lbl)
+
+    bot_y = H - 56
+    draw.line([(left, bot_y - 16), (right, bot_y - 16)], fill=RULE, width=1)
+    draw.text((left, bot_y), "Time is the real currency", fill=SOFT, font=font(SANS, 22))
+    draw.text((right, bot_y + 4), "thetimecost.com", fill=GOLD, font=font(SANS, 18), anchor="ra")
+    return img
+
+
+def celebration() -> Image.Image:
+    """static/og-celebration.png: /celebration's phosphor-CRT party, credits underneath."""
+    GREEN, DIMGREEN, FAINT = (124, 252, 122), (108, 170, 128), (90, 130, 102)
+    CYAN, AMBER, PINK, GOLD = (79, 209, 255), (255, 211, 77), (255, 59, 107), (255, 196, 60)
+
+    img = Image.new("RGBA", SIZE, (5, 7, 10, 255))
+    img = glow_ellipse(img, [-160, -240, 760, 320], (38, 120, 60, 90), 130)
+    d = ImageDraw.Draw(img)
+
+    glow_text(img, d, (58, 44), "> PROSPERITY-OS v1.0  -  ONLINE", font(MONO, 22), DIMGREEN,
+              glow_rgb=(40, 110, 60), blur=6)
+    headline = font(MONO_BOLD, 82)
+    glow_text(img, d, (56, 122), "SEND ELON", headline, GREEN, glow_rgb=(40, 160, 70), blur=11)
+    glow_text(img, d, (56, 214), "TO MARS.", headline, GREEN, glow_rgb=(40, 160, 70), blur=11)
+    d.text((58, 320), "he reached a trillion - it's the least we can do.", font=font(MONO, 25), fill=DIMGREEN + (255,))
+    d.text((58, 356), "press the button. then read who paid for the trip.", font=font(MONO, 22), fill=FAINT + (255,))
+
+    def burst(cx, cy, color, r=30, n=14):
+        sparks = [(cx + math.cos(2 * math.pi * i / n) * r, cy + math.sin(2 * math.pi * i / n) * r) for i in range(n)]
+
+        def paint(sd, dx, dy):
+            for x, y in sparks:
+                sd.ellipse([x - 5 + dx, y - 5 + dy, x + 5 + dx, y + 5 + dy], fill=color + (255,))
+
+        halo(img, paint, (cx - r - 5, cy - r - 5, cx + r + 5, cy + r + 5), 4)
+        for x, y in sparks:
+            d.ellipse([x - 2.5, y - 2.5, x + 2.5, y + 2.5], fill=color + (255,))
+        d.ellipse([cx - 3, cy - 3, cx + 3, cy + 3], fill=color + (255,))
+
+    burst(900, 120, GOLD, r=34)
+    burst(1050, 210, PINK, r=26)
+    burst(770, 230, CYAN, r=22)
+    burst(1110, 95, GREEN, r=20)
+
+    # The escape rocket as a Jeff Koons balloon dog (chrome + gold, glossy).
+    def soft_ellipse(bbox, rgba):
+        layer = Image.new("RGBA", SIZE, (0, 0, 0, 0))
+        ImageDraw.Draw(layer).ellipse(bbox, fill=rgba)
+        img.alpha_composite(layer)
+
+    def gloss(bbox, fill, edge):
+        d.ellipse(bbox, fill=fill, outline=edge, width=3)
+        x0, y0, x1, y1 = bbox
+        w, h = x1 - x0, y1 - y0
+        soft_ellipse([x0 + w * 0.16, y0 + h * 0.10, x0 + w * 0.50, y0 + h * 0.44], (255, 255, 255, 150))
+
+    cx, top = 1010, 150
+    CHROME, CEDGE, GEDGE = (205, 213, 221), (108, 116, 124), (150, 108, 20)
+    d.polygon([(cx - 16, top + 210), (cx, top + 286), (cx + 16, top + 210)], fill=GOLD)
+    d.polygon([(cx - 9, top + 210), (cx, top + 262), (cx + 9, top + 210)], fill=(255, 122, 26))
+    gloss([cx - 58, top + 182, cx - 22, top + 214], GOLD, GEDGE)
+    gloss([cx + 22, top + 182, cx + 58, top + 214], GOLD, GEDGE)
+    gloss([cx - 46, top + 92, cx + 46, top + 208], CHROME, CEDGE)
+    soft_ellipse([cx + 8, top + 110, cx + 32, top + 176], (255, 106, 213, 70))
+    soft_ellipse([cx - 30, top + 118, cx - 10, top + 170], (94, 200, 255, 60))
+    gloss([cx - 22, top + 74, cx + 22, top + 98], GOLD, GEDGE)
+    gloss([cx - 36, top + 8, cx + 36, top + 96], CHROME, CEDGE)
+    gloss([cx - 34, top - 22, cx - 12, top + 18], GOLD, GEDGE)
+    gloss([cx + 12, top - 22, cx + 34, top + 18], GOLD, GEDGE)
+    gloss([cx - 16, top - 18, cx + 16, top + 30], GOLD, GEDGE)
+    d.ellipse([cx - 3, top + 34, cx + 19, top + 56], fill=(127, 214, 255), outline=(202, 161, 58), width=3)
+    soft_ellipse([cx + 1, top + 37, cx + 8, top + 44], (255, 255, 255, 200))
+    d.ellipse([cx - 13, top + 130, cx + 13, top + 156], fill=GOLD, outline=GEDGE, width=2)
+    d.text((cx, top + 143), "$", font=font(MONO_BOLD, 20), fill=(122, 92, 0), anchor="mm")
+
+    glow_text(img, d, (952, 250), "thanks, elon ↗", font(MONO, 22), AMBER, anchor="ra",
+              glow_rgb=(120, 90, 20), blur=6)
+
+    # The somber credit twist along the bottom.
+    d.line([(58, 486), (1142, 486)], fill=GREEN + (70,), width=1)
+    d.text((58, 506), "WHILE THE FIREWORKS ARE STILL WARM, THE CREDITS ROLL:", font=font(MONO, 21), fill=FAINT + (255,))
+    glow_text(img, d, (58, 538), "USAID · PEPFAR · MALARIA · CHILD NUTRITION", font(MONO_BOLD, 23), GREEN,
+              glow_rgb=(40, 130, 60), blur=6)
+    d.text((58, 572), "sourced, projected deaths from the funding cuts", font=font(MONO, 20), fill=FAINT + (255,))
+    d.text((1142, 576), "thetimecost.com/SendElonToSpace", font=font(MONO, 22), fill=AMBER + (255,), anchor="ra")
+
+    img = scanlines(img, every=3, alpha=60)
+    img = vignette(img, (0, 0, 0, 200), width=110, radius=70)
+    return img.convert("RGB")
+
+
+def trillionaire() -> Image.Image:
+    """static/og-trillionaire.png: Warhol pop tiles on a spotlit Caravaggio stage."""
+    INK, CREAM, GOLD = (20, 16, 12), (247, 236, 214), (255, 207, 92)
+    PINK, BLUE, YELLOW = (255, 45, 149), (45, 140, 255), (255, 212, 0)
+
+    img = Image.new("RGBA", SIZE, (11, 8, 5, 255))
+    img = glow_ellipse(img, [180, -200, 1020, 380], (255, 198, 108, 95), 135)
+    img = vignette(img, (0, 0, 0, 160), width=120, radius=70)
+    d = ImageDraw.Draw(img)
+
+    d.text((W // 2, 34), "trillionaire time", font=font(SCRIPT, 48), fill=GOLD, anchor="ma")
+
+    def title(cx, y, text, size):
+        f = font(IMPACT, size)
+        d.text((cx + 6, y + 7), text, font=f, fill=BLUE, anchor="ma")
+        d.text((cx + 3, y + 3), text, font=f, fill=PINK, anchor="ma")
+        d.text((cx, y), text, font=f, fill=(255, 246, 230), anchor="ma")
+
+    title(W // 2, 86, "YOU BUY MILK.", 84)
+    title(W // 2, 168, "THEY BUY THE BLOCK.", 84)
+
+    def bendots(x0, y0, x1, y1):
+        for yy in range(y0 + 10, y1, 16):
+            for xx in range(x0 + 10, x1, 16):
+                d.ellipse([xx - 2, yy - 2, xx + 2, yy + 2], fill=(0, 0, 0, 45))
+
+    def milk(cx, cy):
+        d.rounded_rectangle([cx - 38, cy - 18, cx + 38, cy + 56], radius=8, fill=CREAM, outline=INK, width=4)
+        d.polygon([(cx - 38, cy - 18), (cx, cy - 54), (cx + 38, cy - 18)], fill=CREAM, outline=INK)
+        d.line([(cx, cy - 54), (cx, cy - 18)], fill=INK, width=3)
+
+    def egg(cx, cy):
+        d.ellipse([cx - 34, cy - 44, cx + 34, cy + 48], fill=CREAM, outline=INK, width=4)
+
+    def bread(cx, cy):
+        d.rounded_rectangle([cx - 50, cy - 22, cx + 50, cy + 40], radius=26, fill=(232, 196, 122), outline=INK, width=4)
+        for off in (-22, 0, 22):
+            d.line([(cx + off - 6, cy - 14), (cx + off + 6, cy + 30)], fill=INK, width=3)
+
+    tiles = [(PINK, milk), (BLUE, egg), (YELLOW, bread)]
+    tw, gap = 200, 44
+    total = len(tiles) * tw + (len(tiles) - 1) * gap
+    x0, ty = (W - total) // 2, 270
+    for i, (color, icon) in enumerate(tiles):
+        x = x0 + i * (tw + gap)
+        d.rounded_rectangle([x, ty, x + tw, ty + tw], radius=20, fill=color, outline=INK, width=5)
+        bendots(x, ty, x + tw, ty + tw)
+        icon(x + tw // 2, ty + tw // 2)
+
+    # Engelbreit checkerboard ribbon, with cherries tucked by it.
+    cs, ry = 18, ty + tw + 22
+    for i, x in enumerate(range(x0, x0 + total, cs)):
+        d.rectangle([x, ry, x + cs, ry + cs], fill=INK if i % 2 == 0 else CREAM)
+    cx, cy = x0 - 6, ry + 6
+    d.line([(cx, cy - 22), (cx + 10, cy - 34)], fill=(60, 120, 40), width=4)
+    d.line([(cx + 18, cy - 20), (cx + 10, cy - 34)], fill=(60, 120, 40), width=4)
+    d.ellipse([cx - 11, cy - 11, cx + 11, cy + 11], fill=(214, 38, 60), outline=INK, width=2)
+    d.ellipse([cx + 7, cy - 9, cx + 29, cy + 13], fill=(214, 38, 60), outline=INK, width=2)
+
+    d.text((W // 2, ry + 34), "The minutes you work for a loaf of bread? They earn dozens of homes.",
+           font=font(ARIAL_BOLD, 25), fill=CREAM, anchor="ma")
+    d.text((W // 2, ry + 74), "thetimecost.com / trillionaire", font=font(ARIAL, 22), fill=GOLD, anchor="ma")
+    return img.convert("RGB")
+
+
+# static/ file name -> card
+CARDS = {
+    "og-image.png": landing,
+    "og-celebration.png": celebration,
+    "og-trillionaire.png": trillionaire,
+}
+
+
+def result_card(item: str, human: str, earns_line: str, region_label: str) -> Image.Image:
+    """/og/result.png: what one priced item costs in work time (landing card's look)."""
+    GOLD, WHITE, MUTED, SOFT, RULE = (242, 210, 143), (255, 255, 255), (160, 175, 185), (120, 140, 150), (60, 78, 90)
+
+    img = vertical_gradient((24, 32, 38), (42, 58, 68))
+    draw = ImageDraw.Draw(img, "RGBA")
+    left, right = 72, W - 72
+
+    draw.text((left, 42), "TimeCost", fill=GOLD, font=font(SANS_BOLD, 26))
+    draw.line([(left, 82), (left + 120, 82)], fill=GOLD, width=2)
+    draw.text((right, 46), region_label, fill=SOFT, font=font(SANS, 20), anchor="ra")
+
+    # Shrink long item names to fit the line rather than clipping them.
+    size = 64
+    while size > 32 and draw.textlength(item, font=font(SANS_BOLD, size)) > right - left:
+        size -= 4
+    draw.text((left, 128), item, fill=WHITE, font=font(SANS_BOLD, size))
+    draw.text((left, 228), "costs", fill=MUTED, font=font(SANS, 30))
+    draw.text((left, 270), human, fill=GOLD, font=font(SANS_BOLD, 84))
+    draw.text((left, 376), "of work.", fill=MUTED, font=font(SANS, 30))
+
+    draw.line([(left, 440), (right, 440)], fill=RULE, width=1)
+    draw.text((left, 462), earns_line, fill=WHITE, font=font(SANS, 26))
+
+    bot_y = H - 56
+    draw.line([(left, bot_y - 16), (right, bot_y - 16)], fill=RULE, width=1)
+    draw.text((left, bot_y), "Time is the real currency", fill=SOFT, font=font(SANS, 22))
+    draw.text((right, bot_y + 4), "thetimecost.com", fill=GOLD, font=font(SANS, 18), anchor="ra")
+    return img
+
+
+# ----------------------------
+# Disk cache
+# ----------------------------
+# A render is ~200 ms of CPU, so misses are bounded: at most RENDER_SLOTS run at
+# once per worker, and a miss that finds them all busy gets RenderBusy (the
+# route answers 503) instead of queueing. Requests for the same card wait on
+# that card's lock for the first render, then read its file.
+RENDER_SLOTS = max(1, int(os.environ.get("OG_RENDER_SLOTS") or 2))
+_render_slots = threading.BoundedSemaphore(RENDER_SLOTS)
+_key_locks: dict[str, threading.Lock] = {}
+_key_locks_guard = threading.Lock()
+
+
+class RenderBusy(Exception):
+    """Every render slot in this worker is taken; retry shortly."""
+
+
+def _off_loop(fn):
+    """fn() run where it can't stall other requests: under gevent, in the hub's
+    threadpool (a real OS thread); on thread workers, right here."""
+    monkey = sys.modules.get("gevent.monkey")
+    if monkey and monkey.is_module_patched("threading"):
+        import gevent
+
+        return gevent.get_hub().threadpool.apply(fn)
+    return fn()
+
+
+def card_key(card: str, *inputs) -> str:
+    """Content address of a card: a hash of its (normalised) inputs."""
+    raw = json.dumps([CARD_VERSION, card, *inputs], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def _read(path: str) -> bytes | None:
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    try:
+        os.utime(path)  # mark as recently served, for eviction
+    except OSError:
+        pass
+    return data
+
+
+def _evict(keep: str) -> None:
+    """Drop the least recently served cards until the cache fits CACHE_MAX_BYTES."""
+    entries = []
+    for e in os.scandir(CACHE_DIR):
+        if e.name.endswith(".png") and e.path != keep:
+            try:
+                st = e.stat()
+            except FileNotFoundError:  # another worker evicted it
+                continue
+            entries.append((st.st_mtime, st.st_size, e.path))
+    total = sum(size for _, size, _ in entries) + os.path.getsize(keep)
+    for _, size, path in sorted(entries):
+        if total <= CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def cached_png(key: str, render) -> bytes:
+    """PNG bytes for `key`, rendering (via render() -> Image) only on a miss.
+
+    Raises RenderBusy when the card isn't cached and no render slot is free.
+    Files are written to a temp name and renamed into place, so workers never
+    read a half-written card.
+    """
+    path = os.path.join(CACHE_DIR, key + ".png")
+    data = _read(path)
+    if data is not None:
+        return data
+    with _key_locks_guard:
+        lock = _key_locks.setdefault(key, threading.Lock())
+    with lock:
+        try:
+            data = _read(path)
+            if data is not None:
+                return data
+            if not _render_slots.acquire(blocking=False):
+                raise RenderBusy(key)
+            try:
+                data = _off_loop(lambda: encode_png(render()))
+            finally:
+                _render_slots.release()
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            _evict(keep=path)
+        finally:
+            # Whoever still waits on this lock finds the file (or retries the
+            # render); later requests start from the file.
+            with _key_locks_guard:
+                _key_locks.pop(key, None)
+    return data
@@ -1,3 +1,4 @@
+import json
 import os
 import sqlite3
 import hashlib
@@ -107,6 +108,15 @@ def populate_dummy_data():
             INSERT INTO expenses (name, amount, category, scope, owner_key)
             VALUES ({placeholder}, {placeholder}, {placeholder}, 'personal', {placeholder})
         """, (name, amount, cat, "JohnnyRose"))
+    # Inserted directly, so rewrite the owner's summary row (core/expenses.py) too.
+    by_category = {}
+    for _name, amount, cat in expenses:
+        by_category[cat] = by_category.get(cat, 0.0) + amount
+    cursor.execute(f"DELETE FROM expense_summaries WHERE owner_key = {placeholder}", ("JohnnyRose",))
+    cursor.execute(f"""
+        INSERT INTO expense_summaries (owner_key, total, by_category)
+        VALUES ({placeholder}, {placeholder}, {placeholder})
+    """, ("JohnnyRose", sum(by_category.values()), json.dumps(by_category)))
 
     # 4. Freelance
     cursor.execute(f"DELETE FROM freelance_entries WHERE owner_key = {placeholder}", ("JohnnyRose",))
@@ -125,6 +135,14 @@ def populate_dummy_data():
                 INSERT INTO freelance_entries (owner_key, work_date, entry_date, client, hours, hourly_rate, notes)
                 VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
             """, ("JohnnyRose", d, d, client, hours, rate, notes))
+    # Inserted directly, so refresh the daily rollup (core/freelance.py) too.
+    cursor.execute(f"DELETE FROM freelance_daily WHERE owner_key = {placeholder}", ("JohnnyRose",))
+    cursor.execute(f"""
+        INSERT INTO freelance_daily (owner_key, work_date, client, hours, earned, entries)
+        SELECT owner_key, work_date, client, SUM(hours), SUM(hours * hourly_rate), COUNT(*)
+        FROM freelance_entries WHERE owner_key = {placeholder}
+        GROUP BY owner_key, work_date, client
+    """, ("JohnnyRose",))
 
     # 5. Goals
     cursor.execute(f"DELETE FROM goals WHERE owner_key = {placeholder}", ("JohnnyRose",))
@@ -0,0 +1,99 @@
+"""Opt-in request profiling for production.
+
+`init_profiling(app)` wraps blueprint requests in cProfile when either
+  - the request carries `X-Profile: <ADMIN_KEY>` (profile this one request), or
+  - a PROFILE_SAMPLE_RATE fraction of requests is drawn at random,
+and writes each profile to PROFILE_DIR/<endpoint>/<time>-<pid>.prof, keeping
+the newest PROFILE_KEEP files per endpoint. scripts/profile_report.py merges
+them into a report of the hot functions in the route modules.
+
+Nothing is profiled unless ADMIN_KEY is set. One profile runs at a time per
+process, because only one profiler can be active: from Python 3.12 cProfile
+sits on sys.monitoring, which admits a single profiling tool per process (a
+second enable() raises ValueError), and before that a second profiler on the
+same thread would silently replace the first's hook. Requests that arrive
+meanwhile are simply not profiled. Nor is a profile scoped to its request:
+under the gevent worker, work other greenlets do while the profiled request
+waits is counted in it too (from 3.12, so is work on other threads).
+
+Configuration (env):
+  PROFILE_DIR          where profiles go (default: <tmp>/timecost-profiles)
+  PROFILE_SAMPLE_RATE  fraction of requests to profile, 0-1 (default 0: header only)
+  PROFILE_KEEP         profiles kept per endpoint (default 50)
+"""
+from __future__ import annotations
+
+import cProfile
+import hmac
+import os
+import random
+import tempfile
+import threading
+import time
+
+from flask import Flask, g, request
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_DIR = os.environ.get("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "timecost-profiles")
+
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+SAMPLE_RATE = min(max(_float_env("PROFILE_SAMPLE_RATE", 0.0), 0.0), 1.0)
+KEEP = max(1, int(_float_env("PROFILE_KEEP", 50)))
+
+_busy = threading.Lock()
+
+
+def _wanted() -> bool:
+    admin_key = os.environ.get("ADMIN_KEY", "")
+    if not admin_key or not request.blueprint:
+        return False
+    header = request.headers.get(PROFILE_HEADER)
+    if header is not None:
+        return hmac.compare_digest(header.encode(), admin_key.encode())
+    return SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE
+
+
+def _save(profiler: cProfile.Profile, endpoint: str) -> None:
+    folder = os.path.join(PROFILE_DIR, endpoint)
+    os.makedirs(folder, exist_ok=True)
+    profiler.dump_stats(os.path.join(folder, f"{time.time():.6f}-{os.getpid()}.prof"))
+
+    # Rotation: names start with the timestamp, so they sort oldest first.
+    names = sorted(n for n in os.listdir(folder) if n.endswith(".prof"))
+    for name in names[:-KEEP]:
+        try:
+            os.remove(os.path.join(folder, name))
+        except FileNotFoundError:  # another worker rotated it
+            pass
+
+
+def init_profiling(app: Flask) -> None:
+    """Register the hooks. Call before other before_request hooks are added,
+    so their time is part of the profile."""
+
+    @app.before_request
+    def _start_profile():
+        if not _wanted() or not _busy.acquire(blocking=False):
+            return
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+    @app.teardown_request
+    def _finish_profile(_exc):
+        profiler = g.pop("profiler", None)
+        if profiler is None:
+            return
+        profiler.disable()
+        try:
+            _save(profiler, request.endpoint or "unknown")
+        except OSError as e:
+            app.logger.warning("Could not write profile: %s", e)
+        finally:
+            _busy.release()
@@ -0,0 +1,69 @@
+"""Throughput benchmark: batch /api/v1/time-cost vs. one /calculate POST per item.
+
+Drives the app in-process through Flask's test client, so the numbers measure
+our Python (routing, finance math, JSON/HTML rendering) without network noise.
+
+Run: python scripts/bench_time_cost_api.py [--items 500] [--rounds 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from app import app  # noqa: E402
+
+
+def _prices(n: int) -> list[float]:
+    rng = random.Random(42)
+    return [round(rng.uniform(0.5, 2500), 2) for _ in range(n)]
+
+
+def bench_batch(client, prices, rounds: int) -> float:
+    body = {"wage": 20, "wage_type": "hourly", "currency": "£", "items": prices}
+    start = time.perf_counter()
+    for _ in range(rounds):
+        r = client.post("/api/v1/time-cost", json=body)
+        assert r.status_code == 200, r.data
+    return (len(prices) * rounds) / (time.perf_counter() - start)
+
+
+def bench_form(client, prices, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for p in prices:
+            r = client.post(
+                "/calculate",
+                data={"itemCost": str(p), "wageAmount": "20", "wageType": "hourly"},
+            )
+            assert r.status_code == 200
+    return (len(prices) * rounds) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--items", type=int, default=500)
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args()
+
+    app.config["TESTING"] = True
+    client = app.test_client()
+    prices = _prices(args.items)
+
+    # Warm-up (template compile, first DB connection).
+    client.post("/api/v1/time-cost", json={"wage": 20, "items": prices[:5]})
+    client.post("/calculate", data={"itemCost": "1", "wageAmount": "20", "wageType": "hourly"})
+
+    batch = bench_batch(client, prices, args.rounds)
+    form = bench_form(client, prices, max(1, args.rounds // 5))
+
+    print(f"items/request : {args.items}")
+    print(f"batch API     : {batch:10.0f} items/s")
+    print(f"/calculate    : {form:10.0f} items/s")
+    print(f"speed-up      : {batch / form:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
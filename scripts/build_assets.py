@@ -0,0 +1,30 @@
+"""Build fingerprinted + precompressed static assets for deploy.
+
+Writes static/dist/ and dinaro/static/dist/ (hashed copies, .gz/.br variants and
+a manifest.json each). The app picks the manifests up at runtime; without them
+it serves the plain files, so this is only needed for production images.
+
+Run: python scripts/build_assets.py
+"""
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+from assets import build_static_folder  # noqa: E402
+
+FOLDERS = [
+    os.path.join(ROOT, "static"),
+    os.path.join(ROOT, "dinaro", "static"),
+]
+
+
+def main() -> None:
+    for folder in FOLDERS:
+        manifest = build_static_folder(folder)
+        print(f"{os.path.relpath(folder, ROOT)}: {len(manifest)} assets")
+
+
+if __name__ == "__main__":
+    main()
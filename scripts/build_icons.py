@@ -0,0 +1,68 @@
+"""Build static/icons.svg: a sprite of just the Lucide icons our templates use.
+
+Scans templates/ and dinaro/templates/ (subfolders included) for icon("name")
+calls, and the icon argument of the dashboard's lazy_section(...) macro, and
+writes one <symbol id="name"> per icon, taken from the `lucide` package's SVG set. Re-run
+after adding an icon to a template (test_assets.py fails until you do).
+
+Run:  pip install lucide && python scripts/build_icons.py
+Output: static/icons.svg
+"""
+import glob
+import os
+import re
+import sys
+from importlib.resources import files
+from zipfile import ZipFile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+TEMPLATE_DIRS = ["templates", os.path.join("dinaro", "templates")]
+OUT = os.path.join(ROOT, "static", "icons.svg")
+
+ICON_CALL = re.compile(r"""icon\(\s*["']([a-z0-9-]+)["']""")
+# lazy_section(name, title, icon_name, ...) passes its icon on to icon().
+LAZY_SECTION_ICON = re.compile(
+    r"""lazy_section\(\s*("[^"]*"|'[^']*')\s*,\s*("[^"]*"|'[^']*')\s*,\s*["']([a-z0-9-]+)["']"""
+)
+SVG_NS = "http://www.w3.org/2000/svg"
+SVG_VIEWBOX = re.compile(r'viewBox="([^"]+)"')
+SVG_BODY = re.compile(r"<svg[^>]*>(.*)</svg>", re.S)
+
+
+def used_icons() -> list[str]:
+    names = set()
+    for d in TEMPLATE_DIRS:
+        for path in glob.glob(os.path.join(ROOT, d, "**", "*.html"), recursive=True):
+            with open(path, encoding="utf-8") as f:
+                html = f.read()
+            names.update(ICON_CALL.findall(html))
+            names.update(m[2] for m in LAZY_SECTION_ICON.findall(html))
+    return sorted(names)
+
+
+def symbol(zf: ZipFile, name: str) -> str:
+    svg = zf.read(f"{name}.svg").decode("utf-8")
+    view_box = SVG_VIEWBOX.search(svg)
+    body = SVG_BODY.search(svg).group(1)
+    body = re.sub(r">\s+<", "><", body.strip())
+    return f'<symbol id="{name}" viewBox="{view_box.group(1) if view_box else "0 0 24 24"}">{body}</symbol>'
+
+
+def main() -> None:
+    names = used_icons()
+    with ZipFile(files("lucide").joinpath("lucide.zip").open("rb")) as zf:
+        missing = [n for n in names if f"{n}.svg" not in zf.namelist()]
+        if missing:
+            sys.exit(f"Unknown Lucide icon(s): {', '.join(missing)}")
+        symbols = [symbol(zf, n) for n in names]
+
+    with open(OUT, "w", encoding="utf-8") as f:
+        f.write(f'<svg xmlns="{SVG_NS}">\n')
+        f.write("<!-- Generated by scripts/build_icons.py from Lucide (ISC licence). -->\n")
+        f.write("\n".join(symbols))
+        f.write("\n</svg>\n")
+    print(f"{os.path.relpath(OUT, ROOT)}: {len(names)} icons")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Build the Open Graph share images in static/ (see ogimage.py for the cards).
+
+Renders every card (or just the ones named) and writes it as an optimized
+palette PNG. --recompress skips rendering and re-encodes the existing files
+instead, e.g. a PNG a designer dropped into static/ by hand.
+
+Run:    python scripts/build_og_images.py [og-image.png ...]
+Output: static/og-*.png
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+from PIL import Image  # noqa: E402
+
+from ogimage import CARDS, STATIC_DIR, save_png  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", metavar="NAME", help=f"cards to build (default: all of {', '.join(CARDS)})")
+    parser.add_argument("--recompress", action="store_true", help="re-encode the existing files instead of rendering")
+    args = parser.parse_args()
+
+    unknown = [n for n in args.names if n not in CARDS]
+    if unknown:
+        sys.exit(f"Unknown card(s): {', '.join(unknown)}")
+
+    for name in args.names or CARDS:
+        path = os.path.join(STATIC_DIR, name)
+        before = os.path.getsize(path) if os.path.exists(path) else 0
+        started = time.perf_counter()
+        if args.recompress:
+            with Image.open(path) as existing:
+                img = existing.convert("RGB")
+        else:
+            img = CARDS[name]()
+        size = save_png(img, path)
+        print(f"static/{name}: {before / 1024:.0f} KB -> {size / 1024:.0f} KB "
+              f"({(time.perf_counter() - started) * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Rebalance Dinaro shards: move one family (and its linked classes) to another shard.
+
+Needs the same DINARO_SHARDS / DINARO_DATABASE_URL / DATABASE_URL as the app.
+See dinaro/rebalance.py for what a move does and when to run it.
+
+Run:  python scripts/dinaro_move_family.py --list
+      python scripts/dinaro_move_family.py FAMILY_CODE TARGET_SHARD [--dry-run]
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+from dinaro.db import SHARD_CACHE_SECONDS, SHARDED, init_dinaro_db, shard_names  # noqa: E402
+from dinaro.rebalance import DRAIN_SECONDS, move_family, shard_family_counts  # noqa: E402
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("family_code", nargs="?")
+    ap.add_argument("target", nargs="?", choices=shard_names())
+    ap.add_argument("--list", action="store_true", help="families per shard")
+    ap.add_argument("--dry-run", action="store_true", help="count the rows, change nothing")
+    ap.add_argument("--settle-seconds", type=float, default=SHARD_CACHE_SECONDS,
+                    help="wait between flipping the map and deleting the source rows")
+    ap.add_argument("--drain-seconds", type=float, default=DRAIN_SECONDS,
+                    help="wait between freezing the family's writes and copying it")
+    args = ap.parse_args()
+
+    if not SHARDED:
+        sys.exit("DINARO_SHARDS is not set: there is only one shard")
+    init_dinaro_db()  # make sure every shard (and the map) has the tables
+
+    if args.list:
+        for name, count in shard_family_counts().items():
+            print(f"{name:20s} {count:8d} families")
+        return
+    if not args.family_code or not args.target:
+        ap.error("FAMILY_CODE and TARGET_SHARD are required (or --list)")
+
+    try:
+        counts = move_family(args.family_code.strip().upper(), args.target,
+                             settle_seconds=args.settle_seconds, drain_seconds=args.drain_seconds,
+                             dry_run=args.dry_run)
+    except (ValueError, RuntimeError) as e:
+        sys.exit(str(e))
+    for table, n in counts.items():
+        if n:
+            print(f"{table:25s} {n:8d}")
+    print("dry run: nothing moved" if args.dry_run else f"moved to {args.target}")
+
+
+if __name__ == "__main__":
+    main()
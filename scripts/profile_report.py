@@ -0,0 +1,101 @@
+"""Merge the request profiles written by profiling.py into one report.
+
+Prints, across every endpoint (or the ones matching --endpoint):
+  - how many profiles each endpoint contributed;
+  - the hottest functions overall, by own time (tottime);
+  - the hottest functions in the route modules (core.routes, dinaro.routes,
+    couples.routes by default), by cumulative time - i.e. which views and
+    view helpers the sampled requests spent their time under.
+
+Copy PROFILE_DIR off the machine first if you like (fly ssh sftp get ...);
+the .prof files are plain pstats dumps.
+
+Run: python scripts/profile_report.py [--dir PROFILE_DIR] [--endpoint core.] [--limit 25]
+"""
+import argparse
+import glob
+import os
+import pstats
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+from profiling import PROFILE_DIR  # noqa: E402
+
+ROUTE_MODULES = ["core.routes", "dinaro.routes", "couples.routes"]
+
+
+def load(profile_dir: str, endpoint_prefix: str = "") -> tuple[pstats.Stats | None, dict[str, int]]:
+    """All matching profiles merged into one Stats, plus profiles per endpoint."""
+    stats = None
+    counts: dict[str, int] = {}
+    for path in sorted(glob.glob(os.path.join(profile_dir, "*", "*.prof"))):
+        endpoint = os.path.basename(os.path.dirname(path))
+        if not endpoint.startswith(endpoint_prefix):
+            continue
+        try:
+            if stats is None:
+                stats = pstats.Stats(path)
+            else:
+                stats.add(path)
+        except (EOFError, TypeError, ValueError):  # half-written or rotated away mid-read
+            continue
+        counts[endpoint] = counts.get(endpoint, 0) + 1
+    return stats, counts
+
+
+def _where(func: tuple) -> str:
+    filename, line, name = func
+    if filename == "~":  # builtins: name is already "<built-in method ...>"
+        return name
+    return f"{os.path.relpath(filename, ROOT) if filename.startswith(os.path.abspath(ROOT)) else filename}:{line}({name})"
+
+
+def hot_functions(stats: pstats.Stats, modules: list[str] | None = None, key: str = "tottime",
+                  limit: int = 25) -> list[dict]:
+    """[{function, calls, tottime, cumtime}] sorted by `key`, optionally only
+    functions defined in `modules` (dotted names, e.g. "core.routes")."""
+    suffixes = tuple(os.sep + m.replace(".", os.sep) + ".py" for m in modules or [])
+    rows = []
+    for func, (_cc, calls, tottime, cumtime, _callers) in stats.stats.items():
+        if suffixes and not func[0].endswith(suffixes):
+            continue
+        rows.append({"function": _where(func), "calls": calls, "tottime": tottime, "cumtime": cumtime})
+    rows.sort(key=lambda r: r[key], reverse=True)
+    return rows[:limit]
+
+
+def _print_table(title: str, rows: list[dict]) -> None:
+    print(f"\n{title}")
+    print(f"{'calls':>9} {'tottime':>9} {'cumtime':>9}  function")
+    for r in rows:
+        print(f"{r['calls']:>9} {r['tottime']:>9.3f} {r['cumtime']:>9.3f}  {r['function']}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Aggregate request profiles into a hot-function report.")
+    ap.add_argument("--dir", default=PROFILE_DIR, help=f"profile directory (default: {PROFILE_DIR})")
+    ap.add_argument("--endpoint", default="", help="only endpoints starting with this, e.g. dinaro.")
+    ap.add_argument("--module", action="append", dest="modules",
+                    help=f"route module to break out (repeatable; default: {', '.join(ROUTE_MODULES)})")
+    ap.add_argument("--limit", type=int, default=25, help="rows per table")
+    args = ap.parse_args()
+
+    stats, counts = load(args.dir, args.endpoint)
+    if stats is None:
+        sys.exit(f"No profiles under {args.dir}")
+
+    print(f"{sum(counts.values())} profiles from {args.dir}")
+    for endpoint, n in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])):
+        print(f"{n:>6}  {endpoint}")
+
+    _print_table("Hottest functions overall (own time, seconds summed over all profiles)",
+                 hot_functions(stats, limit=args.limit))
+    modules = args.modules or ROUTE_MODULES
+    _print_table(f"Hottest route code ({', '.join(modules)}; cumulative time)",
+                 hot_functions(stats, modules, key="cumtime", limit=args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+(function () {
+  'use strict';
+
+  // Live parent dashboard: balances update in place, new chores, requests and
+  // enrollments are listed in the "Just now" panel (see dinaro/events.py), and
+  // the lazily loaded panels they affect are fetched again (dinaro-sections.js).
+  var feed = document.getElementById('liveFeed');
+  if (!feed || !('EventSource' in window)) return;
+
+  var list = feed.querySelector('[data-live-list]');
+  var source = new EventSource(feed.dataset.eventsUrl);
+
+  function notice(text) {
+    var li = document.createElement('li');
+    li.textContent = text;
+    list.appendChild(li);
+    feed.hidden = false;
+  }
+
+  function refresh(sections) {
+    document.dispatchEvent(new CustomEvent('dinaro:stale', { detail: sections }));
+  }
+
+  function on(kind, handler) {
+    source.addEventListener(kind, function (e) { handler(JSON.parse(e.data)); });
+  }
+
+  on('chore_logged', function (d) {
+    notice(d.child_name + ' finished ' + d.chore_title + ' (' + d.hours + ' hr)');
+  });
+
+  on('request_created', function (d) {
+    notice(d.child_name + ' wants ' + d.item_name + ' for ' + Number(d.offer).toFixed(2) + ' dinaro');
+    refresh(['requests']);
+  });
+
+  on('enrollment_pending', function (d) {
+    notice(d.name + ' asked to join the class');
+  });
+
+  on('balance_changed', function (d) {
+    Object.keys(d.balances).forEach(function (id) {
+      document.querySelectorAll('[data-kid-balance="' + id + '"]').forEach(function (el) {
+        el.textContent = Number(d.balances[id]).toFixed(2);
+      });
+    });
+    refresh(['history', 'goals', 'trends', 'analytics', 'treasury']);
+  });
+})();
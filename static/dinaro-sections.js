@@ -0,0 +1,88 @@
+(function () {
+  'use strict';
+
+  // The parent dashboard's heavy panels arrive after first paint: every
+  // [data-section] placeholder is fetched at once from its data-src
+  // (/dinaro/parent/section/<name>) and swapped for the real panel. A
+  // 'dinaro:stale' event (detail: section names) fetches those again, skipping
+  // the HTTP cache: the event can beat the write's data-version bump, and a
+  // revalidation in that gap would be answered 304 with the old panel.
+  var colors = ['#bc6c25', '#2ecc71', '#3498db', '#9b59b6', '#f1c40f', '#e67e22', '#e74c3c'];
+
+  function drawCharts(root) {
+    if (typeof Chart !== 'function') return;
+    root.querySelectorAll('canvas[data-chart]').forEach(function (canvas) {
+      var chartData = JSON.parse(canvas.dataset.chart);
+      var text = getComputedStyle(document.documentElement).getPropertyValue('--text').trim() || '#1f2a22';
+      new Chart(canvas.getContext('2d'), {
+        type: 'line',
+        data: {
+          labels: chartData.labels,
+          datasets: chartData.datasets.map(function (ds, i) {
+            return {
+              label: ds.label,
+              data: ds.data,
+              borderColor: colors[i % colors.length],
+              backgroundColor: colors[i % colors.length] + '22',
+              fill: true,
+              tension: 0.3
+            };
+          })
+        },
+        options: {
+          responsive: true,
+          maintainAspectRatio: false,
+          plugins: {
+            legend: { position: 'bottom', labels: { color: text } }
+          },
+          scales: {
+            x: { ticks: { color: text }, grid: { display: false } },
+            y: { ticks: { color: text }, beginAtZero: false }
+          }
+        }
+      });
+    });
+  }
+
+  function load(section, reload) {
+    section.setAttribute('aria-busy', 'true');
+    return fetch(section.dataset.src, { credentials: 'same-origin', cache: reload ? 'reload' : 'default' })
+      .then(function (res) {
+        if (!res.ok) throw new Error(res.status);
+        return res.text();
+      })
+      .then(function (html) {
+        var holder = document.createElement('template');
+        holder.innerHTML = html.trim();
+        var fresh = holder.content.firstElementChild;
+        if (!fresh) {
+          section.remove();  // e.g. a classroom-only panel
+          return;
+        }
+        section.replaceWith(fresh);
+        drawCharts(fresh);
+      })
+      .catch(function () {
+        section.removeAttribute('aria-busy');
+        var note = section.querySelector('[data-loading]');
+        if (note) note.textContent = 'Could not load this section. Refresh the page to try again.';
+      });
+  }
+
+  document.querySelectorAll('[data-section][data-src]').forEach(function (section) { load(section, false); });
+
+  var stale = {};
+  var timer = null;
+  document.addEventListener('dinaro:stale', function (e) {
+    e.detail.forEach(function (name) { stale[name] = true; });
+    clearTimeout(timer);
+    // Several events in a burst (a group reward credits every child) -> one refetch.
+    timer = setTimeout(function () {
+      Object.keys(stale).forEach(function (name) {
+        var section = document.querySelector('[data-section="' + name + '"]');
+        if (section && !section.hasAttribute('aria-busy')) load(section, true);
+      });
+      stale = {};
+    }, 300);
+  });
+})();
@@ -1,11 +1,13 @@
-const CACHE_NAME = 'timecost-cache-v5';
-// Precache only genuinely static, versioned assets. NOTE: do not list '/' here —
-// the old fetch handler matched it against every URL (every URL contains '/'),
-// which served the entire site stale-from-cache and hid fresh deploys.
-const ASSETS_TO_CACHE = [
-  '/static/favicon.svg',
-  'https://unpkg.com/lucide@latest'
-];
+// The /sw.js route (assets.py) prepends `self.__PRECACHE = {version, urls}`,
+// generated from the fingerprinted asset manifests, so every deploy with
+// changed assets gets a fresh cache name and precache list automatically.
+// Served raw (old /static/sw.js registrations) it falls back to no precache.
+const PRECACHE = self.__PRECACHE || { version: 'dev', urls: [] };
+const CACHE_NAME = 'timecost-' + PRECACHE.version;
+// NOTE: never precache '/' or other pages - HTML stays network-first so deploys
+// show up immediately (an old substring match on '/' once served the whole site
+// stale from cache).
+const ASSETS_TO_CACHE = PRECACHE.urls;
 
 self.addEventListener('install', (event) => {
   event.waitUntil(
@@ -41,25 +43,31 @@ self.addEventListener('fetch', (event) => {
     return;
   }
 
-  // Only the explicitly precached static assets use stale-while-revalidate,
-  // matched by exact URL (not substring) so '/' can't swallow everything.
+  // Hashed build output (/dist/<name>.<hash>.<ext>) never changes under the
+  // same URL, so serve it from cache at once and refresh in the background.
+  const url = new URL(event.request.url);
+  const isHashed = url.origin === self.location.origin && url.pathname.includes('/dist/');
   const isPrecached = ASSETS_TO_CACHE.some(asset => event.request.url === asset
     || event.request.url === new URL(asset, self.location.origin).href);
 
-  if (isPrecached) {
+  if (isHashed || isPrecached) {
     event.respondWith(
-      caches.match(event.request).then((cachedResponse) => {
-        const fetchPromise = fetch(event.request).then((networkResponse) => {
-          caches.open(CACHE_NAME).then((cache) => {
-            cache.put(event.request, networkResponse.clone());
+      caches.open(CACHE_NAME).then((cache) =>
+        cache.match(event.request).then((cachedResponse) => {
+          const fetchPromise = fetch(event.request).then((networkResponse) => {
+            if (networkResponse.ok) cache.put(event.request, networkResponse.clone());
+            return networkResponse;
           });
-          return networkResponse;
-        });
-        return cachedResponse || fetchPromise;
-      })
+          if (cachedResponse) {
+            event.waitUntil(fetchPromise.catch(() => {}));
+            return cachedResponse;
+          }
+          return fetchPromise;
+        })
+      )
     );
   } else {
-    // Everything else (CSS/JS with ?v= params, blueprint static, etc.):
+    // Everything else (unbuilt dev assets, blueprint static, etc.):
     // network-first, cache only as an offline fallback.
     event.respondWith(
       fetch(event.request).catch(() => caches.match(event.request))
@@ -0,0 +1,47 @@
+"""Jinja bytecode cache + optional template warm-up.
+
+Big templates (dinaro_parent_dashboard.html, trillionaire_credits.html, …) are
+otherwise parsed and compiled on the first request that touches them, in every
+worker. `init_templates(app)` points the app's Jinja environment - which also
+serves blueprint templates - at a filesystem bytecode cache shared by all
+workers on the machine, and can precompile everything at boot.
+
+Configuration (env):
+  JINJA_CACHE_DIR   bytecode cache directory (default: Jinja's per-user temp
+                    dir); set to "off" to disable the cache
+  TEMPLATE_WARMUP   "1" to compile every template before serving traffic
+"""
+from __future__ import annotations
+
+import os
+
+from flask import Flask
+from jinja2 import FileSystemBytecodeCache
+
+WARMUP_EXTENSIONS = ("html", "xml", "txt")
+
+
+def _truthy(val: str | None) -> bool:
+    return (val or "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def init_templates(app: Flask) -> None:
+    """Configure the bytecode cache (and warm-up). Call after every blueprint
+    is registered, so their template folders are visible to the loader."""
+    cache_dir = os.environ.get("JINJA_CACHE_DIR")
+    if cache_dir != "off":
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir or None)
+
+    if _truthy(os.environ.get("TEMPLATE_WARMUP")):
+        warm_templates(app)
+
+
+def warm_templates(app: Flask) -> int:
+    """Compile (or load from bytecode) every template; return how many."""
+    env = app.jinja_env
+    names = env.list_templates(extensions=WARMUP_EXTENSIONS)
+    for name in names:
+        env.get_template(name)
+    return len(names)
@@ -0,0 +1,57 @@
+"""Tests for the batch /api/v1/time-cost endpoint."""
+
+import pytest
+
+from app import app
+
+
+@pytest.fixture
+def client():
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+def test_batch_returns_one_result_per_item(client):
+    r = client.post(
+        "/api/v1/time-cost",
+        json={"wage": 20, "wage_type": "hourly", "currency": "$",
+              "items": [100, {"name": "Headphones", "price": 40}]},
+    )
+    assert r.status_code == 200
+    body = r.get_json()
+    assert body["count"] == 2
+    first, second = body["items"]
+    assert first["time_cost"]["total_hours"] == 5.0
+    assert first["workday_text"] == "about 0.6 workday"
+    assert len(first["billionaires"]) > 0
+    assert second["name"] == "Headphones"
+    assert second["time_cost"]["human"] == "2h"
+
+
+def test_bad_items_fail_individually(client):
+    r = client.post("/api/v1/time-cost", json={"wage": 20, "items": [10, "abc", -5]})
+    assert r.status_code == 200
+    oks = [i["ok"] for i in r.get_json()["items"]]
+    assert oks == [True, False, False]
+
+
+def test_non_finite_prices_fail_individually(client):
+    r = client.post("/api/v1/time-cost", data='{"wage": 20, "items": ["inf", "nan", 1e400, "1e400", 5]}',
+                    content_type="application/json")
+    assert r.status_code == 200
+    items = r.get_json()["items"]
+    assert [i["ok"] for i in items] == [False, False, False, False, True]
+    assert items[0]["error"] == "Invalid number."
+
+
+@pytest.mark.parametrize("body", [
+    None,
+    {"wage": 20, "items": []},
+    {"wage": 0, "items": [10]},
+    {"wage": "inf", "items": [10]},
+    {"wage": "nan", "items": [10]},
+    {"wage": 20, "items": [1] * 1001},
+])
+def test_invalid_requests_are_rejected(client, body):
+    r = client.post("/api/v1/time-cost", json=body)
+    assert r.status_code == 400
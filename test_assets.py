@@ -0,0 +1,57 @@
+"""Tests for fingerprinted static assets."""
+
+import glob
+import gzip
+import json
+import os
+import re
+import sys
+
+from assets import build_static_folder
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_build_hashes_and_precompresses(tmp_path):
+    (tmp_path / "app.css").write_text("body { color: red; }")
+    (tmp_path / "sw.js").write_text("self.addEventListener('fetch', () => {});")
+
+    manifest = build_static_folder(str(tmp_path))
+
+    hashed = manifest["app.css"]
+    assert hashed.startswith("dist/app.") and hashed.endswith(".css")
+    assert "sw.js" not in manifest
+    assert gzip.decompress((tmp_path / (hashed + ".gz")).read_bytes()) == b"body { color: red; }"
+    assert json.loads((tmp_path / "dist" / "manifest.json").read_text()) == manifest
+
+    # Same content, same name: rebuilding is deterministic.
+    assert build_static_folder(str(tmp_path)) == manifest
+
+
+def test_service_worker_is_served_from_root_with_precache_list():
+    from app import app
+
+    r = app.test_client().get("/sw.js")
+    assert r.status_code == 200
+    assert r.data.startswith(b"self.__PRECACHE = {")
+    assert "no-cache" in r.headers["Cache-Control"]
+    assert "Set-Cookie" not in r.headers
+
+
+def test_every_template_icon_is_in_the_sprite():
+    sys.path.insert(0, os.path.join(ROOT, "scripts"))
+    from build_icons import used_icons
+
+    with open(os.path.join(ROOT, "static", "icons.svg"), encoding="utf-8") as f:
+        sprite = set(re.findall(r'<symbol id="([a-z0-9-]+)"', f.read()))
+    used = set(used_icons())
+    missing = used - sprite
+    assert not missing, f"run scripts/build_icons.py (missing: {sorted(missing)})"
+
+    # The scan reaches included partials and the icons lazy_section() passes on.
+    in_sections = set()
+    for path in glob.glob(os.path.join(ROOT, "dinaro", "templates", "dinaro_parent_sections", "*.html")):
+        with open(path, encoding="utf-8") as f:
+            in_sections.update(re.findall(r"""icon\(\s*["']([a-z0-9-]+)["']""", f.read()))
+    assert in_sections and in_sections <= used
+    assert "chart-no-axes-column" in used
@@ -0,0 +1,93 @@
+"""Per-tenant data versions and the 304s they allow (dataversion.py)."""
+
+import secrets
+
+from sqlalchemy import text
+
+from app import app  # noqa: F401  (runs DB init)
+from bench import scenarios
+from bench.datagen import generate
+from database import engine
+
+
+def _revalidate(driver, path, etag):
+    return driver.client.get(path, headers={"If-None-Match": etag})
+
+
+def test_a_childs_write_changes_the_parents_dashboard_tag(make_driver):
+    ds = generate(engine, families=1, children=2, ledger=2, couples=0, couple_years=0,
+                  profiles=0, expenses=0, prefix="V" + secrets.token_hex(3).upper())
+    code, parent_id, kids = ds.families[0]
+    parent, child = make_driver(), make_driver()
+    scenarios.login_parent(parent, code, parent_id)
+    scenarios.login_child(child, code, kids[0])
+
+    first = parent.client.get("/dinaro/parent")
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert "private" in first.headers["Cache-Control"] and "no-cache" in first.headers["Cache-Control"]
+    unchanged = _revalidate(parent, "/dinaro/parent", etag)
+    assert unchanged.status_code == 304 and not unchanged.get_data()
+
+    assert child.request("POST", "/dinaro/child/log-chore", {"chore_id": str(ds.chores[code])}) == 302
+    changed = _revalidate(parent, "/dinaro/parent", etag)
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_a_teachers_broadcast_changes_the_linked_classes_tags(make_driver):
+    ds = generate(engine, families=2, children=1, ledger=1, couples=0, couple_years=0,
+                  profiles=0, expenses=0, prefix="V" + secrets.token_hex(3).upper())
+    (code_a, teacher_a, _), (code_b, teacher_b, kids_b) = ds.families
+    link_code = "L" + secrets.token_hex(4).upper()
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE dinaro_parents SET link_code = :lc WHERE id IN (:a, :b)"),
+                     {"lc": link_code, "a": teacher_a, "b": teacher_b})
+        conn.execute(text("UPDATE dinaro_families SET is_classroom = 1 WHERE family_code IN (:a, :b)"),
+                     {"a": code_a, "b": code_b})
+        class_b = conn.execute(text("SELECT id FROM dinaro_families WHERE family_code = :c"),
+                               {"c": code_b}).scalar()
+    teacher, child = make_driver(), make_driver()
+    scenarios.login_parent(teacher, code_a, teacher_a)
+    scenarios.login_child(child, code_b, kids_b[0])
+
+    child.client.get("/dinaro/child")  # the first load of the day writes (accruals), so has no tag
+    etag = child.client.get("/dinaro/child").headers["ETag"]
+    assert _revalidate(child, "/dinaro/child", etag).status_code == 304
+
+    title = "Broadcast " + secrets.token_hex(3)
+    assert teacher.request("POST", "/dinaro/parent/chore/add", {
+        "chore_title": title, "default_hours": "1", "broadcast_to_families": str(class_b)}) == 302
+    res = _revalidate(child, "/dinaro/child", etag)
+    assert res.status_code == 200
+    assert title in res.get_data(as_text=True)
+
+    # Renaming a class changes its linked classes' dashboards (the class switcher).
+    other = make_driver()
+    scenarios.login_parent(other, code_b, teacher_b)
+    other.client.get("/dinaro/parent")
+    etag = other.client.get("/dinaro/parent").headers["ETag"]
+    assert teacher.request("POST", "/dinaro/parent/settings", {
+        "family_name": "Renamed " + title, "rate_per_hour": "4", "is_classroom": "on"}) == 302
+    res = _revalidate(other, "/dinaro/parent", etag)
+    assert res.status_code == 200 and "Renamed " + title in res.get_data(as_text=True)
+
+
+def test_personal_pages_follow_writes_and_session_prefs(make_driver):
+    ds = generate(engine, families=0, children=0, ledger=0, couples=0, couple_years=0,
+                  profiles=1, expenses=3, prefix="V" + secrets.token_hex(3).upper())
+    me = make_driver()
+    scenarios.login_profile(me, ds.profiles[0])
+
+    etag = me.client.get("/expenses").headers["ETag"]
+    assert _revalidate(me, "/expenses", etag).status_code == 304
+
+    # A session-only preference changes the page, and so the tag.
+    assert me.request("POST", "/set_currency", {"currency": "€"}) == 302
+    res = _revalidate(me, "/expenses", etag)
+    assert res.status_code == 200
+    etag = res.headers["ETag"]
+
+    assert me.request("POST", "/expenses", {"add": "1"}) == 302
+    res = _revalidate(me, "/expenses", etag)
+    assert res.status_code == 200 and res.headers["ETag"] != etag
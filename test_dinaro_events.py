@@ -0,0 +1,107 @@
+"""The parent dashboard's live feed (dinaro/events.py)."""
+
+import json
+import secrets
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+
+from app import app
+from bench import scenarios
+from bench.datagen import generate
+from database import engine
+from dinaro import events
+from dinaro.events import publish
+from dinaro.kernel import utc_now_iso
+from dinaro.routes import _dinaro_parent_family_id
+
+
+@pytest.fixture
+def family(make_driver):
+    ds = generate(engine, families=1, children=2, ledger=2, couples=0, couple_years=0,
+                  profiles=0, expenses=0, prefix="L" + secrets.token_hex(3).upper())
+    code, parent_id, kids = ds.families[0]
+    parent, child = make_driver(), make_driver()
+    scenarios.login_parent(parent, code, parent_id)
+    scenarios.login_child(child, code, kids[0])
+    return ds, parent, child
+
+
+def _after(parent):
+    page = parent.client.get("/dinaro/parent").get_data(as_text=True)
+    return page.split("/dinaro/parent/events?after=", 1)[1].split('"', 1)[0]
+
+
+def test_thread_workers_get_whats_new_and_poll_again(family, monkeypatch):
+    monkeypatch.delenv("DINARO_EVENTS_STREAM_SECONDS", raising=False)
+    ds, parent, child = family
+    after = _after(parent)
+    code = ds.families[0][0]
+
+    assert child.request("POST", "/dinaro/child/log-chore", {"chore_id": str(ds.chores[code])}) == 302
+    res = parent.client.get(f"/dinaro/parent/events?after={after}")
+    body = res.get_data(as_text=True)
+    assert res.mimetype == "text/event-stream"
+    assert body.startswith("retry: 10000")
+    assert "event: chore_logged" in body
+
+    # Reconnecting with the last id seen replays nothing twice.
+    last_id = body.rsplit("id: ", 1)[1].split("\n", 1)[0]
+    again = parent.client.get("/dinaro/parent/events", headers={"Last-Event-ID": last_id})
+    assert "event:" not in again.get_data(as_text=True)
+
+    log_id = ds.pending_logs[code].pop()
+    assert parent.request("POST", f"/dinaro/parent/log/{log_id}/approve") == 302
+    body = parent.client.get("/dinaro/parent/events", headers={"Last-Event-ID": last_id}).get_data(as_text=True)
+    assert "event: balance_changed" in body
+
+
+def test_open_stream_receives_events_as_they_happen(family, monkeypatch):
+    monkeypatch.setenv("DINARO_EVENTS_STREAM_SECONDS", "1.5")
+    _ds, parent, _child = family
+    after = _after(parent)
+    with parent.client.session_transaction() as sess:
+        parent_id = sess["dinaro_parent_id"]
+    family_id = _dinaro_parent_family_id(parent_id)
+    threading.Timer(0.3, publish, args=(family_id, "enrollment_pending"), kwargs={"name": "Ada"}).start()
+
+    start = time.monotonic()
+    res = parent.client.get(f"/dinaro/parent/events?after={after}", buffered=False)
+    body = "".join(chunk.decode() for chunk in res.response)
+    assert body.startswith("retry: 3000")
+    assert 'event: enrollment_pending\ndata: {"name": "Ada"}' in body
+    assert 1.0 < time.monotonic() - start < 5
+
+
+def test_open_stream_gets_an_event_that_commits_after_a_higher_id(family, monkeypatch):
+    # On Postgres an id is taken at INSERT and shows up at COMMIT: simulate a
+    # slow writer whose lower id lands after the poller has read past it.
+    monkeypatch.setenv("DINARO_EVENTS_STREAM_SECONDS", "1.5")
+    _ds, parent, _child = family
+    after = _after(parent)
+    with parent.client.session_transaction() as sess:
+        family_id = _dinaro_parent_family_id(sess["dinaro_parent_id"])
+    with engine.connect() as conn:
+        base = conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM dinaro_events")).scalar() + 1000
+
+    def insert(event_id, name):
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO dinaro_events (id, family_id, kind, payload, created_at) "
+                "VALUES (:id, :fid, 'enrollment_pending', :payload, :now)"
+            ), {"id": event_id, "fid": family_id, "payload": json.dumps({"name": name}), "now": utc_now_iso()})
+        events._hub.poke()
+
+    threading.Timer(0.2, insert, args=(base + 10, "fast")).start()
+    threading.Timer(0.7, insert, args=(base + 5, "slow")).start()
+    res = parent.client.get(f"/dinaro/parent/events?after={after}", buffered=False)
+    body = "".join(chunk.decode() for chunk in res.response)
+    assert body.count('"name": "fast"') == 1
+    assert body.count('"name": "slow"') == 1
+
+
+def test_events_need_a_parent_session():
+    app.config["TESTING"] = True
+    assert app.test_client().get("/dinaro/parent/events").status_code == 401
@@ -0,0 +1,108 @@
+"""Dinaro sharding across two SQLite files.
+
+Shards are configured from the environment at import time, so the scenario
+runs in a fresh interpreter with DINARO_SHARDS set.
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+SCENARIO = textwrap.dedent("""
+    from sqlalchemy import text
+
+    from app import app
+    from bench import scenarios
+    from bench.datagen import generate
+    from dinaro.db import family_shard, place_family, set_family_shard, shard_engine
+    from dinaro.rebalance import move_family
+
+    app.config["TESTING"] = True
+
+    def families(shard):
+        with shard_engine(shard).connect() as conn:
+            return set(conn.execute(text("SELECT family_code FROM dinaro_families")).scalars())
+
+    class Driver:
+        def __init__(self):
+            self.client = app.test_client()
+
+        def request(self, method, path, data=None):
+            return self.client.open(path, method=method, data=data).status_code
+
+    # New families are spread over the shards, and each lives only where the map says.
+    for i in range(12):
+        Driver().client.post("/dinaro/setup", data={
+            "family_name": f"Class {i}", "parent_name": "Teacher",
+            "parent_pin": "1234", "parent_pin_confirm": "1234"})
+    default, east = families("default"), families("east")
+    assert default and east and not default & east, (default, east)
+    assert all(family_shard(c) == "east" for c in east)
+
+    # A populated family on the east shard: logins, dashboards and approvals.
+    ds = generate(shard_engine("east"), families=1, children=3, ledger=5, couples=0,
+                  couple_years=0, profiles=0, expenses=0, prefix="E")
+    code, parent_id, kids = ds.families[0]
+    assert place_family(code, "east") == "east"
+    assert place_family(code, "default") is None  # taken codes are never re-pointed
+    assert family_shard(code) == "east"
+    parent, child = Driver(), Driver()
+    scenarios.login_parent(parent, code, parent_id)
+    scenarios.login_child(child, code, kids[0])
+    assert parent.request("GET", "/dinaro/parent") == 200
+    assert child.request("GET", "/dinaro/child") == 200
+    log_id = ds.pending_logs[code].pop()
+    assert parent.request("POST", f"/dinaro/parent/log/{log_id}/approve", {}) == 302
+
+    # While a move is copying the family, its writes are refused (reads still work).
+    set_family_shard(code, "east", moving=True)
+    assert parent.request("POST", f"/dinaro/parent/log/{ds.pending_logs[code][-1]}/approve", {}) == 503
+    assert parent.request("GET", "/dinaro/parent") == 200
+    set_family_shard(code, "east")
+
+    # Rebalance it onto the default shard.
+    with shard_engine("east").connect() as conn:
+        logs_before = conn.execute(text(
+            "SELECT COUNT(*) FROM dinaro_chore_logs l JOIN dinaro_children c ON c.id = l.child_id "
+            "JOIN dinaro_families f ON f.id = c.family_id WHERE f.family_code = :c"), {"c": code}).scalar()
+    move_family(code, "default", settle_seconds=0, drain_seconds=0)
+    assert family_shard(code) == "default"
+    assert code in families("default") and code not in families("east")
+    with shard_engine("default").connect() as conn:
+        logs_after = conn.execute(text(
+            "SELECT COUNT(*) FROM dinaro_chore_logs l JOIN dinaro_children c ON c.id = l.child_id "
+            "JOIN dinaro_families f ON f.id = c.family_id WHERE f.family_code = :c"), {"c": code}).scalar()
+        new_parent_id = conn.execute(text(
+            "SELECT p.id FROM dinaro_parents p JOIN dinaro_families f ON f.id = p.family_id "
+            "WHERE f.family_code = :c"), {"c": code}).scalar()
+    assert logs_after == logs_before
+
+    # The old session's ids are gone: it is sent back to log in, then works again.
+    assert parent.request("GET", "/dinaro/parent") == 302
+    scenarios.login_parent(parent, code, new_parent_id)
+    assert parent.request("GET", "/dinaro/parent") == 200
+
+    # A forked worker must not inherit any shard's pooled connections.
+    from bootstrap import dispose_engines
+    assert shard_engine("east").pool.checkedin() > 0
+    dispose_engines(close=False)
+    assert all(shard_engine(n).pool.checkedin() == 0 for n in ("default", "east"))
+    print("ok")
+""")
+
+
+def test_families_route_to_their_shard_and_can_move(tmp_path):
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'main.db'}",
+        "DINARO_SHARDS": f"east=sqlite:///{tmp_path / 'east.db'}",
+        "JINJA_CACHE_DIR": "off",
+    }
+    env.pop("DINARO_DATABASE_URL", None)
+    proc = subprocess.run([sys.executable, "-c", SCENARIO], cwd=ROOT, env=env,
+                          capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+    assert proc.stdout.strip().endswith("ok")
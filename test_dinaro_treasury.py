@@ -0,0 +1,81 @@
+"""Regression tests for the Treasury vote tallies."""
+
+import secrets
+import threading
+
+from sqlalchemy import event, text
+
+from app import app  # noqa: F401  (runs DB init)
+from dinaro.db import engine
+from dinaro.routes import _dinaro_cast_vote
+
+
+def _make_fund_with_options(conn, n=2):
+    fund_id = secrets.randbelow(10**9) + 10**6
+    ids = []
+    for i in range(n):
+        conn.execute(
+            text("INSERT INTO dinaro_fund_options (fund_id, label) VALUES (:f, :l)"),
+            {"f": fund_id, "l": f"option {i}"},
+        )
+        ids.append(conn.execute(
+            text("SELECT MAX(id) FROM dinaro_fund_options WHERE fund_id = :f"), {"f": fund_id}
+        ).scalar())
+    return fund_id, ids
+
+
+def _tallies(conn, fund_id):
+    return [r[0] for r in conn.execute(
+        text("SELECT votes FROM dinaro_fund_options WHERE fund_id = :f ORDER BY id"), {"f": fund_id}
+    )]
+
+
+def test_changing_a_vote_moves_the_tally():
+    with engine.begin() as conn:
+        fund_id, (a, b) = _make_fund_with_options(conn)
+        _dinaro_cast_vote(conn, fund_id, 1, a)
+        _dinaro_cast_vote(conn, fund_id, 2, a)
+        assert _tallies(conn, fund_id) == [2, 0]
+
+        _dinaro_cast_vote(conn, fund_id, 1, b)
+        assert _tallies(conn, fund_id) == [1, 1]
+
+
+def test_revoting_same_option_is_idempotent():
+    with engine.begin() as conn:
+        fund_id, (a, _b) = _make_fund_with_options(conn)
+        _dinaro_cast_vote(conn, fund_id, 1, a)
+        _dinaro_cast_vote(conn, fund_id, 1, a)
+        assert _tallies(conn, fund_id) == [1, 0]
+        rows = conn.execute(
+            text("SELECT COUNT(*) FROM dinaro_fund_votes WHERE fund_id = :f"), {"f": fund_id}
+        ).scalar()
+        assert rows == 1
+
+
+def test_double_submitted_first_vote_counts_once():
+    # Both requests get as far as writing the vote before either commits.
+    with engine.begin() as conn:
+        fund_id, (a, _b) = _make_fund_with_options(conn)
+    barrier = threading.Barrier(2, timeout=5)
+
+    def before_vote_insert(_conn, _cursor, statement, *_args):
+        if statement.startswith("INSERT INTO dinaro_fund_votes"):
+            barrier.wait()
+
+    def vote():
+        with engine.begin() as conn:
+            _dinaro_cast_vote(conn, fund_id, 1, a)
+
+    event.listen(engine, "before_cursor_execute", before_vote_insert)
+    try:
+        threads = [threading.Thread(target=vote) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_vote_insert)
+
+    with engine.connect() as conn:
+        assert _tallies(conn, fund_id) == [1, 0]
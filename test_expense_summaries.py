@@ -0,0 +1,90 @@
+"""Per-owner expense summaries stay in step with every expense write (core/expenses.py)."""
+
+import secrets
+import threading
+
+from sqlalchemy import event, text
+
+from app import app  # noqa: F401  (runs DB init)
+from bench import scenarios
+from bench.datagen import generate
+from core import expenses as expense_store
+from core.expenses import load_summary
+from database import engine
+
+
+def _summary_and_truth(owner_key):
+    with engine.connect() as conn:
+        summary = load_summary(conn, owner_key)
+        truth = {
+            r.category: r.total for r in conn.execute(
+                text("SELECT category, SUM(amount) AS total FROM expenses WHERE owner_key = :uk GROUP BY category"),
+                {"uk": owner_key})
+        }
+    return summary, truth
+
+
+def test_summary_follows_expense_writes(make_driver):
+    ds = generate(engine, families=0, children=0, ledger=0, couples=0, couple_years=0,
+                  profiles=1, expenses=20, prefix="S" + secrets.token_hex(3).upper())
+    owner_key = ds.profiles[0]
+    me = make_driver()
+    scenarios.login_profile(me, owner_key)
+
+    summary, truth = _summary_and_truth(owner_key)
+    assert summary.by_category == truth
+
+    me.request("POST", "/expenses", {
+        "expense_name[]": ["Rent", "Rainy day"], "expense_amount[]": ["900", "150"],
+        "expense_category[]": ["Housing", "Nest Egg"], "expense_scope[]": ["personal", "personal"],
+    })
+    summary, truth = _summary_and_truth(owner_key)
+    assert summary.by_category == truth == {"Housing": 900.0, "Nest Egg": 150.0}
+    assert summary.total == 1050.0 and summary.savings == 150.0
+
+    with engine.connect() as conn:
+        rent_id = conn.execute(text("SELECT id FROM expenses WHERE owner_key = :uk AND name = 'Rent'"),
+                               {"uk": owner_key}).scalar()
+    me.request("POST", "/update_expense_category", {"expense_id": str(rent_id), "new_category": "Savings"})
+    assert _summary_and_truth(owner_key)[0].savings == 1050.0
+    me.request("POST", f"/remove_expense/{rent_id}")
+    assert 'value="150.0"' in me.client.get("/timebank").get_data(as_text=True)
+
+    me.request("POST", "/expenses/reset")
+    summary, truth = _summary_and_truth(owner_key)
+    assert summary.total == 0 and summary.by_category == truth == {}
+
+
+def test_concurrent_writers_for_one_owner_both_count():
+    owner_key = "race-" + secrets.token_hex(4)
+    order = []
+
+    def note(_conn, _cursor, statement, *_args):
+        if "expense_summaries" in statement or "SUM(amount)" in statement:
+            order.append("aggregate" if "SUM(amount)" in statement else statement.split()[0])
+
+    def writer(category):
+        for _ in range(10):
+            with engine.begin() as conn:
+                conn.execute(
+                    text("INSERT INTO expenses (name, amount, category, scope, owner_key) "
+                         "VALUES ('x', 1, :c, 'personal', :uk)"),
+                    {"c": category, "uk": owner_key},
+                )
+                expense_store.refresh_summary(conn, owner_key)
+
+    event.listen(engine, "before_cursor_execute", note)
+    try:
+        threads = [threading.Thread(target=writer, args=(c,)) for c in ("Food", "Fun")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        event.remove(engine, "before_cursor_execute", note)
+
+    # The summary row is locked before aggregating, so on Postgres the second
+    # writer waits and its aggregate includes the first writer's rows.
+    assert order[:3] == ["INSERT", "aggregate", "INSERT"]
+    summary, truth = _summary_and_truth(owner_key)
+    assert summary.by_category == truth == {"Food": 10.0, "Fun": 10.0}
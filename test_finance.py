@@ -0,0 +1,37 @@
+"""wealth_comparison_batch gives the same rows with and without NumPy (core/finance.py)."""
+
+import pytest
+
+from core import finance
+
+COSTS = [0, 0.5, 12.5, 199, 1_000_000]
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    np = pytest.importorskip("numpy") if request.param == "numpy" else None
+    monkeypatch.setattr(finance, "_np", np)
+    return request.param
+
+
+@pytest.mark.parametrize("currency", ["$", "£", "¥"])
+def test_batch_matches_the_per_billionaire_formula(backend, currency):
+    rows = finance.wealth_comparison_batch(COSTS, currency, user_hourly=20.0)
+    assert len(rows) == len(COSTS)
+    usd = finance.CURRENCY_TO_USD[currency]
+    for cost, item_rows in zip(COSTS, rows):
+        assert [r.name for r in item_rows] == [b["name"] for b in finance.BILLIONAIRES]
+        for row, b in zip(item_rows, finance.BILLIONAIRES):
+            hours = finance.WORKING_HOURS_PER_YEAR
+            assert row.net_worth_hours == pytest.approx(cost * usd * hours / b["net_worth_usd"])
+            assert row.growth_hours == pytest.approx(cost * usd * hours / b["annual_growth_usd"])
+            assert isinstance(row.net_worth_hours, float)
+
+
+def test_numpy_and_fallback_rows_are_identical(monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(finance, "_np", None)
+    fallback = [[r.as_dict() for r in item] for item in finance.wealth_comparison_batch(COSTS, "€", 15.0)]
+    monkeypatch.setattr(finance, "_np", np)
+    vectorised = [[r.as_dict() for r in item] for item in finance.wealth_comparison_batch(COSTS, "€", 15.0)]
+    assert vectorised == fallback
@@ -0,0 +1,48 @@
+"""Freelance totals read from the daily rollup (core/freelance.py)."""
+
+import secrets
+from datetime import date
+
+from sqlalchemy import text
+
+from app import app  # noqa: F401  (runs DB init)
+from bench import scenarios
+from bench.datagen import generate
+from core.freelance import rebuild_rollup
+from database import engine
+
+
+def _rollup(owner_key):
+    with engine.connect() as conn:
+        return sorted(tuple(r) for r in conn.execute(
+            text("SELECT work_date, client, ROUND(hours, 6), ROUND(earned, 6), entries "
+                 "FROM freelance_daily WHERE owner_key = :uk"), {"uk": owner_key}))
+
+
+def test_rollup_follows_adds_and_deletes(make_driver):
+    ds = generate(engine, families=0, children=0, ledger=0, couples=0, couple_years=0,
+                  profiles=1, expenses=1, prefix="R" + secrets.token_hex(3).upper())
+    owner_key = ds.profiles[0]
+    me = make_driver()
+    scenarios.login_profile(me, owner_key)
+    client = me.client
+
+    today = date.today().isoformat()
+    for who, hours, rate in (("Acme", 2, 50), ("Acme", 1.5, 60), ("Globex", 3, 40)):
+        client.post("/freelance/add_entry", data={"client": who, "work_date": today,
+                                                  "hours": str(hours), "rate": str(rate)})
+    with engine.connect() as conn:
+        ids = conn.execute(text("SELECT id FROM freelance_entries WHERE owner_key = :uk ORDER BY id"),
+                           {"uk": owner_key}).scalars().all()
+    client.post(f"/freelance/delete_entry/{ids[0]}")
+    client.post(f"/freelance/delete_entry/{ids[2]}")
+
+    assert _rollup(owner_key) == [(today, "Acme", 1.5, 90.0, 1)]
+    page = client.get("/freelance").get_data(as_text=True)
+    assert "90.0" in page and "Globex" not in page
+
+    # Maintained incrementally, it matches a rebuild from the entries.
+    before = _rollup(owner_key)
+    with engine.begin() as conn:
+        rebuild_rollup(conn, owner_key)
+    assert _rollup(owner_key) == before
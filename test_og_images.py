@@ -0,0 +1,100 @@
+"""On-demand share cards behind /og/result.png (ogimage.py's disk cache)."""
+
+import os
+import threading
+
+import pytest
+
+import ogimage
+from app import app
+
+CARD = "/og/result.png?item=Headphones&hours=9.95&region=UK"
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(ogimage, "CACHE_DIR", str(tmp_path))
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+    real = ogimage.result_card
+
+    def counting(*args):
+        calls.append(args)
+        return real(*args)
+
+    monkeypatch.setattr(ogimage, "result_card", counting)
+    return calls
+
+
+def test_card_renders_once_then_serves_from_disk(client, renders):
+    first = client.get(CARD)
+    assert first.status_code == 200
+    assert first.mimetype == "image/png" and first.data.startswith(b"\x89PNG")
+    assert "Set-Cookie" not in first.headers
+    assert "public" in first.headers["Cache-Control"]
+    etag = first.headers["ETag"]
+    assert not etag.startswith("W/")
+    assert renders == [("Headphones", "9h 57m", renders[0][2], "United Kingdom")]
+    assert renders[0][2].startswith("The first trillionaire earns £")
+
+    # Same result spelled differently: same card, same tag, no new render.
+    again = client.get("/og/result.png?item=%20Headphones&hours=9.950&region=uk")
+    assert again.headers["ETag"] == etag and again.data == first.data
+    assert client.get(CARD, headers={"If-None-Match": etag}).status_code == 304
+    assert len(renders) == 1
+
+    assert client.get("/og/result.png?item=Headphones&hours=0").status_code == 400
+    for hours in ("nan", "inf", "-inf"):
+        assert client.get(f"/og/result.png?item=Headphones&hours={hours}").status_code == 400
+    assert len(renders) == 1
+
+
+def test_cache_evicts_least_recently_served(client, monkeypatch):
+    def cached_name(res):
+        return res.headers["ETag"].strip('"') + ".png"
+
+    a = client.get("/og/result.png?item=A&hours=1")
+    b = client.get("/og/result.png?item=B&hours=1")
+    monkeypatch.setattr(ogimage, "CACHE_MAX_BYTES", int(max(len(a.data), len(b.data)) * 2.5))
+    # Both were last served long ago; serving A again makes B the stalest.
+    for res in (a, b):
+        os.utime(os.path.join(ogimage.CACHE_DIR, cached_name(res)), (0, 0))
+    client.get("/og/result.png?item=A&hours=1")
+    c = client.get("/og/result.png?item=C&hours=1")
+
+    assert sorted(os.listdir(ogimage.CACHE_DIR)) == sorted([cached_name(a), cached_name(c)])
+
+
+def test_calculator_share_link_carries_the_card(client):
+    res = client.post("/calculate", data={"itemName": "Headphones", "itemCost": "199",
+                                          "wageType": "hourly", "wageAmount": "20"})
+    page = res.get_data(as_text=True)
+    assert "calculate?item=Headphones&amp;hours=9.95&amp;region=" in page
+
+    shared = client.get("/calculate?item=Headphones&hours=9.95&region=UK").get_data(as_text=True)
+    assert 'content="https://thetimecost.com/og/result.png?item=Headphones&amp;hours=9.95&amp;region=UK"' in shared
+    assert "Headphones costs 9h 57m of work" in shared
+
+    # A hand-edited link with no usable result is just the plain calculator.
+    mangled = client.get("/calculate?item=x&hours=nan")
+    assert mangled.status_code == 200
+    assert "og/result.png" not in mangled.get_data(as_text=True)
+
+
+def test_misses_beyond_the_render_slots_get_503(client, renders, monkeypatch):
+    busy = threading.BoundedSemaphore(1)
+    busy.acquire()  # another render holds the only slot
+    monkeypatch.setattr(ogimage, "_render_slots", busy)
+    res = client.get(CARD)
+    assert res.status_code == 503 and res.headers["Retry-After"]
+    assert "Cache-Control" not in res.headers or "public" not in res.headers["Cache-Control"]
+    assert renders == [] and not ogimage._key_locks
+
+    busy.release()
+    assert client.get(CARD).status_code == 200
+    assert len(renders) == 1
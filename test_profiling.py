@@ -0,0 +1,58 @@
+"""Opt-in request profiling (profiling.py) and its report (scripts/profile_report.py)."""
+
+import os
+import sys
+
+import pytest
+
+import profiling
+from app import app
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "scripts"))
+from profile_report import hot_functions, load  # noqa: E402
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("ADMIN_KEY", "sekrit")
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+def _profiles(endpoint):
+    folder = os.path.join(profiling.PROFILE_DIR, endpoint)
+    return sorted(os.listdir(folder)) if os.path.isdir(folder) else []
+
+
+def test_only_admin_header_requests_are_profiled(client, monkeypatch):
+    assert client.get("/calculate").status_code == 200
+    assert client.get("/calculate", headers={"X-Profile": "guess"}).status_code == 200
+    assert _profiles("core.calculator") == []
+
+    monkeypatch.setattr(profiling, "KEEP", 2)
+    for _ in range(3):
+        client.get("/calculate", headers={"X-Profile": "sekrit"})
+    assert len(_profiles("core.calculator")) == 2
+
+    monkeypatch.delenv("ADMIN_KEY")
+    monkeypatch.setattr(profiling, "SAMPLE_RATE", 1.0)
+    client.get("/formulas")
+    assert _profiles("core.formulas") == []
+
+
+def test_sampled_profiles_merge_into_a_route_report(client, monkeypatch):
+    monkeypatch.setattr(profiling, "SAMPLE_RATE", 1.0)
+    client.get("/calculate")
+    client.post("/calculate", data={"itemName": "Tea", "itemCost": "3", "wageType": "hourly", "wageAmount": "12"})
+    client.get("/formulas")
+
+    stats, counts = load(profiling.PROFILE_DIR)
+    assert counts == {"core.calculator": 2, "core.formulas": 1}
+    routes = hot_functions(stats, ["core.routes"], key="cumtime")
+    assert routes and all("core/routes.py" in r["function"] for r in routes)
+    assert any("(calculator)" in r["function"] and r["calls"] == 2 for r in routes)
+
+    _, counts = load(profiling.PROFILE_DIR, "core.formulas")
+    assert counts == {"core.formulas": 1}
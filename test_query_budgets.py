@@ -0,0 +1,165 @@
+"""SQL statement budgets for the key routes, checked at two data scales.
+
+Each budget is a ceiling on the statements one request may execute, and a
+route must run exactly as many statements for an 8-child family as for a
+2-child one: a per-child (N+1) query sneaking back into a route fails here
+before it shows up as latency, even while it still fits under the ceiling.
+"""
+
+import secrets
+
+import pytest
+from sqlalchemy import event, text
+
+from app import app
+from bench import drivers, scenarios
+from bench.datagen import BENCH_PIN, generate
+from core.auth import make_pin
+from database import engine
+from dinaro import events
+from dinaro.db import engine as dinaro_engine
+
+SCALES = {
+    "small": dict(families=1, children=2, ledger=5, couples=1, couple_years=1, profiles=1, expenses=15),
+    "large": dict(families=1, children=8, ledger=40, couples=1, couple_years=2, profiles=1, expenses=120),
+}
+
+# Writes that change what a parent sees also record a live-feed event
+# (dinaro/events.py): one INSERT, and the dashboard reads where the feed starts.
+# Dashboards read their tenant's data version first (dataversion.py), which is
+# all an unchanged reload costs, and every request that writes bumps it.
+BUDGETS = {
+    "POST /calculate": 6,
+    "GET /expenses": 6,
+    "GET /expenses (unchanged)": 1,
+    "GET /budget": 7,
+    "GET /dinaro/parent": 13,
+    "GET /dinaro/parent (unchanged)": 1,
+    "GET /dinaro/parent/section/analytics": 8,
+    "GET /dinaro/parent/section/treasury": 4,
+    "GET /dinaro/parent/section/history": 4,
+    "GET /dinaro/parent/section/requests": 4,
+    "GET /dinaro/parent/section/goals": 4,
+    "GET /dinaro/parent/section/trends": 5,
+    "GET /dinaro/child": 18,
+    "GET /dinaro/child (unchanged)": 1,
+    "POST /dinaro/child/log-chore": 7,
+    "POST /dinaro/parent/log/<id>/approve": 9,
+    "POST /dinaro/parent/request/<id>/accept": 8,
+    "POST /dinaro/parent/enrollment/<id>/approve": 3,
+    "GET /couples/dashboard": 9,
+    "GET /couples/dashboard (unchanged)": 1,
+}
+
+
+# The lazily loaded parent dashboard panels (dinaro_parent_section).
+SECTIONS = ["analytics", "treasury", "history", "requests", "goals", "trends"]
+
+
+def count_queries(driver, method, path, data=None, headers=None):
+    """(status, statements executed) for one request, across both engines."""
+    statements = []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    engines = {engine, dinaro_engine}
+    for e in engines:
+        event.listen(e, "before_cursor_execute", record)
+    try:
+        status = driver.request(method, path, data, headers)
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", record)
+    return status, len(statements)
+
+
+def count_revalidation(driver, path):
+    """count_queries() for a reload that sends back the page's current ETag."""
+    etag = driver.client.get(path).headers["ETag"]
+    return count_queries(driver, "GET", path, headers={"If-None-Match": etag})
+
+
+def _dataset(scale):
+    ds = generate(engine, **SCALES[scale], prefix="Q" + secrets.token_hex(3).upper())
+    code = ds.families[0][0]
+    pin_hash, pin_salt = make_pin(BENCH_PIN)
+    # A classroom, so the classroom-only dashboard panels run their queries too,
+    # with one self-enrolled pupil waiting for the teacher.
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE dinaro_families SET is_classroom = 1 WHERE family_code = :c"), {"c": code})
+        ds.pending_enrollment = int(conn.execute(text(
+            "INSERT INTO dinaro_children (family_id, name, pin_hash, pin_salt, approved) "
+            "SELECT id, 'New pupil', :h, :s, 0 FROM dinaro_families WHERE family_code = :c RETURNING id"
+        ), {"h": pin_hash, "s": pin_salt, "c": code}).scalar())
+    return ds
+
+
+@pytest.fixture(scope="module")
+def counts():
+    """{scale: {label: (status, statements)}}, one pass over each scale."""
+    app.config["TESTING"] = True
+    with pytest.MonkeyPatch.context() as mp:
+        # The one-in-PRUNE_EVERY cleanup of old live-feed events is not part of
+        # any route's steady-state cost; which request draws it depends on order.
+        mp.setattr(events, "PRUNE_EVERY", 10**9)
+        return {scale: _measure(_dataset(scale), lambda: drivers.TestClientDriver(app)) for scale in SCALES}
+
+
+def _measure(ds, make_driver):
+    code, parent_id, kids = ds.families[0]
+    counts = {}
+
+    calc = make_driver()
+    counts["POST /calculate"] = count_queries(
+        calc, "POST", "/calculate", {"itemCost": "50", "wageAmount": "18.50", "wageType": "hourly"})
+
+    profile = make_driver()
+    scenarios.login_profile(profile, ds.profiles[0])
+    counts["GET /expenses"] = count_queries(profile, "GET", "/expenses")
+    counts["GET /expenses (unchanged)"] = count_revalidation(profile, "/expenses")
+    counts["GET /budget"] = count_queries(profile, "GET", "/budget")
+
+    parent = make_driver()
+    scenarios.login_parent(parent, code, parent_id)
+    counts["GET /dinaro/parent"] = count_queries(parent, "GET", "/dinaro/parent")
+    counts["GET /dinaro/parent (unchanged)"] = count_revalidation(parent, "/dinaro/parent")
+    for name in SECTIONS:
+        counts[f"GET /dinaro/parent/section/{name}"] = count_queries(
+            parent, "GET", f"/dinaro/parent/section/{name}")
+    counts["POST /dinaro/parent/log/<id>/approve"] = count_queries(
+        parent, "POST", f"/dinaro/parent/log/{ds.pending_logs[code].pop()}/approve", {})
+    counts["POST /dinaro/parent/request/<id>/accept"] = count_queries(
+        parent, "POST", f"/dinaro/parent/request/{ds.open_requests[code].pop()}/accept", {})
+    counts["POST /dinaro/parent/enrollment/<id>/approve"] = count_queries(
+        parent, "POST", f"/dinaro/parent/enrollment/{ds.pending_enrollment}/approve", {})
+
+    child = make_driver()
+    scenarios.login_child(child, code, kids[0])
+    counts["GET /dinaro/child"] = count_queries(child, "GET", "/dinaro/child")
+    counts["GET /dinaro/child (unchanged)"] = count_revalidation(child, "/dinaro/child")
+    counts["POST /dinaro/child/log-chore"] = count_queries(
+        child, "POST", "/dinaro/child/log-chore", {"chore_id": str(ds.chores[code])})
+
+    partner = make_driver()
+    scenarios.login_partner(partner, *ds.couples[0])
+    counts["GET /couples/dashboard"] = count_queries(partner, "GET", "/couples/dashboard")
+    counts["GET /couples/dashboard (unchanged)"] = count_revalidation(partner, "/couples/dashboard")
+    return counts
+
+
+@pytest.mark.parametrize("scale", sorted(SCALES))
+def test_routes_stay_within_query_budget(counts, scale):
+    measured = counts[scale]
+    assert set(measured) == set(BUDGETS)
+    for label, (status, n) in measured.items():
+        assert status < 400, f"{label} returned {status}"
+        assert (status == 304) == label.endswith("(unchanged)"), f"{label} returned {status}"
+        assert n <= BUDGETS[label], f"{label} ran {n} statements (budget {BUDGETS[label]})"
+
+
+def test_query_counts_do_not_grow_with_the_data(counts):
+    small, large = counts["small"], counts["large"]
+    grew = {label: (small[label][1], large[label][1])
+            for label in BUDGETS if small[label][1] != large[label][1]}
+    assert not grew, f"statements (small, large) differ: {grew}"
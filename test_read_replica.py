@@ -0,0 +1,74 @@
+"""Read-replica routing, with a second SQLite file standing in for the replica."""
+
+import secrets
+import sqlite3
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+import database
+import dinaro.db
+from app import app
+from bench import scenarios
+from bench.datagen import generate
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch):
+    """A snapshot of the primary that, like a lagging replica, misses later writes."""
+    app.config["TESTING"] = True
+    ds = generate(database.engine, families=1, children=2, ledger=2, couples=0, couple_years=0,
+                  profiles=0, expenses=0, prefix="R" + secrets.token_hex(3).upper())
+
+    path = tmp_path / "replica.db"
+    src = sqlite3.connect(database.engine.url.database)
+    dst = sqlite3.connect(path)
+    src.backup(dst)
+    src.close()
+    dst.close()
+
+    read_engine = create_engine(f"sqlite:///{path}", future=True)
+    monkeypatch.setattr(database, "read_engine", read_engine)
+    monkeypatch.setattr(dinaro.db, "read_engine", read_engine)
+    database.enable_read_routing(database.engine, read_engine)
+    yield ds
+    event.remove(database.engine, "commit", database._note_write)
+    read_engine.dispose()
+
+
+def _add_chore_on_primary(family_code):
+    title = "Primary only " + secrets.token_hex(3)
+    with database.engine.begin() as conn:
+        fid = conn.execute(text("SELECT id FROM dinaro_families WHERE family_code = :c"),
+                           {"c": family_code}).scalar()
+        conn.execute(text("INSERT INTO dinaro_chores (family_id, title) VALUES (:f, :t)"),
+                     {"f": fid, "t": title})
+    return title
+
+
+def test_dashboard_reads_replica_until_the_session_writes(replica, make_driver):
+    code, parent_id, _kids = replica.families[0]
+    title = _add_chore_on_primary(code)
+
+    parent = make_driver()
+    scenarios.login_parent(parent, code, parent_id)
+    with parent.client.session_transaction() as sess:
+        sess.pop(database.STICKY_SESSION_KEY, None)
+
+    assert title not in parent.client.get("/dinaro/parent").get_data(as_text=True)
+
+    # A write pins this session's reads to the primary: it sees its own writes.
+    log_id = replica.pending_logs[code].pop()
+    assert parent.client.post(f"/dinaro/parent/log/{log_id}/approve").status_code == 302
+    assert title in parent.client.get("/dinaro/parent").get_data(as_text=True)
+
+    # Once the window has passed, reads go back to the replica.
+    with parent.client.session_transaction() as sess:
+        sess[database.STICKY_SESSION_KEY] = 0
+    assert title not in parent.client.get("/dinaro/parent").get_data(as_text=True)
+
+
+def test_without_a_read_url_reads_use_the_primary():
+    assert database.read_engine is database.engine
+    with database.get_read_connection() as conn:
+        assert conn.engine is database.engine
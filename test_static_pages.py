@@ -0,0 +1,60 @@
+"""Tests for the session-free, cacheable static pages."""
+
+import pytest
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from sqlalchemy import event
+
+from app import app
+from database import engine
+from dataversion import source_files
+
+STATIC_PATHS = ["/", "/formulas", "/support", "/SendElonToSpace",
+                "/SendElonToSpace/sources", "/sitemap.xml", "/robots.txt"]
+
+
+@pytest.fixture
+def client():
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+@pytest.mark.parametrize("path", STATIC_PATHS)
+def test_static_page_is_cacheable_and_db_free(client, path):
+    queries = []
+
+    def count(*_args):
+        queries.append(1)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        r = client.get(path)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert r.status_code == 200
+    assert "Set-Cookie" not in r.headers
+    assert "public" in r.headers["Cache-Control"]
+    assert r.headers["Last-Modified"]
+    assert queries == []
+
+    again = client.get(path, headers={"If-None-Match": r.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_dynamic_pages_still_get_a_session(client):
+    r = client.get("/calculate")
+    assert "Set-Cookie" in r.headers
+
+
+def test_last_modified_comes_from_the_source_tree_not_process_start(client):
+    # Every worker and restart of the same build must agree, or revalidation
+    # with If-Modified-Since misses whenever a request lands on another process.
+    newest = max(st.st_mtime for _rel, st in source_files())
+    expected = datetime.fromtimestamp(int(newest), timezone.utc)
+    r = client.get("/formulas")
+    assert parsedate_to_datetime(r.headers["Last-Modified"]) == expected
+
+    again = client.get("/formulas", headers={"If-Modified-Since": r.headers["Last-Modified"]})
+    assert again.status_code == 304
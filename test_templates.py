@@ -0,0 +1,8 @@
+"""Every template compiles (what TEMPLATE_WARMUP does at boot)."""
+
+from app import app
+from templating import warm_templates
+
+
+def test_all_templates_compile():
+    assert warm_templates(app) > 20
@@ -0,0 +1,45 @@
+"""Tests for the cached /trillionaire page."""
+
+import pytest
+
+from app import app
+
+
+@pytest.fixture
+def client():
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+def test_etag_round_trip_returns_304(client):
+    r = client.get("/trillionaire?region=UK")
+    assert r.status_code == 200
+    assert r.headers["ETag"] and not r.headers["ETag"].startswith("W/")
+    assert "max-age" in r.headers["Cache-Control"]
+
+    again = client.get("/trillionaire?region=UK", headers={"If-None-Match": r.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_equivalent_wages_share_a_page(client):
+    a = client.get("/trillionaire?region=US&wage=20")
+    b = client.get("/trillionaire?region=US&wage=20.001")
+    c = client.get("/trillionaire?region=US&wage=21")
+    assert a.headers["ETag"] == b.headers["ETag"]
+    assert a.headers["ETag"] != c.headers["ETag"]
+
+
+def test_view_is_part_of_the_cache_key(client):
+    plain = client.get("/trillionaire?region=EU")
+    client.post("/set-view", data={"view": "dusk"})
+    themed = client.get("/trillionaire?region=EU")
+    assert plain.headers["ETag"] != themed.headers["ETag"]
+    assert b'data-view="dusk"' in themed.data
+
+
+def test_session_dependent_page_is_never_public(client):
+    first = client.get("/trillionaire?region=UK")
+    assert "Set-Cookie" in first.headers
+    for r in (first, client.get("/trillionaire?region=UK")):
+        cc = r.headers["Cache-Control"]
+        assert "private" in cc and "public" not in cc